@@ -178,6 +178,53 @@ AUDIT_LOGGING = importlib.util.find_spec(  # type:ignore
     "karrio.server.audit"
 ) is not None and config("AUDIT_LOGGING", default=True, cast=bool)
 PERSIST_SDK_TRACING = config("PERSIST_SDK_TRACING", default=True, cast=bool)
+# Persist an aggregated record of the SDK timing spans with the tracing records
+PERSIST_SDK_SPANS = config("PERSIST_SDK_SPANS", default=False, cast=bool)
+# Size of the thread pool shared by the SDK background work (0 runs it inline)
+SDK_BACKGROUND_WORKERS = config("SDK_BACKGROUND_WORKERS", default=None)
+# Size of the thread pool running the carrier calls fan-out (default 64)
+SDK_NETWORK_WORKERS = config("SDK_NETWORK_WORKERS", default=None)
+# Resolve the carrier connections from in-memory snapshots (unset enables them
+# only with a system cache shared by every process, e.g. Redis)
+CARRIER_SNAPSHOT = config("CARRIER_SNAPSHOT", default=None)
+# Keep the compiled markup tables between requests (unset enables them only
+# with a system cache shared by every process, e.g. Redis)
+MARKUP_TABLE = config("MARKUP_TABLE", default=None)
+# Maximum number of parcels and destinations of a rate sheet batch rating
+RATE_SHEET_BATCH_MAX_PARCELS = config(
+    "RATE_SHEET_BATCH_MAX_PARCELS", default=100, cast=int
+)
+RATE_SHEET_BATCH_MAX_DESTINATIONS = config(
+    "RATE_SHEET_BATCH_MAX_DESTINATIONS", default=100, cast=int
+)
+# Default multi-carrier rating time budgets in seconds (unset waits for all)
+RATING_DEADLINE = config("RATING_DEADLINE", default=None)
+RATING_CARRIER_TIMEOUT = config("RATING_CARRIER_TIMEOUT", default=None)
+# Opt-in rate quote cache TTL in seconds (0 disables), overridable per carrier
+# name (e.g. "ups:300,fedex:60"), and the time expired quotes are still served
+# while they are refreshed in the background
+RATE_CACHE_TTL = config("RATE_CACHE_TTL", default=0, cast=int)
+RATE_CACHE_CARRIER_TTLS = {
+    name.strip(): int(ttl)
+    for name, ttl in (
+        _.split(":")
+        for _ in config("RATE_CACHE_CARRIER_TTLS", default="").split(",")
+        if _.strip()
+    )
+}
+RATE_CACHE_STALE_TTL = config("RATE_CACHE_STALE_TTL", default=0, cast=int)
+RATE_CACHE_WEIGHT_PRECISION = config("RATE_CACHE_WEIGHT_PRECISION", default=1, cast=int)
+# Share the carrier calls of identical in-flight rate requests in process
+# ("local"), across the workers sharing the cache ("cache") or not at all ("")
+RATING_COALESCING = config("RATING_COALESCING", default="")
+RATING_COALESCE_TIMEOUT = config("RATING_COALESCE_TIMEOUT", default=30, cast=int)
+# Bulk rating maximum shipments, threads and maximum in-flight requests per
+# carrier connection
+BULK_RATING_MAX_SHIPMENTS = config("BULK_RATING_MAX_SHIPMENTS", default=100, cast=int)
+BULK_RATING_WORKERS = config("BULK_RATING_WORKERS", default=8, cast=int)
+BULK_RATING_CARRIER_CONCURRENCY = config(
+    "BULK_RATING_CARRIER_CONCURRENCY", default=4, cast=int
+)
 WORKFLOW_MANAGEMENT = (
     importlib.util.find_spec("karrio.server.automation") is not None  # type:ignore
 )
@@ -1,10 +1,6 @@
 import karrio.lib as lib
 from typing import List, Tuple
-from karrio.schemas.canpar.CanparRatingService import (
-    searchCanadaPost,
-    SearchCanadaPostRq,
-    Address as CanparAddress,
-)
+import karrio.schemas.canpar.CanparRatingService as canpar
 import karrio.lib as lib
 from karrio.core.models import (
     AddressValidationDetails,
@@ -29,7 +25,7 @@ def parse_address_validation_response(
 ) -> Tuple[AddressValidationDetails, List[Message]]:
     response = _response.deserialize()
     errors = parse_error_response(response, settings)
-    address = lib.find_element("address", response, CanparAddress, first=True)
+    address = lib.find_element("address", response, canpar.Address, first=True)
 
     success = len(errors) == 0
     validation_details = (
@@ -65,8 +61,8 @@ def address_validation_request(
     address = lib.to_address(payload.address)
 
     request = create_envelope(
-        body_content=searchCanadaPost(
-            request=SearchCanadaPostRq(
+        body_content=canpar.searchCanadaPost(
+            request=canpar.SearchCanadaPostRq(
                 city=payload.address.city or "",
                 password=settings.password,
                 postal_code=payload.address.postal_code or "",
@@ -1,9 +1,6 @@
 import karrio.lib as lib
 from typing import List, Tuple
-from karrio.schemas.canpar.CanparAddonsService import (
-    cancelPickup,
-    CancelPickupRq,
-)
+import karrio.schemas.canpar.CanparAddonsService as canpar
 from karrio.core.models import (
     PickupCancelRequest,
     ConfirmationDetails,
@@ -39,8 +36,8 @@ def pickup_cancel_request(
     payload: PickupCancelRequest, settings: Settings
 ) -> Serializable:
     request = create_envelope(
-        body_content=cancelPickup(
-            request=CancelPickupRq(
+        body_content=canpar.cancelPickup(
+            request=canpar.CancelPickupRq(
                 id=int(payload.confirmation_number),
                 password=settings.password,
                 user_id=settings.username,
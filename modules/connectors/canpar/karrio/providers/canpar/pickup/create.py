@@ -1,11 +1,6 @@
 from functools import partial
 from typing import Tuple, List
-from karrio.schemas.canpar.CanparAddonsService import (
-    schedulePickupV2,
-    SchedulePickupV2Rq,
-    PickupV2,
-    Address,
-)
+import karrio.schemas.canpar.CanparAddonsService as canpar
 import karrio.lib as lib
 from karrio.core.models import PickupRequest, PickupDetails, Message
 from karrio.core.utils import Element, create_envelope, Serializable, DF, XP
@@ -21,7 +16,7 @@ def parse_pickup_response(
 ) -> Tuple[PickupDetails, List[Message]]:
     response = _response.deserialize()
     pickup_node = lib.find_element("pickup", response, first=True)
-    pickup = XP.to_object(PickupV2, pickup_node)
+    pickup = XP.to_object(canpar.PickupV2, pickup_node)
     details: PickupDetails = PickupDetails(
         carrier_id=settings.carrier_id,
         carrier_name=settings.carrier_name,
@@ -39,14 +34,14 @@ def pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
     address = lib.to_address(payload.address)
 
     request = create_envelope(
-        body_content=schedulePickupV2(
-            request=SchedulePickupV2Rq(
+        body_content=canpar.schedulePickupV2(
+            request=canpar.SchedulePickupV2Rq(
                 password=settings.password,
-                pickup=PickupV2(
+                pickup=canpar.PickupV2(
                     collect=None,
                     comments=payload.instruction,
                     created_by=address.person_name,
-                    pickup_address=Address(
+                    pickup_address=canpar.Address(
                         address_line_1=address.street,
                         address_line_2=address.address_line2,
                         address_line_3=None,
@@ -1,12 +1,6 @@
 import time
 from functools import partial
-from karrio.schemas.canpar.CanparRatingService import (
-    rateShipment,
-    RateShipmentRq,
-    Shipment,
-    Package,
-    Address,
-)
+import karrio.schemas.canpar.CanparRatingService as canpar
 import typing
 import karrio.lib as lib
 import karrio.core.models as models
@@ -30,7 +24,7 @@ def parse_rate_response(
 def _extract_rate_details(
     node: lib.Element, settings: provider_utils.Settings
 ) -> models.RateDetails:
-    shipment = lib.to_object(Shipment, node)
+    shipment = lib.to_object(canpar.Shipment, node)
     service = provider_units.Service.map(shipment.service_type)
 
     surcharges = [
@@ -87,15 +81,15 @@ def rate_request(
     )
 
     request = lib.create_envelope(
-        body_content=rateShipment(
-            request=RateShipmentRq(
+        body_content=canpar.rateShipment(
+            request=canpar.RateShipmentRq(
                 apply_association_discount=False,
                 apply_individual_discount=False,
                 apply_invoice_discount=False,
                 password=settings.password,
-                shipment=Shipment(
+                shipment=canpar.Shipment(
                     cod_type=options.canpar_cash_on_delivery.state,
-                    delivery_address=Address(
+                    delivery_address=canpar.Address(
                         address_line_1=recipient.street,
                         address_line_2=recipient.address_line2,
                         address_line_3=None,
@@ -118,7 +112,7 @@ def rate_request(
                     instruction=None,
                     nsr=provider_units.ShippingOption.is_nsr(options),
                     packages=[
-                        Package(
+                        canpar.Package(
                             alternative_reference=None,
                             cod=None,
                             cost_centre=None,
@@ -134,7 +128,7 @@ def rate_request(
                         )
                         for pkg in packages
                     ],
-                    pickup_address=Address(
+                    pickup_address=canpar.Address(
                         address_line_1=shipper.street,
                         address_line_2=shipper.address_line2,
                         address_line_3=None,
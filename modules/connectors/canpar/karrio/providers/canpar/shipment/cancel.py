@@ -1,9 +1,6 @@
 import karrio.lib as lib
 from typing import List, Tuple
-from karrio.schemas.canpar.CanshipBusinessService import (
-    voidShipment,
-    VoidShipmentRq,
-)
+import karrio.schemas.canpar.CanshipBusinessService as canpar
 from karrio.core.models import ShipmentCancelRequest, ConfirmationDetails, Message
 from karrio.core.utils import (
     create_envelope,
@@ -38,8 +35,8 @@ def shipment_cancel_request(
     payload: ShipmentCancelRequest, settings: Settings
 ) -> Serializable:
     request = create_envelope(
-        body_content=voidShipment(
-            request=VoidShipmentRq(
+        body_content=canpar.voidShipment(
+            request=canpar.VoidShipmentRq(
                 id=int(payload.shipment_identifier),
                 password=settings.password,
                 user_id=settings.username,
@@ -1,12 +1,6 @@
 import time
 from functools import partial
-from karrio.schemas.canpar.CanshipBusinessService import (
-    Address,
-    Package,
-    Shipment,
-    processShipment,
-    ProcessShipmentRq,
-)
+import karrio.schemas.canpar.CanshipBusinessService as canpar
 import typing
 import karrio.lib as lib
 import karrio.core.units as units
@@ -24,7 +18,7 @@ def parse_shipment_response(
 ) -> typing.Tuple[models.ShipmentDetails, typing.List[models.Message]]:
     response = _response.deserialize()
     shipment = lib.to_object(
-        Shipment,
+        canpar.Shipment,
         lib.find_element("shipment", response, first=True),
     )
     success = shipment is not None and shipment.id is not None
@@ -38,8 +32,8 @@ def _extract_details(
 ) -> models.ShipmentDetails:
     shipment_node = lib.find_element("shipment", response, first=True)
     label = lib.find_element("labels", response, first=True)
-    shipment = lib.to_object(Shipment, shipment_node)
-    tracking_number = next(iter(shipment.packages), Package()).barcode
+    shipment = lib.to_object(canpar.Shipment, shipment_node)
+    tracking_number = next(iter(shipment.packages), canpar.Package()).barcode
 
     return models.ShipmentDetails(
         carrier_id=settings.carrier_id,
@@ -85,12 +79,12 @@ def _process_shipment(
     )
 
     request = lib.create_envelope(
-        body_content=processShipment(
-            request=ProcessShipmentRq(
+        body_content=canpar.processShipment(
+            request=canpar.ProcessShipmentRq(
                 password=settings.password,
-                shipment=Shipment(
+                shipment=canpar.Shipment(
                     cod_type=options.canpar_cash_on_delivery.state,
-                    delivery_address=Address(
+                    delivery_address=canpar.Address(
                         address_line_1=recipient.street,
                         address_line_2=recipient.address_line2,
                         address_line_3=None,
@@ -116,7 +110,7 @@ def _process_shipment(
                         or options.canpar_not_no_signature_required.state
                     ),
                     packages=[
-                        Package(
+                        canpar.Package(
                             alternative_reference=None,
                             cod=None,
                             cost_centre=None,
@@ -132,7 +126,7 @@ def _process_shipment(
                         )
                         for pkg in packages
                     ],
-                    pickup_address=Address(
+                    pickup_address=canpar.Address(
                         address_line_1=shipper.street,
                         address_line_2=shipper.address_line2,
                         address_line_3=None,
@@ -180,7 +174,7 @@ def _process_shipment(
 def _get_label(shipment_response: str, settings: provider_utils.Settings) -> lib.Job:
     response = lib.to_element(shipment_response)
     shipment = lib.to_object(
-        Shipment,
+        canpar.Shipment,
         next(iter(response.xpath(".//*[local-name() = $name]", name="shipment")), None),
     )
     success = shipment is not None and shipment.id is not None
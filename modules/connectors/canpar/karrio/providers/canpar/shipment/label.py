@@ -1,8 +1,5 @@
 from jstruct import struct
-from karrio.schemas.canpar.CanshipBusinessService import (
-    GetLabelsAdvancedRq,
-    getLabelsAdvanced,
-)
+import karrio.schemas.canpar.CanshipBusinessService as canpar
 from karrio.core.utils import create_envelope, Serializable, Envelope
 from karrio.providers.canpar.utils import Settings
 
@@ -15,8 +12,8 @@ class LabelRequest:
 
 def get_label_request(payload: LabelRequest, settings: Settings) -> Serializable:
     request = create_envelope(
-        body_content=getLabelsAdvanced(
-            request=GetLabelsAdvancedRq(
+        body_content=canpar.getLabelsAdvanced(
+            request=canpar.GetLabelsAdvancedRq(
                 horizontal=False,
                 id=payload.shipment_id,
                 password=settings.password,
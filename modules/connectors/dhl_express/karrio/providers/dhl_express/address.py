@@ -1,10 +1,5 @@
 from typing import Tuple, List
-from karrio.schemas.dhl_express.routing_global_req_2_0 import (
-    RouteRequest,
-    RequestTypeType as RequestType,
-    MetaData,
-    Note,
-)
+import karrio.schemas.dhl_express.routing_global_req_2_0 as dhl
 import karrio.lib as lib
 from karrio.core.units import CountryState, Country
 from karrio.core.utils import Serializable, Element, SF, XP
@@ -25,7 +20,11 @@ def parse_address_validation_response(
     response = _response.deserialize()
     notes = lib.find_element("Note", response)
     success = next(
-        (True for note in notes if XP.to_object(Note, note).ActionNote == "Success"),
+        (
+            True
+            for note in notes
+            if XP.to_object(dhl.Note, note).ActionNote == "Success"
+        ),
         False,
     )
     validation_details = AddressValidationDetails(
@@ -56,13 +55,13 @@ def address_validation_request(
     )
     address = lib.to_address(payload.address)
 
-    request = RouteRequest(
+    request = dhl.RouteRequest(
         schemaVersion="2.0",
         Request=settings.Request(
-            MetaData=MetaData(SoftwareName="3PV", SoftwareVersion=1.0)
+            MetaData=dhl.MetaData(SoftwareName="3PV", SoftwareVersion=1.0)
         ),
         RegionCode=CountryRegion[payload.address.country_code].value,
-        RequestType=RequestType.D.value,
+        RequestType=dhl.RequestTypeType.D.value,
         Address1=address.street,
         Address2=address.address_line2,
         Address3=None,
@@ -76,7 +75,7 @@ def address_validation_request(
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: RouteRequest) -> str:
+def _request_serializer(request: "dhl.RouteRequest") -> str:
     namespacedef_ = (
         'xmlns:ns1="http://www.dhl.com" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
         ' xsi:schemaLocation="http://www.dhl.com routing-global-req.xsd"'
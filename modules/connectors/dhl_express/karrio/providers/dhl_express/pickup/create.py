@@ -1,12 +1,7 @@
 from typing import Tuple, List
 import karrio.schemas.dhl_express.book_pickup_global_req_3_0 as dhl
-from karrio.schemas.dhl_express.book_pickup_global_res_3_0 import BookPUResponse
-from karrio.schemas.dhl_express.pickupdatatypes_global_3_0 import (
-    Requestor,
-    Pickup,
-    WeightSeg,
-    RequestorContact,
-)
+import karrio.schemas.dhl_express.book_pickup_global_res_3_0 as dhl_response
+import karrio.schemas.dhl_express.pickupdatatypes_global_3_0 as dhl_pickup
 import karrio.schemas.dhl_express.datatypes_global_v62 as dhl_global
 import karrio.lib as lib
 from karrio.core.utils import (
@@ -42,7 +37,7 @@ def parse_pickup_response(
 
 
 def _extract_pickup(response: Element, settings: Settings) -> PickupDetails:
-    pickup = BookPUResponse()
+    pickup = dhl_response.BookPUResponse()
     pickup.build(response)
     pickup_charge = (
         ChargeDetails(
@@ -76,10 +71,10 @@ def pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
         RegionCode=(
             CountryRegion[address.country_code].value if address.country_code else "AM"
         ),
-        Requestor=Requestor(
+        Requestor=dhl_pickup.Requestor(
             AccountNumber=settings.account_number,
             AccountType="D",
-            RequestorContact=RequestorContact(
+            RequestorContact=dhl_pickup.RequestorContact(
                 PersonName=address.person_name,
                 Phone=address.phone_number,
                 PhoneExtension=None,
@@ -97,18 +92,18 @@ def pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
             Address1=address.street,
             Address2=address.address_line2,
         ),
-        PickupContact=RequestorContact(
+        PickupContact=dhl_pickup.RequestorContact(
             PersonName=address.contact,
             Phone=address.phone_number,
         ),
-        Pickup=Pickup(
+        Pickup=dhl_pickup.Pickup(
             Pieces=len(payload.parcels),
             PickupDate=payload.pickup_date,
             ReadyByTime=f"{payload.ready_time}:00",
             CloseTime=f"{payload.closing_time}:00",
             SpecialInstructions=[payload.instruction],
             RemotePickupFlag="Y",
-            weight=WeightSeg(
+            weight=dhl_pickup.WeightSeg(
                 Weight=packages.weight.value,
                 WeightUnit=DHLWeightUnit[packages.weight.unit].value,
             ),
@@ -120,7 +115,7 @@ def pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: dhl.BookPURequest) -> str:
+def _request_serializer(request: "dhl.BookPURequest") -> str:
     xml_str = (
         XP.export(
             request,
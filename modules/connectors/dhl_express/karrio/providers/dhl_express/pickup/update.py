@@ -1,13 +1,7 @@
 from typing import Tuple, List
 import karrio.schemas.dhl_express.modify_pickup_global_req_3_0 as dhl
-from karrio.schemas.dhl_express.modify_pickup_global_res_3_0 import ModifyPUResponse
-from karrio.schemas.dhl_express.pickupdatatypes_global_3_0 import (
-    Requestor,
-    Place,
-    RequestorContact,
-    Pickup,
-    WeightSeg,
-)
+import karrio.schemas.dhl_express.modify_pickup_global_res_3_0 as dhl_response
+import karrio.schemas.dhl_express.pickupdatatypes_global_3_0 as dhl_pickup
 from karrio.core.utils import (
     Serializable,
     Element,
@@ -43,7 +37,7 @@ def parse_pickup_update_response(
 
 
 def _extract_pickup(response: Element, settings: Settings) -> PickupDetails:
-    pickup = ModifyPUResponse()
+    pickup = dhl_response.ModifyPUResponse()
     pickup.build(response)
     pickup_charge = (
         ChargeDetails(
@@ -83,10 +77,10 @@ def pickup_update_request(
         if payload.address.country_code
         else "AM",
         ConfirmationNumber=payload.confirmation_number,
-        Requestor=Requestor(
+        Requestor=dhl_pickup.Requestor(
             AccountNumber=settings.account_number,
             AccountType="D",
-            RequestorContact=RequestorContact(
+            RequestorContact=dhl_pickup.RequestorContact(
                 PersonName=payload.address.person_name,
                 Phone=payload.address.phone_number,
                 PhoneExtension=None,
@@ -104,17 +98,17 @@ def pickup_update_request(
             Address1=payload.address.address_line1,
             Address2=payload.address.address_line2,
         ),
-        PickupContact=RequestorContact(
+        PickupContact=dhl_pickup.RequestorContact(
             PersonName=payload.address.person_name, Phone=payload.address.phone_number
         ),
-        Pickup=Pickup(
+        Pickup=dhl_pickup.Pickup(
             Pieces=len(payload.parcels),
             PickupDate=payload.pickup_date,
             ReadyByTime=f"{payload.ready_time}:00",
             CloseTime=f"{payload.closing_time}:00",
             SpecialInstructions=[payload.instruction],
             RemotePickupFlag="Y",
-            weight=WeightSeg(
+            weight=dhl_pickup.WeightSeg(
                 Weight=packages.weight.value,
                 WeightUnit=DHLWeightUnit[packages.weight.unit].value,
             ),
@@ -125,7 +119,7 @@ def pickup_update_request(
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: dhl.ModifyPURequest) -> str:
+def _request_serializer(request: "dhl.ModifyPURequest") -> str:
     xml_str = (
         XP.export(
             request,
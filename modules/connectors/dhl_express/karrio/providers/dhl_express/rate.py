@@ -35,7 +35,7 @@ def parse_rate_response(
 
 
 def _extract_quote(
-    quote: dhl_response.QtdShpType,
+    quote: "dhl_response.QtdShpType",
     settings: provider_utils.Settings,
     ctx: typing.Dict[str, typing.Any] = {},
 ) -> models.RateDetails:
@@ -224,7 +224,7 @@ def rate_request(
     )
 
 
-def _request_serializer(request: dhl.DCTRequest) -> str:
+def _request_serializer(request: "dhl.DCTRequest") -> str:
     namespacedef_ = (
         'xmlns:p="http://www.dhl.com" '
         'xmlns:p1="http://www.dhl.com/datatypes" '
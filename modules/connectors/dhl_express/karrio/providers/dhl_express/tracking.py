@@ -93,7 +93,7 @@ def tracking_request(
     return lib.Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: tracking.KnownTrackingRequest) -> str:
+def _request_serializer(request: "tracking.KnownTrackingRequest") -> str:
     return lib.to_xml(
         request,
         name_="req:KnownTrackingRequest",
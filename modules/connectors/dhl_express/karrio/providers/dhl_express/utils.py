@@ -46,7 +46,7 @@ class Settings(core.Settings):
     def default_currency(self) -> typing.Optional[str]:
         return units.CountryCurrency.map(self.account_country_code).value or "USD"
 
-    def Request(self, **kwargs) -> dhl.Request:
+    def Request(self, **kwargs) -> "dhl.Request":
         return dhl.Request(
             ServiceHeader=dhl.ServiceHeader(
                 MessageReference="1234567890123456789012345678901",
@@ -1,4 +1,4 @@
-from karrio.schemas.fedex_ws.ship_service_v26 import TrackingId
+import karrio.schemas.fedex_ws.ship_service_v26 as fedex
 
 import karrio.lib as lib
 import karrio.api.proxy as proxy
@@ -36,7 +36,7 @@ class Proxy(proxy.Proxy):
         requests = request.serialize()
         response = self._send_request("/ship", lib.Serializable(requests[0]))
         master_id = lib.find_element(
-            "MasterTrackingId", lib.to_element(response), TrackingId, first=True
+            "MasterTrackingId", lib.to_element(response), fedex.TrackingId, first=True
         )
 
         if len(requests) > 1 and master_id is not None:
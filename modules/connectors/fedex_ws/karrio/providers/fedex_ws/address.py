@@ -1,14 +1,5 @@
 from typing import Tuple, List
-from karrio.schemas.fedex_ws.address_validation_service_v4 import (
-    AddressValidationRequest as FedexAddressValidationRequest,
-    AddressValidationReply,
-    AddressToValidate,
-    Address as FedexAddress,
-    Contact,
-    TransactionDetail,
-    VersionId,
-    NotificationSeverityType,
-)
+import karrio.schemas.fedex_ws.address_validation_service_v4 as fedex_address
 import karrio.lib as lib
 from karrio.core.utils import create_envelope, Serializable, Element, SF, XP
 from karrio.core.models import (
@@ -27,13 +18,15 @@ def parse_address_validation_response(
 ) -> Tuple[AddressValidationDetails, List[Message]]:
     response = _response.deserialize()
     reply = XP.to_object(
-        AddressValidationReply,
+        fedex_address.AddressValidationReply,
         lib.find_element("AddressValidationReply", response, first=True),
     )
     address: FedexAddress = next(
         (result.EffectiveAddress for result in reply.AddressResults), None
     )
-    success = reply.HighestSeverity == NotificationSeverityType.SUCCESS.value
+    success = (
+        reply.HighestSeverity == fedex_address.NotificationSeverityType.SUCCESS.value
+    )
     _, lines = (
         address.StreetLines
         if address is not None and len(address.StreetLines) > 1
@@ -70,19 +63,21 @@ def address_validation_request(
     address = lib.to_address(payload.address)
 
     request = create_envelope(
-        body_content=FedexAddressValidationRequest(
+        body_content=fedex_address.AddressValidationRequest(
             WebAuthenticationDetail=settings.webAuthenticationDetail,
             ClientDetail=settings.clientDetail,
-            TransactionDetail=TransactionDetail(
+            TransactionDetail=fedex_address.TransactionDetail(
                 CustomerTransactionId="AddressValidationRequest_v4"
             ),
-            Version=VersionId(ServiceId="aval", Major=4, Intermediate=0, Minor=0),
+            Version=fedex_address.VersionId(
+                ServiceId="aval", Major=4, Intermediate=0, Minor=0
+            ),
             InEffectAsOfTimestamp=None,
             AddressesToValidate=[
-                AddressToValidate(
+                fedex_address.AddressToValidate(
                     ClientReferenceId=None,
                     Contact=(
-                        Contact(
+                        fedex_address.Contact(
                             ContactId=None,
                             PersonName=address.person_name,
                             Title=None,
@@ -104,7 +99,7 @@ def address_validation_request(
                         )
                         else None
                     ),
-                    Address=FedexAddress(
+                    Address=fedex_address.Address(
                         StreetLines=lib.join(
                             address.street,
                             address.address_line2,
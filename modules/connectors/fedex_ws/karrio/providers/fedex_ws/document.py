@@ -28,7 +28,7 @@ def parse_document_upload_response(
 
 
 def _extract_details(
-    document_statuses: typing.List[fedex.UploadDocumentStatusDetail],
+    document_statuses: "typing.List[fedex.UploadDocumentStatusDetail]",
     settings: provider_utils.Settings,
 ) -> models.DocumentUploadDetails:
     return models.DocumentUploadDetails(
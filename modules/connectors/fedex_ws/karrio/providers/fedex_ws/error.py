@@ -1,5 +1,5 @@
 from typing import List, Optional
-from karrio.schemas.fedex_ws.rate_service_v28 import Notification
+import karrio.schemas.fedex_ws.rate_service_v28 as fedex
 from karrio.core.models import Message
 from karrio.core.utils import Element, extract_fault, XP
 from karrio.providers.fedex_ws.utils import Settings
@@ -16,7 +16,7 @@ def parse_error_response(response: Element, settings: Settings) -> List[Message]
 
 
 def _extract_error(node: Element, settings: Settings) -> Optional[Message]:
-    notification = XP.to_object(Notification, node)
+    notification = XP.to_object(fedex.Notification, node)
     if notification.Severity not in ("SUCCESS", "NOTE"):
         return Message(
             code=notification.Code,
@@ -1,14 +1,5 @@
 from datetime import datetime
-from karrio.schemas.fedex_ws.pickup_service_v22 import (
-    PickupAvailabilityRequest,
-    TransactionDetail,
-    VersionId,
-    Address,
-    CarrierCodeType,
-    PickupRequestType,
-    AssociatedAccount,
-    AssociatedAccountNumberType,
-)
+import karrio.schemas.fedex_ws.pickup_service_v22 as fedex_pickup
 import karrio.lib as lib
 from karrio.core.models import PickupRequest
 from karrio.core.utils import (
@@ -29,17 +20,19 @@ def pickup_availability_request(
     same_day = DF.date(payload.pickup_date).date() == datetime.today().date()
     address = lib.to_address(payload.address)
 
-    request = PickupAvailabilityRequest(
+    request = fedex_pickup.PickupAvailabilityRequest(
         WebAuthenticationDetail=settings.webAuthenticationDetail,
         ClientDetail=settings.clientDetail,
-        TransactionDetail=TransactionDetail(CustomerTransactionId="FTC"),
-        Version=VersionId(ServiceId="disp", Major=22, Intermediate=0, Minor=0),
+        TransactionDetail=fedex_pickup.TransactionDetail(CustomerTransactionId="FTC"),
+        Version=fedex_pickup.VersionId(
+            ServiceId="disp", Major=22, Intermediate=0, Minor=0
+        ),
         PickupType=None,
-        AccountNumber=AssociatedAccount(
-            Type=AssociatedAccountNumberType.FEDEX_EXPRESS.value,
+        AccountNumber=fedex_pickup.AssociatedAccount(
+            Type=fedex_pickup.AssociatedAccountNumberType.FEDEX_EXPRESS.value,
             AccountNumber=settings.account_number,
         ),
-        PickupAddress=Address(
+        PickupAddress=fedex_pickup.Address(
             StreetLines=lib.join(
                 address.street,
                 address.address_line2,
@@ -52,14 +45,16 @@ def pickup_availability_request(
         ),
         PickupRequestType=[
             (
-                PickupRequestType.SAME_DAY if same_day else PickupRequestType.FUTURE_DAY
+                fedex_pickup.PickupRequestType.SAME_DAY
+                if same_day
+                else fedex_pickup.PickupRequestType.FUTURE_DAY
             ).value
         ],
         DispatchDate=payload.pickup_date,
         NumberOfBusinessDays=None,
         PackageReadyTime=f"{payload.ready_time}:00",
         CustomerCloseTime=f"{payload.closing_time}:00",
-        Carriers=[CarrierCodeType.FDXE.value],
+        Carriers=[fedex_pickup.CarrierCodeType.FDXE.value],
         ShipmentAttributes=None,
         PackageDetails=None,
     )
@@ -67,7 +62,7 @@ def pickup_availability_request(
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: PickupAvailabilityRequest) -> str:
+def _request_serializer(request: "fedex_pickup.PickupAvailabilityRequest") -> str:
     envelope: Envelope = create_envelope(body_content=request)
     envelope.Body.ns_prefix_ = envelope.ns_prefix_
     apply_namespaceprefix(envelope.Body.anytypeobjs_[0], "v22")
@@ -1,12 +1,5 @@
 from typing import Tuple, List
-from karrio.schemas.fedex_ws.pickup_service_v22 import (
-    CancelPickupRequest,
-    TransactionDetail,
-    VersionId,
-    CarrierCodeType,
-    CancelPickupReply,
-    NotificationSeverityType,
-)
+import karrio.schemas.fedex_ws.pickup_service_v22 as fedex_pickup
 from karrio.core.models import (
     PickupCancelRequest,
     ConfirmationDetails,
@@ -31,13 +24,14 @@ def parse_pickup_cancel_response(
 ) -> Tuple[ConfirmationDetails, List[Message]]:
     response = _response.deserialize()
     reply = XP.to_object(
-        CancelPickupReply,
+        fedex_pickup.CancelPickupReply,
         lib.find_element("CancelPickupReply", response, first=True),
     )
     cancellation = ConfirmationDetails(
         carrier_id=settings.carrier_id,
         carrier_name=settings.carrier_name,
-        success=reply.HighestSeverity == NotificationSeverityType.SUCCESS.value,
+        success=reply.HighestSeverity
+        == fedex_pickup.NotificationSeverityType.SUCCESS.value,
         operation="Cancel Pickup",
     )
 
@@ -47,12 +41,14 @@ def parse_pickup_cancel_response(
 def pickup_cancel_request(
     payload: PickupCancelRequest, settings: Settings
 ) -> Serializable:
-    request = CancelPickupRequest(
+    request = fedex_pickup.CancelPickupRequest(
         WebAuthenticationDetail=settings.webAuthenticationDetail,
         ClientDetail=settings.clientDetail,
-        TransactionDetail=TransactionDetail(CustomerTransactionId="FTC"),
-        Version=VersionId(ServiceId="disp", Major=22, Intermediate=0, Minor=0),
-        CarrierCode=CarrierCodeType.FDXE.value,
+        TransactionDetail=fedex_pickup.TransactionDetail(CustomerTransactionId="FTC"),
+        Version=fedex_pickup.VersionId(
+            ServiceId="disp", Major=22, Intermediate=0, Minor=0
+        ),
+        CarrierCode=fedex_pickup.CarrierCodeType.FDXE.value,
         PickupConfirmationNumber=payload.confirmation_number,
         ScheduledDate=payload.pickup_date,
         EndDate=None,
@@ -72,7 +68,7 @@ def pickup_cancel_request(
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: CancelPickupRequest) -> str:
+def _request_serializer(request: "fedex_pickup.CancelPickupRequest") -> str:
     envelope: Envelope = create_envelope(body_content=request)
     envelope.Body.ns_prefix_ = envelope.ns_prefix_
     apply_namespaceprefix(envelope.Body.anytypeobjs_[0], "v22")
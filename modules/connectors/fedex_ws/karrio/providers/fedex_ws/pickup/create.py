@@ -1,24 +1,7 @@
 from datetime import datetime
 from typing import List, Tuple
 from functools import partial
-from karrio.schemas.fedex_ws.pickup_service_v22 import (
-    PickupAvailabilityReply,
-    CreatePickupRequest,
-    TransactionDetail,
-    VersionId,
-    PickupOriginDetail,
-    ContactAndAddress,
-    AssociatedAccount,
-    AssociatedAccountNumberType,
-    Address,
-    Contact,
-    Weight,
-    WeightUnits,
-    CarrierCodeType,
-    PickupRequestType,
-    CreatePickupReply,
-    NotificationSeverityType,
-)
+import karrio.schemas.fedex_ws.pickup_service_v22 as fedex_pickup
 from karrio.core.models import PickupRequest, PickupDetails, Message
 from karrio.core.units import Packages
 from karrio.core.utils import (
@@ -45,19 +28,19 @@ def parse_pickup_response(
 ) -> Tuple[PickupDetails, List[Message]]:
     response = _response.deserialize()
     reply = XP.to_object(
-        CreatePickupReply,
+        fedex_pickup.CreatePickupReply,
         lib.find_element("CreatePickupReply", response, first=True),
     )
     pickup = (
         _extract_pickup_details(reply, settings)
-        if reply.HighestSeverity == NotificationSeverityType.SUCCESS.value
+        if reply.HighestSeverity == fedex_pickup.NotificationSeverityType.SUCCESS.value
         else None
     )
     return pickup, parse_error_response(response, settings)
 
 
 def _extract_pickup_details(
-    reply: CreatePickupReply, settings: Settings
+    reply: "fedex_pickup.CreatePickupReply", settings: Settings
 ) -> PickupDetails:
     return PickupDetails(
         carrier_id=settings.carrier_id,
@@ -89,27 +72,29 @@ def _pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
     same_day = DF.date(payload.pickup_date).date() == datetime.today().date()
     packages = Packages(payload.parcels, PackagePresets, required=["weight"])
 
-    request = CreatePickupRequest(
+    request = fedex_pickup.CreatePickupRequest(
         WebAuthenticationDetail=settings.webAuthenticationDetail,
         ClientDetail=settings.clientDetail,
-        TransactionDetail=TransactionDetail(CustomerTransactionId="FTC"),
-        Version=VersionId(ServiceId="disp", Major=22, Intermediate=0, Minor=0),
-        AssociatedAccountNumber=AssociatedAccount(
-            Type=AssociatedAccountNumberType.FEDEX_EXPRESS.value,
+        TransactionDetail=fedex_pickup.TransactionDetail(CustomerTransactionId="FTC"),
+        Version=fedex_pickup.VersionId(
+            ServiceId="disp", Major=22, Intermediate=0, Minor=0
+        ),
+        AssociatedAccountNumber=fedex_pickup.AssociatedAccount(
+            Type=fedex_pickup.AssociatedAccountNumberType.FEDEX_EXPRESS.value,
             AccountNumber=settings.account_number,
         ),
         TrackingNumber=None,
-        OriginDetail=PickupOriginDetail(
+        OriginDetail=fedex_pickup.PickupOriginDetail(
             UseAccountAddress=None,
-            PickupLocation=ContactAndAddress(
-                Contact=Contact(
+            PickupLocation=fedex_pickup.ContactAndAddress(
+                Contact=fedex_pickup.Contact(
                     ContactId=None,
                     PersonName=payload.address.person_name,
                     CompanyName=payload.address.company_name,
                     PhoneNumber=payload.address.phone_number,
                     EMailAddress=payload.address.email,
                 ),
-                Address=Address(
+                Address=fedex_pickup.Address(
                     StreetLines=SF.concat_str(
                         payload.address.address_line1, payload.address.address_line2
                     ),
@@ -124,7 +109,9 @@ def _pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
             ReadyTimestamp=f"{payload.pickup_date}T{payload.ready_time}:00",
             CompanyCloseTime=f"{payload.closing_time}:00",
             PickupDateType=(
-                PickupRequestType.SAME_DAY if same_day else PickupRequestType.FUTURE_DAY
+                fedex_pickup.PickupRequestType.SAME_DAY
+                if same_day
+                else fedex_pickup.PickupRequestType.FUTURE_DAY
             ).value,
             LastAccessTime=None,
             GeographicalPostalCode=None,
@@ -138,11 +125,13 @@ def _pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
         ExpressFreightDetail=None,
         PackageCount=len(packages) or 1,
         TotalWeight=(
-            Weight(Units=WeightUnits.LB.name, Value=packages.weight.LB)
+            fedex_pickup.Weight(
+                Units=fedex_pickup.WeightUnits.LB.name, Value=packages.weight.LB
+            )
             if len(packages) > 0
             else None
         ),
-        CarrierCode=CarrierCodeType.FDXE.value,
+        CarrierCode=fedex_pickup.CarrierCodeType.FDXE.value,
         OversizePackageCount=None,
         Remarks=payload.instruction,
         CommodityDescription=None,
@@ -152,7 +141,7 @@ def _pickup_request(payload: PickupRequest, settings: Settings) -> Serializable:
     return Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: CreatePickupRequest) -> str:
+def _request_serializer(request: "fedex_pickup.CreatePickupRequest") -> str:
     envelope: Envelope = create_envelope(body_content=request)
     envelope.Body.ns_prefix_ = envelope.ns_prefix_
     apply_namespaceprefix(envelope.Body.anytypeobjs_[0], "v22")
@@ -173,7 +162,7 @@ def _create_pickup(
     availability_response: str, payload: PickupRequest, settings: Settings
 ):
     availability = XP.to_object(
-        PickupAvailabilityReply, XP.to_xml(availability_response)
+        fedex_pickup.PickupAvailabilityReply, XP.to_xml(availability_response)
     )
     data = _pickup_request(payload, settings) if availability else None
 
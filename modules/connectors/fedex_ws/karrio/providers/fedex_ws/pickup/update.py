@@ -1,9 +1,6 @@
 from typing import cast
 from functools import partial
-from karrio.schemas.fedex_ws.pickup_service_v22 import (
-    CreatePickupReply,
-    NotificationSeverityType,
-)
+import karrio.schemas.fedex_ws.pickup_service_v22 as fedex_pickup
 from karrio.core.utils import Job, Pipeline, XP, Serializable
 from karrio.core.models import (
     PickupRequest,
@@ -58,14 +55,14 @@ def _cancel_pickup_request(
         ),
         None,
     )
-    new_pickup = XP.to_object(CreatePickupReply, reply)
+    new_pickup = XP.to_object(fedex_pickup.CreatePickupReply, reply)
     data = (
         pickup_cancel_request(
             PickupCancelRequest(confirmation_number=payload.confirmation_number),
             settings,
         )
         if new_pickup is not None
-        and new_pickup.HighestSeverity == NotificationSeverityType.SUCCESS.value
+        and new_pickup.HighestSeverity == fedex_pickup.NotificationSeverityType.SUCCESS.value
         else None
     )
 
@@ -347,7 +347,7 @@ def rate_request(
     )
 
 
-def _request_serializer(request: fedex.RateRequest) -> str:
+def _request_serializer(request: "fedex.RateRequest") -> str:
     namespacedef_ = (
         'xmlns:tns="http://schemas.xmlsoap.org/soap/envelope/"'
         ' xmlns:SOAP-ENC="http://schemas.xmlsoap.org/soap/encoding/"'
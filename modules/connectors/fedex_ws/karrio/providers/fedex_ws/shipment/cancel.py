@@ -1,12 +1,5 @@
 from typing import List, Tuple
-from karrio.schemas.fedex_ws.ship_service_v26 import (
-    DeleteShipmentRequest,
-    TrackingId,
-    TransactionDetail,
-    VersionId,
-    DeletionControlType,
-    TrackingIdType,
-)
+import karrio.schemas.fedex_ws.ship_service_v26 as fedex_ship
 from karrio.core.models import ShipmentCancelRequest, ConfirmationDetails, Message
 from karrio.core.utils import (
     Element,
@@ -43,23 +36,29 @@ def shipment_cancel_request(
     payload: ShipmentCancelRequest, settings: Settings
 ) -> Serializable:
     tracking_type = next(
-        (t for t in list(TrackingIdType) if t.name.lower() in payload.service),
-        TrackingIdType.EXPRESS,
+        (
+            t
+            for t in list(fedex_ship.TrackingIdType)
+            if t.name.lower() in payload.service
+        ),
+        fedex_ship.TrackingIdType.EXPRESS,
     ).value
-    deletion_type = DeletionControlType[
+    deletion_type = fedex_ship.DeletionControlType[
         payload.options.get("deletion_type", "DELETE_ALL_PACKAGES")
     ].value
 
     request = create_envelope(
-        body_content=DeleteShipmentRequest(
+        body_content=fedex_ship.DeleteShipmentRequest(
             WebAuthenticationDetail=settings.webAuthenticationDetail,
             ClientDetail=settings.clientDetail,
-            TransactionDetail=TransactionDetail(
+            TransactionDetail=fedex_ship.TransactionDetail(
                 CustomerTransactionId="Delete Shipment"
             ),
-            Version=VersionId(ServiceId="ship", Major=23, Intermediate=0, Minor=0),
+            Version=fedex_ship.VersionId(
+                ServiceId="ship", Major=23, Intermediate=0, Minor=0
+            ),
             ShipTimestamp=None,
-            TrackingId=TrackingId(
+            TrackingId=fedex_ship.TrackingId(
                 TrackingIdType=tracking_type,
                 FormId=None,
                 UspsApplicationId=None,
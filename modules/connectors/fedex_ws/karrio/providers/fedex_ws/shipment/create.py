@@ -687,11 +687,11 @@ def shipment_request(
 
 
 def _request_serializer(
-    requests: typing.List[fedex.ProcessShipmentRequest],
+    requests: "typing.List[fedex.ProcessShipmentRequest]",
 ) -> typing.List[str]:
     namespacedef_ = 'xmlns:tns="http://schemas.xmlsoap.org/soap/envelope/" xmlns:v26="http://fedex.com/ws/ship/v26"'
 
-    def serialize(request: fedex.ProcessShipmentRequest):
+    def serialize(request: "fedex.ProcessShipmentRequest"):
         envelope = lib.create_envelope(body_content=request)
         envelope.Body.ns_prefix_ = envelope.ns_prefix_
         lib.apply_namespaceprefix(envelope.Body.anytypeobjs_[0], "v26")
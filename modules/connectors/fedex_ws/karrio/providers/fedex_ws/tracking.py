@@ -107,7 +107,7 @@ def _extract_tracking(
 
 
 def _parse_date_or_timestamp(
-    date_or_timestamps: typing.List[fedex.TrackingDateOrTimestamp], type: str
+    date_or_timestamps: "typing.List[fedex.TrackingDateOrTimestamp]", type: str
 ) -> typing.Optional[str]:
     return next(
         iter(
@@ -161,7 +161,7 @@ def tracking_request(
     return lib.Serializable(request, _request_serializer)
 
 
-def _request_serializer(request: fedex.TrackRequest) -> str:
+def _request_serializer(request: "fedex.TrackRequest") -> str:
     namespacedef_ = (
         'xmlns:tns="http://schemas.xmlsoap.org/soap/envelope/" '
         'xmlns:v18="http://fedex.com/ws/track/v18"'
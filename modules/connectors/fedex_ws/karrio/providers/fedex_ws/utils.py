@@ -1,11 +1,7 @@
 from typing import Callable
 from karrio.core import Settings as BaseSettings
 from karrio.core.utils import Envelope, apply_namespaceprefix, XP
-from karrio.schemas.fedex_ws.rate_service_v28 import (
-    WebAuthenticationCredential,
-    WebAuthenticationDetail,
-    ClientDetail,
-)
+import karrio.schemas.fedex_ws.rate_service_v28 as fedex
 import karrio.lib as lib
 
 
@@ -44,16 +40,16 @@ class Settings(BaseSettings):
         )
 
     @property
-    def webAuthenticationDetail(self) -> WebAuthenticationDetail:
-        return WebAuthenticationDetail(
-            UserCredential=WebAuthenticationCredential(
+    def webAuthenticationDetail(self) -> "fedex.WebAuthenticationDetail":
+        return fedex.WebAuthenticationDetail(
+            UserCredential=fedex.WebAuthenticationCredential(
                 Key=self.user_key, Password=self.password
             )
         )
 
     @property
-    def clientDetail(self) -> ClientDetail:
-        return ClientDetail(
+    def clientDetail(self) -> "fedex.ClientDetail":
+        return fedex.ClientDetail(
             AccountNumber=self.account_number, MeterNumber=self.meter_number
         )
 
@@ -5,6 +5,24 @@ class CoreConfig(AppConfig):
     name = "karrio.server.core"
 
     def ready(self):
+        from django.conf import settings
         from karrio.server.core.signals import register_signals
 
         register_signals()
+
+        if getattr(settings, "SDK_BACKGROUND_WORKERS", None) is not None:
+            import karrio.lib as lib
+
+            executor = lib.BackgroundExecutor(
+                max_workers=int(settings.SDK_BACKGROUND_WORKERS)
+            )
+            lib.set_executor(executor).shutdown(wait=False)
+
+        if getattr(settings, "SDK_NETWORK_WORKERS", None) is not None:
+            import karrio.lib as lib
+
+            executor = lib.BackgroundExecutor(
+                max_workers=int(settings.SDK_NETWORK_WORKERS),
+                thread_name_prefix="karrio-network",
+            )
+            lib.set_network_executor(executor).shutdown(wait=False)
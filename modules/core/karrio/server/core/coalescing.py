@@ -0,0 +1,263 @@
+"""Coalescing of identical in-flight rate requests.
+
+When identical rate requests (the exact same request and carrier connection,
+unlike the rate cache no field is rounded or ignored) are in flight at the
+same time, only the first one (the leader) requests the carrier. The others
+(the followers) wait for the leader rates instead of issuing their own call,
+and fall back to requesting the carrier if the leader fails or times out. The
+leader publishes the rates of each carrier as soon as it responds, so a slow
+carrier only delays the followers waiting for that carrier.
+
+The coalescing is disabled by default (an empty `RATING_COALESCING`). The
+in-flight requests are registered in process (`RATING_COALESCING = "local"`)
+or in the system cache to coalesce the requests of every worker sharing it,
+e.g. Redis (`RATING_COALESCING = "cache"`).
+"""
+
+import time
+import uuid
+import typing
+import logging
+import threading
+import collections
+from concurrent import futures
+from django.conf import settings
+import django.core.cache as caching
+
+import karrio
+import karrio.lib as lib
+import karrio.server.core.utils as utils
+import karrio.server.core.datatypes as datatypes
+import karrio.server.core.rate_cache as rate_cache
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_KEY = "{key}:inflight"
+COALESCE_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+Result = typing.Optional[dict]
+Waiter = typing.Callable[[float], Result]
+Flight = typing.Optional[str]
+
+_lock = threading.Lock()
+_counters: typing.Dict[str, int] = collections.Counter()
+
+
+class LocalRegistry:
+    """The in-flight requests of the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: typing.Dict[str, futures.Future] = {}
+
+    def claim(self, key: str, timeout: float) -> typing.Tuple[Flight, Waiter]:
+        """Register a request and return its flight to publish the result
+        when it leads, or how to wait for the leader result otherwise.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is None:
+                self._flights[key] = futures.Future()
+                return key, None
+
+        def wait(timeout: float) -> Result:
+            try:
+                return future.result(timeout)
+            except futures.TimeoutError:
+                return None
+
+        return None, wait
+
+    def publish(self, flight: str, result: Result):
+        with self._lock:
+            future = self._flights.pop(flight, None)
+
+        if future is not None:
+            future.set_result(result)
+
+
+class CacheRegistry:
+    """The in-flight requests of the processes sharing the system cache.
+
+    The leader claims a request with a random nonce scoping its result, so a
+    follower never reads the result of a previous flight of the same request.
+    """
+
+    def claim(self, key: str, timeout: float) -> typing.Tuple[Flight, Waiter]:
+        leader = f"{key}:leader"
+        nonce = caching.cache.get(leader)
+
+        if nonce is None:
+            nonce = uuid.uuid4().hex
+            if caching.cache.add(leader, nonce, int(timeout) + 1):
+                return f"{key}:{nonce}", None
+
+            nonce = caching.cache.get(leader)
+
+        if nonce is None:
+            # the leader just landed: request the carrier without a flight.
+            return f"{key}:{uuid.uuid4().hex}", None
+
+        def wait(timeout: float) -> Result:
+            result_key = f"{key}:result:{nonce}"
+            expires_at = time.monotonic() + timeout
+
+            while time.monotonic() < expires_at:
+                result = caching.cache.get(result_key)
+                if result is not None:
+                    return result
+                if caching.cache.get(leader) != nonce:
+                    return caching.cache.get(result_key)
+
+                time.sleep(POLL_INTERVAL)
+
+            return None
+
+        return None, wait
+
+    def publish(self, flight: str, result: Result):
+        key, nonce = flight.rsplit(":", 1)
+
+        if result is not None:
+            caching.cache.set(f"{key}:result:{nonce}", result, COALESCE_TIMEOUT)
+
+        if caching.cache.get(f"{key}:leader") == nonce:
+            caching.cache.delete(f"{key}:leader")
+
+
+_local = LocalRegistry()
+_shared = CacheRegistry()
+
+
+def registry() -> typing.Optional[typing.Union[LocalRegistry, CacheRegistry]]:
+    mode = getattr(settings, "RATING_COALESCING", None) or ""
+    return dict(local=_local, cache=_shared).get(mode)
+
+
+def fetch(
+    payload: dict,
+    request: karrio.api.interface.IRequestFromMany,
+    gateways: typing.Iterable[karrio.api.gateway.Gateway],
+    timeout: float = None,
+) -> typing.Tuple[typing.List[datatypes.Rate], typing.List[datatypes.Message]]:
+    """Fetch the rates of the gateways not already requested by an identical
+    in-flight request, then wait for the rates of the others.
+    """
+    gateways = list(gateways)
+    flights = registry()
+
+    if flights is None or len(gateways) == 0:
+        return _request(request, gateways)
+
+    timeout = float(
+        timeout
+        or getattr(settings, "RATING_COALESCE_TIMEOUT", None)
+        or COALESCE_TIMEOUT
+    )
+    expires_at = time.monotonic() + timeout
+    keys: typing.Dict[str, str] = {}
+    waiters: typing.Dict[str, Waiter] = {}
+
+    for gateway in gateways:
+        key = FLIGHT_KEY.format(key=rate_cache.cache_key(payload, gateway))
+        flight, wait = flights.claim(key, timeout)
+
+        if flight is not None:
+            keys[gateway.settings.carrier_id] = flight
+        else:
+            waiters[gateway.settings.carrier_id] = wait
+
+    leads = [_ for _ in gateways if _.settings.carrier_id in keys]
+    rates, messages = [], []
+
+    try:
+        # publish the rates of each carrier as soon as it responds
+        for response in request.stream(*leads) if any(leads) else []:
+            carrier_rates, carrier_messages = utils.identity(response.parse)
+            carrier_rates, carrier_messages = (
+                list(carrier_rates or []),
+                list(carrier_messages or []),
+            )
+            rates, messages = [*rates, *carrier_rates], [*messages, *carrier_messages]
+
+            for carrier_id in {
+                _.carrier_id for _ in [*carrier_rates, *carrier_messages]
+            } & set(keys):
+                flights.publish(
+                    keys.pop(carrier_id),
+                    _result(carrier_id, carrier_rates, carrier_messages),
+                )
+    finally:
+        # release the followers of a failed request (or of a carrier returning
+        # nothing) to let them fall back
+        for flight in keys.values():
+            flights.publish(flight, None)
+
+    fallbacks = []
+    for gateway in gateways:
+        if gateway.settings.carrier_id not in waiters:
+            continue
+
+        result = waiters[gateway.settings.carrier_id](
+            max(0.0, expires_at - time.monotonic())
+        )
+
+        if result is None:
+            fallbacks.append(gateway)
+            continue
+
+        rates += [lib.to_object(datatypes.Rate, _) for _ in result["rates"]]
+        messages += [lib.to_object(datatypes.Message, _) for _ in result["messages"]]
+
+    if any(fallbacks):
+        fallback_rates, fallback_messages = _request(request, fallbacks)
+        rates, messages = [*rates, *fallback_rates], [*messages, *fallback_messages]
+
+    _count(
+        led=len(leads),
+        coalesced=len(waiters) - len(fallbacks),
+        fallbacks=len(fallbacks),
+    )
+
+    return rates, messages
+
+
+def stats() -> typing.Dict[str, int]:
+    """Return the number of carrier calls led, saved by coalescing (coalesced)
+    and retried after a failed leader (fallbacks) by the current process.
+    """
+    with _lock:
+        return dict(
+            led=_counters["led"],
+            coalesced=_counters["coalesced"],
+            fallbacks=_counters["fallbacks"],
+        )
+
+
+def _request(
+    request: karrio.api.interface.IRequestFromMany,
+    gateways: typing.List[karrio.api.gateway.Gateway],
+) -> typing.Tuple[list, list]:
+    if len(gateways) == 0:
+        return [], []
+
+    # The request call is wrapped in utils.identity to simplify mocking in tests
+    rates, messages = utils.identity(lambda: request.from_(*gateways).parse())
+
+    return list(rates), list(messages)
+
+
+def _result(carrier_id: str, rates: list, messages: list) -> dict:
+    return dict(
+        rates=lib.to_dict([_ for _ in rates if _.carrier_id == carrier_id]),
+        messages=lib.to_dict([_ for _ in messages if _.carrier_id == carrier_id]),
+    )
+
+
+def _count(**counts: int):
+    with _lock:
+        _counters.update(counts)
+
+    if counts.get("coalesced"):
+        logger.debug(f"{counts['coalesced']} carrier rate calls coalesced")
@@ -83,12 +83,11 @@ def contextual_reference(request: Request = None, reduced: bool = True):
         custom_carriers = [
             c
             for c in (
-                gateway.Carriers.list(context=request, carrier_name="generic").exclude(
-                    is_system=True
-                )
+                gateway.Carriers.list(context=request, carrier_name="generic")
                 if is_authenticated
                 else []
             )
+            if not c.is_system
         ]
 
         extra_carriers = {
@@ -1,9 +1,13 @@
 import uuid
 import typing
+import weakref
 import logging
 import datetime
+import functools
+import threading
+from concurrent import futures
 
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 from django.conf import settings
 from rest_framework import status
 from rest_framework.exceptions import NotFound
@@ -15,18 +19,46 @@ import karrio.server.core.models as core
 import karrio.server.core.datatypes as datatypes
 import karrio.server.core.dataunits as dataunits
 import karrio.server.core.validators as validators
+import karrio.server.core.rate_cache as rate_cache
+import karrio.server.core.coalescing as coalescing
 import karrio.server.core.exceptions as exceptions
 import karrio.server.providers.models as providers
+import karrio.server.providers.snapshot as snapshots
 import karrio.server.core.serializers as serializers
 
 logger = logging.getLogger(__name__)
 
+_carrier_slots_lock = threading.Lock()
+_carrier_slots: typing.MutableMapping[tuple, threading.BoundedSemaphore] = (
+    weakref.WeakValueDictionary()
+)
+
 
 class Carriers:
     @staticmethod
     def list(context=None, **kwargs) -> typing.List[providers.Carrier]:
+        """Return the list of carrier connections matching the filters.
+
+        The connections are resolved from the in-memory snapshot of the context
+        principal connections when enabled (see `providers.snapshot`), from
+        the database otherwise. Use `Carriers.query` for a queryset.
+        """
+        carriers = lib.identity(
+            Carriers.lookup(context, **kwargs)
+            if snapshots.is_enabled()
+            else list(Carriers.query(context, **kwargs))
+        )
+
+        # Raise an error if no carrier is found
+        if kwargs.get("raise_not_found") and len(carriers) == 0:
+            raise NotFound("No active carrier connection found to process the request")
+
+        return carriers
+
+    @staticmethod
+    def query(context=None, **kwargs) -> QuerySet:
+        """Return the queryset of the carrier connections matching the filters."""
         list_filter = kwargs.copy()
-        user_filter = core.get_access_filter(context) if context is not None else []
 
         test_mode = list_filter.get("test_mode") or getattr(context, "test_mode", None)
         system_only = list_filter.get("system_only") is True
@@ -38,18 +70,8 @@ class Carriers:
             "id",
             None,
         )
-        creator_filter = lib.identity(
-            Q(
-                created_by__id=context.user.id,
-                **(dict(org=None) if settings.MULTI_ORGANIZATIONS else {}),
-            )
-            if getattr(context, "user", None) is not None
-            else Q()
-        )
 
-        _user_carriers = providers.Carrier.user_carriers.filter(
-            user_filter if len(user_filter) > 0 else Q() | creator_filter
-        )
+        _user_carriers = Carriers.user_carriers(context)
         _system_carriers = providers.Carrier.system_carriers.filter(
             Q(
                 **{
@@ -117,18 +139,126 @@ class Carriers:
             carrier_name = list_filter["carrier_name"]
             _queryset = _queryset.filter(carrier_code=carrier_name)
 
-        carriers = _queryset.distinct()
+        return _queryset.distinct()
 
-        # Raise an error if no carrier is found
-        if list_filter.get("raise_not_found") and len(carriers) == 0:
-            raise NotFound("No active carrier connection found to process the request")
+    @staticmethod
+    def lookup(context=None, **kwargs) -> typing.List[providers.Carrier]:
+        """Return the carrier connections matching the filters, resolved from the
+        in-memory snapshot of the context principal connections.
+        """
+        list_filter = kwargs.copy()
+        snapshot = snapshots.get_snapshot(
+            context, lambda: Carriers.user_carriers(context)
+        )
 
-        return carriers
+        test_mode = list_filter.get("test_mode") or getattr(context, "test_mode", None)
+        system_only = list_filter.get("system_only") is True
+        _carriers = lib.identity(
+            snapshot.active_system_ids
+            if system_only
+            else snapshot.user_ids | snapshot.active_system_ids
+        )
+
+        # Check if the test filter is specified then set it otherwise return all carriers live and test mode
+        if test_mode is not None:
+            _carriers = _carriers & snapshot.by_test_mode.get(test_mode, set())
+
+        # Check if the active flag is specified and return all active carrier is active is not set to false
+        if list_filter.get("active") is not None:
+            active = False if list_filter["active"] is False else True
+            _carriers = {_ for _ in _carriers if snapshot.by_id[_].active == active}
+
+        # Check if a specific carrier_id is provided, to add it to the query
+        if "carrier_id" in list_filter:
+            _carriers = _carriers & snapshot.by_carrier_id.get(
+                list_filter["carrier_id"], set()
+            )
+
+        # Check if a specific capability is provided, to add it to the query
+        if "capability" in list_filter:
+            _carriers = _carriers & snapshot.capability(list_filter["capability"])
+
+        # Check if a metadata key is provided, to add it to the query
+        if "metadata_key" in list_filter:
+            _carriers = {
+                _
+                for _ in _carriers
+                if list_filter["metadata_key"] in (snapshot.by_id[_].metadata or {})
+            }
+
+        # Check if a metadata value is provided, to add it to the query
+        if "metadata_value" in list_filter:
+            _carriers = {
+                _
+                for _ in _carriers
+                if list_filter["metadata_value"]
+                in (snapshot.by_id[_].metadata or {}).values()
+            }
+
+        # Check if a list of carrier_ids are provided, to add the list to the query
+        if any(list_filter.get("carrier_ids", [])):
+            _carriers = _carriers & set().union(
+                *(
+                    snapshot.by_carrier_id.get(_, set())
+                    for _ in list_filter["carrier_ids"]
+                )
+            )
+
+        if any(list_filter.get("services", [])):
+            carrier_names = snapshot.carrier_names(
+                list_filter["services"],
+                Carriers.custom_carriers(context),
+            )
+
+            if len(carrier_names) > 0:
+                _carriers = _carriers & set().union(
+                    *(snapshot.by_carrier_code.get(_, set()) for _ in carrier_names)
+                )
+        if "carrier_name" in list_filter:
+            _carriers = _carriers & snapshot.by_carrier_code.get(
+                list_filter["carrier_name"], set()
+            )
+
+        return snapshot.resolve(_carriers)
 
     @staticmethod
     def first(**kwargs) -> providers.Carrier:
         return next(iter(Carriers.list(**kwargs)), None)
 
+    @staticmethod
+    def user_carriers(context=None):
+        """Return the queryset of the user carrier connections accessible in context."""
+        user_filter = core.get_access_filter(context) if context is not None else []
+        creator_filter = lib.identity(
+            Q(
+                created_by__id=context.user.id,
+                **(dict(org=None) if settings.MULTI_ORGANIZATIONS else {}),
+            )
+            if getattr(context, "user", None) is not None
+            else Q()
+        )
+
+        return providers.Carrier.user_carriers.filter(
+            user_filter if len(user_filter) > 0 else Q() | creator_filter
+        )
+
+    @staticmethod
+    def custom_carriers(context=None) -> typing.List[str]:
+        """Return the ids of the generic user connections of an authenticated
+        context (used to resolve the custom carriers services).
+        """
+        import karrio.server.core.middleware as middleware
+
+        request = context or middleware.SessionContext.get_current_request()
+        if not getattr(getattr(request, "user", None), "is_authenticated", False):
+            return []
+
+        return [
+            carrier.id
+            for carrier in Carriers.list(context=request, carrier_name="generic")
+            if not carrier.is_system
+        ]
+
 
 class Address:
     @staticmethod
@@ -552,8 +682,306 @@ class Rates:
         payload: dict,
         carriers: typing.List[providers.Carrier] = None,
         raise_on_error: bool = True,
+        deadline: float = None,
+        carrier_timeout: float = None,
         **carrier_filters,
     ) -> datatypes.RateResponse:
+        """Fetch the rates of the matching carrier connections.
+
+        `deadline` and `carrier_timeout` (seconds, defaulting to the
+        RATING_DEADLINE and RATING_CARRIER_TIMEOUT settings) bound the wait:
+        the carriers missing their budget are returned as timeout messages.
+        The rates cached for the request (see `rate_cache`) are returned
+        without requesting their carrier and identical in-flight requests
+        share a single carrier call (see `coalescing`).
+        """
+        carriers, gateways, request = Rates.prepare(
+            payload,
+            carriers,
+            raise_on_error,
+            deadline,
+            carrier_timeout,
+            **carrier_filters,
+        )
+        rates, messages = Rates.collect(payload, gateways, request, deadline)
+
+        if raise_on_error and not any(rates) and any(messages):
+            raise exceptions.APIException(
+                detail=messages,
+                status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            )
+
+        return Rates.format_response(rates, messages, carriers)
+
+    @staticmethod
+    def stream(
+        payload: dict,
+        carriers: typing.List[providers.Carrier] = None,
+        raise_on_error: bool = True,
+        deadline: float = None,
+        carrier_timeout: float = None,
+        **carrier_filters,
+    ) -> typing.Iterator[datatypes.RateResponse]:
+        """Fetch the rates of the matching carrier connections and return an
+        iterator of one post processed rate response per carrier, in the order
+        the carriers respond. Like `fetch`, the rates cached for the request
+        (see `rate_cache`) are returned first, in a single response, without
+        requesting their carrier.
+        """
+        carriers, gateways, request = Rates.prepare(
+            payload,
+            carriers,
+            raise_on_error,
+            deadline,
+            carrier_timeout,
+            **carrier_filters,
+        )
+        context = carrier_filters.get("context")
+        respond = lambda rates, messages: functools.reduce(
+            lambda result, process: process(context, result),
+            Rates.post_process_functions,
+            Rates.format_response(rates, messages, carriers),
+        )
+
+        def responses():
+            cache = (
+                rate_cache.RateCache(payload, gateways)
+                if rate_cache.is_enabled()
+                else None
+            )
+            misses = gateways if cache is None else cache.misses
+
+            # the cached rates are returned first, as a single response
+            if cache is not None and any(cache.hits):
+                cache.revalidate(request)
+                yield respond(*cache.cached())
+
+            for response in request.stream(*misses) if any(misses) else []:
+                rates, messages = response.parse()
+
+                if cache is not None:
+                    cache.store(rates, messages)
+                    rates = cache.fetched(rates)
+
+                yield respond(rates, messages)
+
+        return responses()
+
+    @staticmethod
+    def fetch_many(
+        payloads: typing.List[dict],
+        carriers: typing.List[providers.Carrier] = None,
+        deadline: float = None,
+        carrier_timeout: float = None,
+        max_workers: int = None,
+        carrier_concurrency: int = None,
+        **carrier_filters,
+    ) -> typing.Iterator[typing.Tuple[int, datatypes.RateResponse]]:
+        """Fetch the rates of many rate requests and return an iterator of the
+        index and post processed rate response of each request, in the order
+        they complete.
+
+        The carrier connections and gateways are resolved once per distinct
+        carrier_ids, services and shipper country. Each carrier call of a
+        request is rated by one of `max_workers` threads (BULK_RATING_WORKERS),
+        with at most `carrier_concurrency` (BULK_RATING_CARRIER_CONCURRENCY)
+        calls in flight per carrier connection in the process. The calls not
+        started yet are cancelled when the iterator is closed.
+        """
+        context = carrier_filters.get("context")
+        workers = int(
+            max_workers or getattr(settings, "BULK_RATING_WORKERS", None) or 8
+        )
+        concurrency = int(
+            carrier_concurrency
+            or getattr(settings, "BULK_RATING_CARRIER_CONCURRENCY", None)
+            or 4
+        )
+        connections: typing.Dict[tuple, tuple] = {}
+
+        def resolve(payload: dict) -> tuple:
+            key = (
+                tuple(sorted(payload.get("carrier_ids") or [])),
+                tuple(sorted(payload.get("services") or [])),
+                payload["shipper"].get("country_code"),
+            )
+            if key not in connections:
+                connections[key] = Rates.resolve(
+                    payload, carriers, False, **carrier_filters
+                )
+
+            return connections[key]
+
+        items = [
+            (index, payload, *resolve(payload))
+            for index, payload in enumerate(payloads)
+        ]
+
+        def collect(payload: dict, request, gateway: karrio.api.gateway.Gateway):
+            with Rates.carrier_slot(gateway, concurrency):
+                return Rates.collect(payload, [gateway], request, deadline)
+
+        def responses():
+            executor = lib.get_network_executor()
+            pending: typing.Dict[int, int] = {}
+            results: typing.Dict[int, tuple] = {}
+            calls: typing.List[tuple] = []
+            running: typing.Dict[futures.Future, tuple] = {}
+
+            for index, payload, carriers, gateways in items:
+                if not any(gateways):
+                    continue
+
+                request = Rates.create_request(payload, deadline, carrier_timeout)
+                pending[index] = len(gateways)
+                results[index] = ([], [], carriers)
+                calls.extend((index, payload, request, gateway) for gateway in gateways)
+
+            queued = iter(calls)
+
+            def submit():
+                # at most `workers` carrier calls of this request queued or running
+                for index, payload, request, gateway in queued:
+                    task = executor.submit(collect, payload, request, gateway)
+                    running[task] = (index, gateway)
+
+                    if len(running) >= workers:
+                        return
+
+            try:
+                submit()
+
+                for index, _, _, gateways in items:
+                    if not any(gateways):
+                        yield index, datatypes.RateResponse(
+                            rates=[],
+                            messages=[
+                                datatypes.Message(
+                                    carrier_name=None,
+                                    carrier_id=None,
+                                    code="not_found",
+                                    message="No active carrier connection found to process the request",
+                                )
+                            ],
+                        )
+
+                while running:
+                    done, _ = futures.wait(
+                        list(running), return_when=futures.FIRST_COMPLETED
+                    )
+
+                    for task in done:
+                        index, gateway = running.pop(task)
+                        rates, messages, carriers = results[index]
+
+                        try:
+                            carrier_rates, carrier_messages = task.result()
+                        except Exception as e:
+                            logger.exception(e)
+                            carrier_rates, carrier_messages = [], [
+                                datatypes.Message(
+                                    carrier_name=gateway.settings.carrier_name,
+                                    carrier_id=gateway.settings.carrier_id,
+                                    code="rating_error",
+                                    message=str(e),
+                                )
+                            ]
+
+                        rates.extend(carrier_rates)
+                        messages.extend(carrier_messages)
+                        pending[index] -= 1
+                        submit()
+
+                        if pending[index] > 0:
+                            continue
+
+                        yield index, functools.reduce(
+                            lambda result, process: process(context, result),
+                            Rates.post_process_functions,
+                            Rates.format_response(rates, messages, carriers),
+                        )
+            finally:
+                # drop the calls not started yet (e.g. a client disconnecting)
+                for task in running:
+                    task.cancel()
+
+        return responses()
+
+    @staticmethod
+    def carrier_slot(
+        gateway: karrio.api.gateway.Gateway, concurrency: int
+    ) -> threading.BoundedSemaphore:
+        """Return the process wide semaphore limiting the in-flight bulk rating
+        calls of a carrier connection.
+
+        The semaphores are only kept while referenced (i.e. while a call holds
+        or waits for a slot).
+        """
+        key = (gateway.settings.id, concurrency)
+
+        with _carrier_slots_lock:
+            slot = _carrier_slots.get(key)
+            if slot is None:
+                slot = _carrier_slots[key] = threading.BoundedSemaphore(concurrency)
+
+            return slot
+
+    @staticmethod
+    def collect(
+        payload: dict,
+        gateways: typing.List[karrio.api.gateway.Gateway],
+        request: karrio.api.interface.IRequestFromMany,
+        deadline: float = None,
+    ) -> typing.Tuple[typing.List[datatypes.Rate], typing.List[datatypes.Message]]:
+        """Return the cached rates of the gateways and request the others."""
+        cache = (
+            rate_cache.RateCache(payload, gateways) if rate_cache.is_enabled() else None
+        )
+        rates, messages = coalescing.fetch(
+            payload,
+            request,
+            gateways if cache is None else cache.misses,
+            timeout=(
+                deadline
+                if deadline is not None
+                else getattr(settings, "RATING_DEADLINE", None)
+            ),
+        )
+
+        if cache is None:
+            return rates, messages
+
+        return cache.resolve(request, rates, messages)
+
+    @staticmethod
+    def prepare(
+        payload: dict,
+        carriers: typing.List[providers.Carrier] = None,
+        raise_on_error: bool = True,
+        deadline: float = None,
+        carrier_timeout: float = None,
+        **carrier_filters,
+    ) -> typing.Tuple[
+        typing.List[providers.Carrier],
+        typing.List[karrio.api.gateway.Gateway],
+        karrio.api.interface.IRequestFromMany,
+    ]:
+        carriers, gateways = Rates.resolve(
+            payload, carriers, raise_on_error, **carrier_filters
+        )
+        request = Rates.create_request(payload, deadline, carrier_timeout)
+
+        return carriers, gateways, request
+
+    @staticmethod
+    def resolve(
+        payload: dict,
+        carriers: typing.List[providers.Carrier] = None,
+        raise_on_error: bool = True,
+        **carrier_filters,
+    ) -> typing.Tuple[
+        typing.List[providers.Carrier], typing.List[karrio.api.gateway.Gateway]
+    ]:
         services = payload.get("services", [])
         carrier_ids = payload.get("carrier_ids", [])
         shipper_country_code = payload["shipper"].get("country_code")
@@ -574,17 +1002,34 @@ class Rates:
         if raise_on_error and len(gateways) == 0:
             raise NotFound("No active carrier connection found to process the request")
 
-        request = karrio.Rating.fetch(lib.to_object(datatypes.RateRequest, payload))
+        return carriers, list(gateways)
 
-        # The request call is wrapped in utils.identity to simplify mocking in tests
-        rates, messages = utils.identity(lambda: request.from_(*gateways).parse())
-
-        if raise_on_error and not any(rates) and any(messages):
-            raise exceptions.APIException(
-                detail=messages,
-                status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            )
+    @staticmethod
+    def create_request(
+        payload: dict,
+        deadline: float = None,
+        carrier_timeout: float = None,
+    ) -> karrio.api.interface.IRequestFromMany:
+        return karrio.Rating.fetch(
+            lib.to_object(datatypes.RateRequest, payload),
+            deadline=lib.to_decimal(
+                deadline
+                if deadline is not None
+                else getattr(settings, "RATING_DEADLINE", None)
+            ),
+            carrier_timeout=lib.to_decimal(
+                carrier_timeout
+                if carrier_timeout is not None
+                else getattr(settings, "RATING_CARRIER_TIMEOUT", None)
+            ),
+        )
 
+    @staticmethod
+    def format_response(
+        rates: typing.List[datatypes.Rate],
+        messages: typing.List[datatypes.Message],
+        carriers: typing.List[providers.Carrier],
+    ) -> datatypes.RateResponse:
         def process_rate(rate: datatypes.Rate) -> datatypes.Rate:
             carrier = next((c for c in carriers if c.carrier_id == rate.carrier_id))
             rate_provider = (
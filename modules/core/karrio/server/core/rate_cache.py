@@ -0,0 +1,289 @@
+"""Opt-in cache of the carrier rates by normalized rate request.
+
+The rates returned by a carrier connection are cached under a key derived from
+the canonical form of the rate request (see `canonicalize`), the connection id
+and a fingerprint of its settings, so a connection or config change never
+serves stale quotes.
+
+The cache is disabled by default (and the rate requests are then neither
+canonicalized nor hashed). It is enabled with the `RATE_CACHE_TTL` setting
+(seconds) or per carrier name with `RATE_CACHE_CARRIER_TTLS`. Expired
+rates are still served for `RATE_CACHE_STALE_TTL` seconds while they are
+refreshed in the background (stale-while-revalidate).
+"""
+
+import json
+import time
+import typing
+import hashlib
+import logging
+import datetime
+from django.conf import settings
+import django.core.cache as caching
+
+import karrio
+import karrio.lib as lib
+import karrio.server.conf as server_conf
+import karrio.server.core.utils as utils
+import karrio.server.core.datatypes as datatypes
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "karrio:rates:{schema}:{digest}"
+IGNORED_FIELDS = [
+    "id",
+    "object_type",
+    "meta",
+    "validation",
+    "validate_location",
+    "person_name",
+    "email",
+    "phone_number",
+    "reference_number",
+]
+ROUNDED_FIELDS = ["weight", "width", "height", "length"]
+
+
+class RateCache:
+    """The cached rates of the gateways of a rate request."""
+
+    def __init__(
+        self, payload: dict, gateways: typing.Iterable[karrio.api.gateway.Gateway]
+    ):
+        self.gateways = list(gateways)
+        self.entries: typing.Dict[str, typing.Tuple[str, int]] = {}
+        self.hits: typing.Dict[str, dict] = {}
+
+        enabled = [_ for _ in self.gateways if carrier_ttl(_) > 0]
+        if len(enabled) == 0:
+            return
+
+        request = canonicalize(payload)
+        self.entries = {
+            _.settings.carrier_id: (cache_key(request, _), carrier_ttl(_))
+            for _ in enabled
+        }
+        cached = caching.cache.get_many([key for key, _ in self.entries.values()])
+        self.hits = {
+            carrier_id: cached[key]
+            for carrier_id, (key, _) in self.entries.items()
+            if key in cached
+        }
+
+    @property
+    def misses(self) -> typing.List[karrio.api.gateway.Gateway]:
+        """The gateways to request the rates from."""
+        return [_ for _ in self.gateways if _.settings.carrier_id not in self.hits]
+
+    @property
+    def stale(self) -> typing.List[karrio.api.gateway.Gateway]:
+        """The gateways served with expired rates to refresh."""
+        return [
+            _
+            for _ in self.gateways
+            if _.settings.carrier_id in self.hits
+            and self.hits[_.settings.carrier_id]["expires_at"] <= time.time()
+        ]
+
+    def resolve(
+        self,
+        request: karrio.api.interface.IRequestFromMany,
+        rates: typing.List[datatypes.Rate],
+        messages: typing.List[datatypes.Message],
+    ) -> typing.Tuple[typing.List[datatypes.Rate], typing.List[datatypes.Message]]:
+        """Cache the fetched rates then return them with the cached rates.
+
+        The stale rates are refreshed in the background.
+        """
+        self.store(rates, messages)
+        self.revalidate(request)
+        cached_rates, cached_messages = self.cached()
+
+        return [*self.fetched(rates), *cached_rates], [*messages, *cached_messages]
+
+    def cached(
+        self,
+    ) -> typing.Tuple[typing.List[datatypes.Rate], typing.List[datatypes.Message]]:
+        """Return the cached rates and messages."""
+        rates = [
+            rate
+            for entry in self.hits.values()
+            for rate in _load(datatypes.Rate, entry["rates"], _metadata(entry))
+        ]
+        messages = [
+            message
+            for entry in self.hits.values()
+            for message in _load(datatypes.Message, entry["messages"])
+        ]
+
+        return rates, messages
+
+    def fetched(
+        self, rates: typing.List[datatypes.Rate]
+    ) -> typing.List[datatypes.Rate]:
+        """Flag the fetched rates of the cached carriers as cache misses."""
+        return [
+            (
+                _load(datatypes.Rate, [rate], dict(cache_hit=False))[0]
+                if rate.carrier_id in self.entries
+                else rate
+            )
+            for rate in rates
+        ]
+
+    def store(
+        self,
+        rates: typing.List[datatypes.Rate],
+        messages: typing.List[datatypes.Message],
+        gateways: typing.List[karrio.api.gateway.Gateway] = None,
+    ):
+        """Cache the rates of the requested gateways that returned some."""
+        now = time.time()
+
+        for _ in gateways or self.misses:
+            carrier_id = _.settings.carrier_id
+            carrier_rates = [r for r in rates if r.carrier_id == carrier_id]
+
+            if carrier_id not in self.entries or len(carrier_rates) == 0:
+                continue
+
+            key, ttl = self.entries[carrier_id]
+            entry = dict(
+                rates=lib.to_dict(carrier_rates),
+                messages=lib.to_dict(
+                    [m for m in messages if m.carrier_id == carrier_id]
+                ),
+                cached_at=now,
+                expires_at=now + ttl,
+            )
+            caching.cache.set(key, entry, ttl + stale_ttl())
+
+    def revalidate(self, request: karrio.api.interface.IRequestFromMany) -> list:
+        """Refresh the stale rates in the background, once per key."""
+        tasks = []
+
+        for _ in self.stale:
+            key, ttl = self.entries[_.settings.carrier_id]
+            lock = f"{key}:revalidating"
+
+            if not caching.cache.add(lock, True, ttl):
+                continue
+
+            def refresh(gateway: karrio.api.gateway.Gateway = _, lock: str = lock):
+                try:
+                    rates, messages = utils.identity(
+                        lambda: request.from_(gateway).parse()
+                    )
+                    self.store(rates, messages, [gateway])
+                finally:
+                    caching.cache.delete(lock)
+
+            tasks.append(utils.run_async(refresh))
+
+        return tasks
+
+
+def is_enabled() -> bool:
+    """Return whether the rates of any carrier are cached."""
+    ttls = getattr(settings, "RATE_CACHE_CARRIER_TTLS", None) or {}
+
+    return int(getattr(settings, "RATE_CACHE_TTL", None) or 0) > 0 or any(
+        int(ttl or 0) > 0 for ttl in ttls.values()
+    )
+
+
+def carrier_ttl(gateway: karrio.api.gateway.Gateway) -> int:
+    ttls = getattr(settings, "RATE_CACHE_CARRIER_TTLS", None) or {}
+    ttl = ttls.get(
+        gateway.settings.carrier_name, getattr(settings, "RATE_CACHE_TTL", None)
+    )
+
+    return int(ttl or 0)
+
+
+def stale_ttl() -> int:
+    return int(getattr(settings, "RATE_CACHE_STALE_TTL", None) or 0)
+
+
+def canonicalize(payload: dict) -> dict:
+    """Return the rate request fields affecting the rates in a canonical form.
+
+    The address texts are upper cased with their whitespaces collapsed, the
+    parcel weights and dimensions are rounded to `RATE_CACHE_WEIGHT_PRECISION`
+    decimals and the options are hashed. The fields irrelevant to rating
+    (e.g. contact details, references, carrier_ids) are dropped.
+    """
+    precision = int(getattr(settings, "RATE_CACHE_WEIGHT_PRECISION", 1))
+    request = lib.to_dict(payload)
+
+    def normalize(data: dict) -> dict:
+        return {
+            key: (
+                round(float(value), precision)
+                if key in ROUNDED_FIELDS and value is not None
+                else _text(value, key == "postal_code")
+            )
+            for key, value in sorted(data.items())
+            if key not in IGNORED_FIELDS
+        }
+
+    return dict(
+        shipper=normalize(request.get("shipper") or {}),
+        recipient=normalize(request.get("recipient") or {}),
+        return_address=normalize(request.get("return_address") or {}),
+        parcels=[normalize(parcel) for parcel in request.get("parcels") or []],
+        services=sorted(request.get("services") or []),
+        options=_digest(request.get("options") or {}),
+    )
+
+
+def cache_key(request: dict, gateway: karrio.api.gateway.Gateway) -> str:
+    version = _digest(lib.to_dict(gateway.settings))
+    digest = _digest(
+        dict(request=request, connection=gateway.settings.id, version=version)
+    )
+
+    return CACHE_KEY.format(
+        schema=server_conf.settings.schema or "public", digest=digest
+    )
+
+
+def _text(value: typing.Any, compact: bool = False) -> typing.Any:
+    if isinstance(value, dict):
+        return {k: _text(v) for k, v in sorted(value.items())}
+    if isinstance(value, list):
+        return [_text(v) for v in value]
+    if not isinstance(value, str):
+        return value
+
+    return ("" if compact else " ").join(value.split()).upper()
+
+
+def _digest(data: typing.Any) -> str:
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _metadata(entry: dict) -> dict:
+    return dict(
+        cache_hit=True,
+        cache_stale=entry["expires_at"] <= time.time(),
+        cached_at=datetime.datetime.fromtimestamp(
+            entry["cached_at"], datetime.timezone.utc
+        ).isoformat(),
+    )
+
+
+def _load(cls: typing.Type, items: typing.List[dict], meta: dict = None) -> list:
+    return [
+        lib.to_object(
+            cls,
+            (
+                {**item, "meta": {**(item.get("meta") or {}), **meta}}
+                if meta is not None
+                else item
+            ),
+        )
+        for item in lib.to_dict(items)
+    ]
@@ -1,3 +1,4 @@
+import django.conf as conf
 import rest_framework as drf
 
 import karrio.core.units as units
@@ -689,6 +690,25 @@ class RateRequest(validators.OptionDefaultSerializer):
     )
 
 
+class BulkRateRequest(serializers.Serializer):
+    shipments = RateRequest(
+        many=True,
+        allow_empty=False,
+        help_text="The list of shipments to rate",
+    )
+
+    def validate_shipments(self, shipments):
+        limit = int(getattr(conf.settings, "BULK_RATING_MAX_SHIPMENTS", 100))
+
+        if len(shipments) > limit:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {limit} elements.",
+                code="max_length",
+            )
+
+        return shipments
+
+
 class TrackingInfo(serializers.Serializer):
     carrier_tracking_link = serializers.CharField(
         required=False, allow_null=True, help_text="The carrier tracking link"
@@ -1753,6 +1773,18 @@ class RateResponse(serializers.Serializer):
     rates = Rate(many=True, help_text="The list of returned rates")
 
 
+class BulkRateResult(RateResponse):
+    index = serializers.IntegerField(
+        help_text="The index of the shipment in the bulk rate request"
+    )
+
+
+class BulkRateResponse(serializers.Serializer):
+    results = BulkRateResult(
+        many=True, help_text="The rate response of each shipment in request order"
+    )
+
+
 class TrackingResponse(serializers.Serializer):
     messages = Message(
         required=False, many=True, help_text="The list of note or warning messages"
@@ -261,6 +261,15 @@ def filter_rate_carrier_compatible_gateways(
     return ({_.settings.carrier_id: _ for _ in _gateways}).values()
 
 
+def is_shared_cache(alias: str = "default") -> bool:
+    """Return whether the system cache is shared by every process (e.g. Redis)
+    rather than local to each process (the default local memory cache).
+    """
+    backend = (getattr(settings, "CACHES", {}).get(alias) or {}).get("BACKEND", "")
+
+    return not backend.endswith(("LocMemCache", "DummyCache"))
+
+
 def is_system_loading_data() -> bool:
     try:
         for fr in inspect.stack():
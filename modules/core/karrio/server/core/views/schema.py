@@ -223,6 +223,13 @@ def render_tags(request, APP_NAME):
                 The `carrier_id` is a friendly name you assign to your connection.
                 """,
             },
+            {
+                "name": "Rate Sheets",
+                "description": f"""This is an object representing your {APP_NAME} rate sheets.
+                A rate sheet holds the service levels and zones of a custom or generic carrier.
+                You can rate parcels in batch against a rate sheet without creating shipments.
+                """,
+            },
             {
                 "name": "Addresses",
                 "description": f"""This is an object representing your {APP_NAME} shipping address.
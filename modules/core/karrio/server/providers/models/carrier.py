@@ -1,5 +1,8 @@
+import attr
+import uuid
 import typing
 import functools
+import django.db as db
 import django.conf as conf
 import django.forms as forms
 import django.db.models as models
@@ -9,6 +12,7 @@ import karrio.lib as lib
 import karrio.core.units as units
 import django.core.cache as caching
 import karrio.api.gateway as gateway
+import karrio.server.conf as server_conf
 import karrio.server.core.models as core
 import karrio.server.core.fields as fields
 import karrio.server.core.datatypes as datatypes
@@ -19,6 +23,13 @@ CURRENCIES = [(c.name, c.name) for c in units.Currency]
 WEIGHT_UNITS = [(c.name, c.name) for c in units.WeightUnit]
 DIMENSION_UNITS = [(c.name, c.name) for c in units.DimensionUnit]
 CAPABILITIES_CHOICES = [(c, c) for c in units.CarrierCapabilities.get_capabilities()]
+# process wide connection cache (auth tokens...) backed by the system cache
+CONNECTION_CACHE = lib.Cache(caching.cache)
+# process wide gateways cache: {carrier id: ((updated_at, version), gateway)}
+# the version is kept in the system cache: with a per process cache, the
+# config changes made by other processes are picked up on expiry.
+GATEWAY_CACHE = lib.Cache(maxsize=512, local_timeout=300)
+GATEWAY_VERSION_KEY = "karrio:gateways:{schema}"
 
 
 class Manager(models.Manager):
@@ -206,18 +217,58 @@ class Carrier(core.OwnedEntity):
 
     @property
     def gateway(self) -> gateway.Gateway:
+        """Checkout the connection gateway with the current request tracer.
+
+        The gateway (settings, mapper and proxy) is built once per connection
+        and reused until the connection changes (`updated_at`) or the gateways
+        version is bumped by a config or rate sheet change (see
+        `invalidate_gateway`). The system connections gateways are kept per
+        principal as their config can be overridden per organization or user.
+        """
         import karrio.server.core.middleware as middleware
 
         _context = middleware.SessionContext.get_current_request()
-        _tracer = getattr(_context, "tracer", lib.Tracer())
-        _cache = lib.Cache(caching.cache)
-
-        return karrio.gateway[self.ext].create(
-            self.data.to_dict(),
-            _tracer,
-            _cache,
+        _tracer = getattr(_context, "tracer", None) or lib.Tracer()
+        _key = lib.identity(
+            f"{self.id}:{_principal(_context)}" if self.is_system else self.id
+        )
+        _version = (self.updated_at, _gateways_version())
+
+        _cached = GATEWAY_CACHE.get(_key)
+        if _cached is None or _cached[0] != _version:
+            _gateway = karrio.gateway[self.ext].create(
+                self.data.to_dict(),
+                lib.Tracer(),
+                CONNECTION_CACHE,
+            )
+            GATEWAY_CACHE.set(_key, (_version, _gateway))
+        else:
+            _gateway = _cached[1]
+
+        return attr.evolve(
+            _gateway,
+            tracer=_tracer,
+            proxy=attr.evolve(_gateway.proxy, tracer=_tracer),
         )
 
+    @staticmethod
+    def invalidate_gateway(carrier_id: str = None):
+        """Drop the cached gateway of a connection and bump the gateways
+        version (in every process sharing the system cache), again once the
+        transaction commits.
+        """
+        schema = server_conf.settings.schema or "public"
+
+        def _invalidate():
+            if carrier_id is not None:
+                GATEWAY_CACHE.delete(carrier_id)
+            caching.cache.set(
+                GATEWAY_VERSION_KEY.format(schema=schema), uuid.uuid4().hex, None
+            )
+
+        _invalidate()
+        db.transaction.on_commit(_invalidate)
+
     @staticmethod
     def resolve_config(
         carrier, is_user_config: bool = False, is_system_config: bool = False
@@ -305,3 +356,21 @@ def create_carrier_proxy(carrier_name: str, display_name):
             "system_carriers": _SystemCarrierManager(),
         },
     )
+
+
+def _principal(context) -> str:
+    org = getattr(getattr(context, "org", None), "id", None)
+    user = getattr(getattr(context, "user", None), "id", None)
+
+    return f"{org}:{user}"
+
+
+def _gateways_version() -> str:
+    key = GATEWAY_VERSION_KEY.format(schema=server_conf.settings.schema or "public")
+    version = caching.cache.get(key)
+
+    if version is None:
+        caching.cache.add(key, uuid.uuid4().hex, None)
+        version = caching.cache.get(key)
+
+    return version
@@ -1,4 +1,5 @@
 import typing
+import django.conf as conf
 import django.db.transaction as transaction
 
 import karrio.lib as lib
@@ -8,7 +9,7 @@ import karrio.server.core.utils as utils
 import karrio.server.serializers as serializers
 import karrio.server.core.dataunits as dataunits
 import karrio.server.providers.models as providers
-from karrio.server.core.serializers import CARRIERS
+from karrio.server.core.serializers import CARRIERS, AddressData, ParcelData
 
 
 def generate_carrier_serializers() -> typing.Dict[str, serializers.Serializer]:
@@ -275,3 +276,73 @@ class CarrierConnectionModelSerializer(serializers.ModelSerializer):
             )
 
         return super().update(instance, validated_data, **kwargs)
+
+
+class RateSheetBatchRequest(serializers.Serializer):
+    shipper = AddressData(
+        required=False,
+        allow_null=True,
+        help_text="The origin address used to tell domestic from international destinations.",
+    )
+    destinations = AddressData(
+        many=True,
+        allow_empty=False,
+        help_text="The destinations to rate every parcel against.",
+    )
+    parcels = ParcelData(
+        many=True,
+        allow_empty=False,
+        help_text="The parcels to rate.",
+    )
+    services = serializers.StringListField(
+        required=False,
+        allow_null=True,
+        default=[],
+        help_text="The rate sheet service codes to rate. All active services by default.",
+    )
+
+    def validate(self, data):
+        validated_data = super().validate(data)
+        limits = dict(
+            parcels=getattr(conf.settings, "RATE_SHEET_BATCH_MAX_PARCELS", 100),
+            destinations=getattr(
+                conf.settings, "RATE_SHEET_BATCH_MAX_DESTINATIONS", 100
+            ),
+        )
+        errors = {
+            field: [f"Ensure this field has no more than {limit} elements."]
+            for field, limit in limits.items()
+            if len(validated_data.get(field) or []) > int(limit)
+        }
+
+        if any(errors):
+            raise serializers.ValidationError(errors, code="max_length")
+
+        return validated_data
+
+
+class RateMatrix(serializers.Serializer):
+    package = serializers.CharField(
+        help_text="The rated parcel id or position in the request.",
+    )
+    services = serializers.StringListField(
+        help_text="The service codes of the matrix columns.",
+    )
+    currencies = serializers.ListField(
+        child=serializers.CharField(allow_null=True),
+        help_text="The currency of each service column.",
+    )
+    rates = serializers.ListField(
+        child=serializers.ListField(child=serializers.FloatField(allow_null=True)),
+        help_text="""The parcel rates: one row per destination, one column per service.<br/>
+        A rate is null when the service does not cover the destination or the parcel.
+        """,
+    )
+
+
+class RateSheetBatchResponse(serializers.Serializer):
+    rate_sheet_id = serializers.CharField(help_text="The rated rate sheet id.")
+    matrices = RateMatrix(
+        many=True,
+        help_text="The rate matrix of each parcel in the request order.",
+    )
@@ -4,12 +4,17 @@ from django.db.models import signals
 import karrio.references as ref
 import karrio.server.core.utils as utils
 import karrio.server.providers.models as models
+import karrio.server.providers.snapshot as snapshot
 
 logger = logging.getLogger(__name__)
 
 
 def register_signals():
     signals.post_save.connect(carrier_changed, sender=models.Carrier)
+    # connect without sender to also cover the carrier proxy models
+    signals.post_save.connect(connection_updated)
+    signals.post_delete.connect(connection_updated)
+    signals.m2m_changed.connect(connection_relations_changed)
 
     logger.info("karrio.providers signals registered...")
 
@@ -25,3 +30,32 @@ def carrier_changed(
     if len(instance.capabilities or []) == 0:
         instance.capabilities = ref.get_carrier_capabilities(instance.carrier_code)
         instance.save()
+
+
+def connection_updated(sender, instance, *args, **kwargs):
+    """Drop the cached gateway and the connections snapshot of a changed
+    carrier connection (or of its rate sheet and activations).
+    """
+    if isinstance(instance, models.Carrier):
+        models.Carrier.invalidate_gateway(instance.pk)
+        snapshot.invalidate_snapshot()
+
+    elif isinstance(instance, models.CarrierConfig):
+        models.Carrier.invalidate_gateway(instance.carrier_id)
+
+    elif isinstance(instance, (models.RateSheet, models.ServiceLevel)):
+        models.Carrier.invalidate_gateway()
+        snapshot.invalidate_snapshot()
+
+
+def connection_relations_changed(sender, instance, action, model, *args, **kwargs):
+    """Drop the cached gateways and the connections snapshot when a connection
+    activations or a rate sheet services change.
+    """
+    related = (models.Carrier, models.RateSheet, models.ServiceLevel)
+
+    if action.startswith("post_") and (
+        isinstance(instance, related) or issubclass(model, related)
+    ):
+        models.Carrier.invalidate_gateway()
+        snapshot.invalidate_snapshot()
@@ -0,0 +1,248 @@
+"""Per principal in-memory snapshot of the carrier connections.
+
+`Carriers.list` and `Carriers.first` run on every rate, ship and track call.
+Instead of querying the connections each time, they are resolved from an
+index of the carrier connections accessible to the current principal (the
+organization or user of the request) by carrier_id, carrier_code,
+capability, service and test_mode. A snapshot only holds the principal's
+user connections and the system connections, and is loaded on first use.
+
+The snapshots of a tenant are dropped when a connection, its rate sheet or
+its activations change (see `karrio.server.providers.signals`). The version
+of the tenant snapshots is kept in the system cache so every process drops
+its own copies, which is only reliable with a cache shared by every process
+(e.g. Redis): the snapshots are therefore disabled with a per process cache
+(the default local memory cache) unless `CARRIER_SNAPSHOT` is set. Changes
+bypassing the model signals (e.g. `QuerySet.update`) are picked up after
+`SNAPSHOT_TTL` seconds.
+"""
+
+import copy
+import time
+import uuid
+import typing
+import logging
+import threading
+import functools
+import collections
+import django.conf as conf
+import django.db as db
+import django.core.cache as caching
+from django.db.models import QuerySet
+
+import karrio.server.conf as server_conf
+import karrio.server.core.utils as utils
+import karrio.server.providers.models as providers
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TTL = 300
+MAX_SNAPSHOTS = 1000
+VERSION_KEY = "karrio:carrier-snapshot:{schema}"
+ACTIVE_KEY = "active_orgs" if conf.settings.MULTI_ORGANIZATIONS else "active_users"
+
+_lock = threading.Lock()
+_snapshots: typing.Dict[tuple, "CarrierSnapshot"] = collections.OrderedDict()
+
+
+class CarrierSnapshot:
+    """An immutable index of the carrier connections accessible to a principal."""
+
+    def __init__(
+        self,
+        version: str,
+        user_carriers: QuerySet,
+        access_id: typing.Any = None,
+    ):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.carriers: typing.List[providers.Carrier] = list(
+            (user_carriers | providers.Carrier.system_carriers.all())
+            .distinct()
+            .select_related("rate_sheet")
+            .prefetch_related("rate_sheet__services")
+        )
+        self.positions = {carrier.id: index for index, carrier in enumerate(self)}
+        self.by_id = {carrier.id: carrier for carrier in self}
+        self.by_carrier_id = _index(self, lambda _: [_.carrier_id])
+        self.by_carrier_code = _index(self, lambda _: [_.carrier_code])
+        self.by_capability = _index(
+            self, lambda _: [c.lower() for c in (_.capabilities or [])]
+        )
+        self.by_test_mode = _index(self, lambda _: [_.test_mode])
+        self.service_codes = {
+            carrier.id: {s.service_code for s in carrier.services or []}
+            for carrier in self
+        }
+        self.system_ids = {carrier.id for carrier in self if carrier.is_system}
+        self.user_ids = {carrier.id for carrier in self if not carrier.is_system}
+        self.active_system_ids = _active_system_ids(self, access_id)
+
+    def __iter__(self) -> typing.Iterator[providers.Carrier]:
+        return iter(self.carriers)
+
+    def capability(self, capability: str) -> typing.Set[str]:
+        """Return the ids of carriers with a capability containing the given text
+        (like the former `capabilities__icontains` filter).
+        """
+        return {
+            id
+            for name, ids in self.by_capability.items()
+            if capability.lower() in name
+            for id in ids
+        }
+
+    def carrier_names(
+        self, services: typing.List[str], custom_carrier_ids: typing.Iterable[str]
+    ) -> typing.List[str]:
+        """Return the names of the carriers offering any of the services.
+
+        The custom carriers (e.g. generic connections with a rate sheet)
+        services are resolved from their rate sheet like the contextual
+        references do.
+        """
+        custom_services: typing.Dict[str, typing.Set[str]] = {}
+        for id in custom_carrier_ids:
+            carrier = self.by_id[id]
+            name = carrier.credentials.get("custom_carrier_name") or "generic"
+            custom_services[name] = self.service_codes[id]
+
+        return [
+            name
+            for name, codes in {**_reference_services(), **custom_services}.items()
+            if any(service in codes for service in services)
+        ]
+
+    def resolve(self, ids: typing.Iterable[str]) -> typing.List[providers.Carrier]:
+        """Return copies of the snapshot connections, ordered like the query."""
+        return [copy.copy(self.by_id[id]) for id in sorted(ids, key=self.positions.get)]
+
+
+def is_enabled() -> bool:
+    """Return whether the connections are resolved from the snapshots.
+
+    Enabled when the system cache is shared by every process, unless
+    explicitly set with `CARRIER_SNAPSHOT`.
+    """
+    enabled = getattr(conf.settings, "CARRIER_SNAPSHOT", None)
+
+    if enabled is None or enabled == "":
+        return utils.is_shared_cache()
+
+    return str(enabled).lower() in ("1", "true", "yes", "on")
+
+
+def get_snapshot(
+    context=None,
+    user_carriers: typing.Callable[[], QuerySet] = None,
+) -> CarrierSnapshot:
+    """Return the carrier connections snapshot of the context principal.
+
+    :param context: the request context (its organization or user).
+    :param user_carriers: return the user connections accessible in context.
+    """
+    schema = server_conf.settings.schema or "public"
+    principal = getattr(
+        getattr(context, "org" if conf.settings.MULTI_ORGANIZATIONS else "user", None),
+        "id",
+        None,
+    )
+    key = (
+        schema,
+        context is None,
+        getattr(getattr(context, "user", None), "id", None),
+        getattr(getattr(context, "org", None), "id", None),
+    )
+    version = _version(schema)
+    is_stale = lambda snapshot: (
+        snapshot is None
+        or snapshot.version != version
+        or time.monotonic() - snapshot.loaded_at > SNAPSHOT_TTL
+    )
+
+    snapshot = _snapshots.get(key)
+    if is_stale(snapshot):
+        snapshot = CarrierSnapshot(
+            version,
+            (
+                user_carriers()
+                if user_carriers is not None
+                else providers.Carrier.user_carriers.all()
+            ),
+            principal,
+        )
+
+    with _lock:
+        _snapshots[key] = snapshot
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+
+    return snapshot
+
+
+def invalidate_snapshot():
+    """Drop the carrier connections snapshots of the current tenant (in every
+    process sharing the system cache), again once the transaction commits.
+    """
+    schema = server_conf.settings.schema or "public"
+
+    def _invalidate():
+        with _lock:
+            for key in [_ for _ in _snapshots if _[0] == schema]:
+                _snapshots.pop(key, None)
+        caching.cache.set(VERSION_KEY.format(schema=schema), uuid.uuid4().hex, None)
+
+    _invalidate()
+    db.transaction.on_commit(_invalidate)
+
+
+def _version(schema: str) -> str:
+    key = VERSION_KEY.format(schema=schema)
+    version = caching.cache.get(key)
+
+    if version is None:
+        caching.cache.add(key, uuid.uuid4().hex, None)
+        version = caching.cache.get(key)
+
+    return version
+
+
+@functools.lru_cache(maxsize=None)
+def _reference_services() -> typing.Dict[str, typing.Set[str]]:
+    import karrio.server.core.dataunits as dataunits
+
+    return {
+        name: set(services.keys())
+        for name, services in dataunits.REFERENCE_MODELS["services"].items()
+    }
+
+
+def _index(
+    carriers: typing.Iterable[providers.Carrier],
+    keys: typing.Callable[[providers.Carrier], typing.List[typing.Any]],
+) -> typing.Dict[typing.Any, typing.Set[str]]:
+    index: typing.Dict[typing.Any, typing.Set[str]] = {}
+    for carrier in carriers:
+        for key in keys(carrier):
+            index.setdefault(key, set()).add(carrier.id)
+
+    return index
+
+
+def _active_system_ids(
+    snapshot: CarrierSnapshot, access_id: typing.Any
+) -> typing.Set[str]:
+    """Return the active system connections, activated for the principal."""
+    active_ids = {id for id in snapshot.system_ids if snapshot.by_id[id].active}
+
+    if access_id is None or len(active_ids) == 0:
+        return active_ids
+    if not hasattr(providers.Carrier, ACTIVE_KEY):
+        return set()
+
+    return set(
+        providers.Carrier.objects.filter(
+            id__in=active_ids, **{f"{ACTIVE_KEY}__id": access_id}
+        ).values_list("id", flat=True)
+    )
@@ -1,3 +1,286 @@
-from django.test import TestCase
+import json
+import types
+from unittest import mock
+from django.urls import reverse
+from django.test import override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+import karrio.lib as lib
+import karrio.server.core.middleware as middleware
+import karrio.server.core.gateway as gateway
+from karrio.server.core.tests import APITestCase
+import karrio.server.providers.models as models
+import karrio.server.providers.snapshot as snapshot
 
-# TODO: Write carriers API tests
+
+class TestCarrierGateway(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        models.carrier.GATEWAY_CACHE.clear()
+
+    def test_gateway_is_reused(self):
+        gateway = self.carrier.gateway
+        carrier = models.Carrier.objects.get(pk=self.carrier.pk)
+
+        with mock.patch("karrio.gateway") as initializer, self.assertNumQueries(0):
+            other_gateway = carrier.gateway
+
+        initializer.__getitem__.assert_not_called()
+        self.assertIs(other_gateway.settings, gateway.settings)
+        self.assertIs(other_gateway.mapper, gateway.mapper)
+
+    def test_gateway_uses_request_tracer(self):
+        request = mock.Mock(tracer=lib.Tracer())
+
+        with mock.patch.object(
+            middleware.SessionContext, "get_current_request", return_value=request
+        ):
+            gateway = self.carrier.gateway
+
+        self.assertIs(gateway.tracer, request.tracer)
+        self.assertIs(gateway.proxy.tracer, request.tracer)
+        self.assertIsNot(self.carrier.gateway.tracer, request.tracer)
+
+    def test_gateway_is_rebuilt_on_change(self):
+        gateway = self.carrier.gateway
+
+        self.carrier.credentials = {**self.carrier.credentials, "password": "new"}
+        self.carrier.save()
+
+        self.assertNotIn(self.carrier.pk, models.carrier.GATEWAY_CACHE)
+        self.assertEqual(self.carrier.gateway.settings.password, "new")
+        self.assertIsNot(self.carrier.gateway.settings, gateway.settings)
+
+    def test_gateway_is_invalidated_on_config_change(self):
+        self.carrier.gateway
+
+        models.CarrierConfig.objects.create(
+            carrier=self.carrier,
+            created_by=self.user,
+            config=dict(shipping_options=["signature"]),
+        )
+
+        self.assertNotIn(self.carrier.pk, models.carrier.GATEWAY_CACHE)
+
+    def test_gateway_is_rebuilt_on_rate_sheet_change(self):
+        gateway = self.carrier.gateway
+        models.RateSheet.objects.create(
+            name="Rate sheet",
+            slug="rate_sheet",
+            carrier_name="canadapost",
+            created_by=self.user,
+        )
+
+        self.assertIsNot(self.carrier.gateway.settings, gateway.settings)
+
+
+@override_settings(CARRIER_SNAPSHOT=True)
+class TestCarrierSnapshot(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.context = types.SimpleNamespace(user=self.user, org=None, test_mode=True)
+
+    def test_list_without_queries(self):
+        gateway.Carriers.list(context=self.context)
+
+        with self.assertNumQueries(0):
+            carriers = gateway.Carriers.list(
+                context=self.context, active=True, capability="rating"
+            )
+            carrier = gateway.Carriers.first(
+                context=self.context, services=["canadapost_priority"]
+            )
+
+        self.assertListEqual(
+            [_.carrier_id for _ in carriers], ["ups_package", "canadapost"]
+        )
+        self.assertEqual(carrier.carrier_id, "canadapost")
+
+    def test_list_filters(self):
+        self.carrier.metadata = dict(region="east")
+        self.carrier.save()
+
+        self.assertListEqual(
+            [_.id for _ in gateway.Carriers.list(context=self.context)],
+            [_.id for _ in gateway.Carriers.user_carriers(self.context)],
+        )
+        self.assertListEqual(
+            [
+                _.carrier_id
+                for _ in gateway.Carriers.list(
+                    context=self.context, metadata_value="east"
+                )
+            ],
+            ["canadapost"],
+        )
+        self.assertListEqual(
+            [
+                _.carrier_id
+                for _ in gateway.Carriers.list(
+                    carrier_ids=["fedex_express", "dhl_universal"], capability="track"
+                )
+            ],
+            ["dhl_universal", "fedex_express"],
+        )
+        self.assertListEqual(
+            list(
+                gateway.Carriers.list(
+                    context=types.SimpleNamespace(user=self.user, test_mode=False)
+                )
+            ),
+            [],
+        )
+
+    def test_snapshot_per_principal(self):
+        other = types.SimpleNamespace(
+            user=get_user_model().objects.create_user("other@example.com", "test"),
+            org=None,
+            test_mode=True,
+        )
+
+        self.assertListEqual(list(gateway.Carriers.list(context=other)), [])
+        self.assertIsNot(
+            snapshot.get_snapshot(other), snapshot.get_snapshot(self.context)
+        )
+        self.assertNotIn(self.carrier.id, snapshot.get_snapshot(other).by_id)
+
+    def test_list_returns_copies(self):
+        carriers = gateway.Carriers.list(context=self.context, capability="rating")
+        carriers[0].active = False
+
+        self.assertIsInstance(carriers, list)
+        self.assertListEqual(
+            [
+                _.active
+                for _ in gateway.Carriers.list(
+                    context=self.context, capability="rating"
+                )
+            ],
+            [True, True],
+        )
+
+    def test_snapshot_is_invalidated_on_change(self):
+        version = snapshot.get_snapshot().version
+
+        self.carrier.active = False
+        self.carrier.save()
+
+        self.assertNotEqual(snapshot.get_snapshot().version, version)
+        self.assertListEqual(
+            [
+                _.carrier_id
+                for _ in gateway.Carriers.list(context=self.context, active=True)
+            ],
+            ["ups_package"],
+        )
+
+    def test_listed_connections_are_copies(self):
+        carrier = gateway.Carriers.first(context=self.context, carrier_id="canadapost")
+        carrier.credentials = {}
+
+        self.assertNotEqual(
+            gateway.Carriers.first(
+                context=self.context, carrier_id="canadapost"
+            ).credentials,
+            {},
+        )
+
+
+class TestCarrierQuery(APITestCase):
+    def test_snapshot_requires_a_shared_cache(self):
+        context = types.SimpleNamespace(user=self.user, org=None, test_mode=True)
+
+        self.assertFalse(snapshot.is_enabled())
+        with mock.patch.object(snapshot, "get_snapshot") as get_snapshot:
+            carriers = gateway.Carriers.list(context=context, active=True)
+
+        get_snapshot.assert_not_called()
+        self.assertListEqual(
+            [_.carrier_id for _ in carriers], ["ups_package", "canadapost"]
+        )
+
+
+class TestRateSheetBatchRates(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.sheet = models.RateSheet.objects.create(
+            name="Courier", slug="courier", carrier_name="generic", created_by=self.user
+        )
+        self.sheet.services.add(
+            models.ServiceLevel.objects.create(
+                service_name="Standard",
+                service_code="courier_standard",
+                currency="CAD",
+                weight_unit="KG",
+                max_weight=10.0,
+                zones=[
+                    dict(rate=8.0, max_weight=2.0, cities=["Montreal"]),
+                    dict(rate=12.0, max_weight=10.0, country_codes=["CA"]),
+                ],
+                created_by=self.user,
+            )
+        )
+
+    def test_batch_rates(self):
+        url = reverse(
+            "karrio.server.providers:rate-sheet-batch-rates",
+            kwargs=dict(pk=self.sheet.pk),
+        )
+        data = dict(
+            destinations=[
+                dict(city="Montreal", country_code="CA"),
+                dict(postal_code="89109", country_code="US"),
+            ],
+            parcels=[
+                dict(weight=1.0, weight_unit="KG"),
+                dict(weight=5.0, weight_unit="KG"),
+                dict(weight=20.0, weight_unit="KG"),
+            ],
+        )
+
+        response = self.client.post(url, data)
+        response_data = json.loads(response.content)
+
+        self.assertResponseNoErrors(response)  # type: ignore
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertDictEqual(response_data, BATCH_RATES_RESPONSE)
+
+    @override_settings(RATE_SHEET_BATCH_MAX_PARCELS=2)
+    def test_batch_rates_limits(self):
+        url = reverse(
+            "karrio.server.providers:rate-sheet-batch-rates",
+            kwargs=dict(pk=self.sheet.pk),
+        )
+        data = dict(
+            destinations=[dict(city="Montreal", country_code="CA")],
+            parcels=[dict(weight=1.0, weight_unit="KG")] * 3,
+        )
+
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+BATCH_RATES_RESPONSE = {
+    "rate_sheet_id": mock.ANY,
+    "matrices": [
+        {
+            "package": "1",
+            "services": ["courier_standard"],
+            "currencies": ["CAD"],
+            "rates": [[8.0], [None]],
+        },
+        {
+            "package": "2",
+            "services": ["courier_standard"],
+            "currencies": ["CAD"],
+            "rates": [[12.0], [None]],
+        },
+        {
+            "package": "3",
+            "services": ["courier_standard"],
+            "currencies": ["CAD"],
+            "rates": [[None], [None]],
+        },
+    ],
+}
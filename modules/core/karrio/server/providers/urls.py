@@ -8,4 +8,5 @@ app_name = "karrio.server.providers"
 urlpatterns = [
     path("v1/", include("karrio.server.providers.views.carriers")),
     path("v1/", include("karrio.server.providers.views.connections")),
+    path("v1/", include("karrio.server.providers.views.rate_sheets")),
 ]
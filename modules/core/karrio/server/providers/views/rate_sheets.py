@@ -0,0 +1,65 @@
+import logging
+import django.urls as urls
+import django.forms as forms
+import rest_framework.status as status
+import rest_framework.request as request
+import rest_framework.response as response
+
+import karrio.lib as lib
+import karrio.universal.providers.rating as rating
+import karrio.server.openapi as openapi
+import karrio.server.core.views.api as api
+import karrio.server.core.datatypes as datatypes
+import karrio.server.providers.models as models
+import karrio.server.providers.serializers as serializers
+
+logger = logging.getLogger(__name__)
+ENDPOINT_ID = "&&&&&"  # This endpoint id is used to make operation ids unique make sure not to duplicate
+
+
+class RateSheetBatchRates(api.APIView):
+    @openapi.extend_schema(
+        tags=["Rate Sheets"],
+        operation_id=f"{ENDPOINT_ID}batch_rates",
+        extensions={"x-operationId": "batchRateSheetRates"},
+        summary="Batch rate parcels",
+        request=serializers.RateSheetBatchRequest(),
+        responses={
+            200: serializers.RateSheetBatchResponse(),
+            400: serializers.ErrorResponse(),
+            404: serializers.ErrorResponse(),
+            500: serializers.ErrorResponse(),
+        },
+    )
+    def post(self, request: request.Request, pk: str):
+        """Rate many parcels against many destinations with a rate sheet."""
+        sheet = models.RateSheet.access_by(request).get(pk=pk)
+        payload = serializers.RateSheetBatchRequest.map(data=request.data).data
+        settings = rating.RatingMixinSettings(
+            carrier_id=sheet.slug,
+            services=[forms.model_to_dict(_) for _ in sheet.services.all()],
+        )
+
+        matrices = rating.rate_matrices(
+            settings,
+            [lib.to_object(datatypes.Parcel, _) for _ in payload["parcels"]],
+            [lib.to_object(datatypes.Address, _) for _ in payload["destinations"]],
+            shipper=lib.to_object(datatypes.Address, payload.get("shipper")),
+            services=payload.get("services"),
+        )
+
+        return response.Response(
+            serializers.RateSheetBatchResponse(
+                dict(rate_sheet_id=sheet.id, matrices=lib.to_dict(matrices))
+            ).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+urlpatterns = [
+    urls.path(
+        "rate-sheets/<str:pk>/rates",
+        RateSheetBatchRates.as_view(),
+        name="rate-sheet-batch-rates",
+    ),
+]
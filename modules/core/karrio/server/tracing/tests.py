@@ -1,3 +1,53 @@
-from django.test import TestCase
+import types
+from django.test import override_settings
+import karrio.lib as lib
+from karrio.server.core.tests import APITestCase
+import karrio.server.tracing.models as models
+import karrio.server.tracing.utils as utils
 
-# Create your tests here.
+
+class TestTracingRecords(APITestCase):
+    @override_settings(PERSIST_SDK_SPANS=True)
+    def test_persist_spans_alongside_records(self):
+        tracer = lib.Tracer(exporters=[])
+        connection = dict(
+            id="car_123", test_mode=True, carrier_id="ups", carrier_name="ups"
+        )
+
+        with tracer.span(
+            "proxy",
+            operation="get_rates",
+            connection_id="car_123",
+            test_mode=True,
+            carrier_id="ups",
+            carrier_name="ups",
+        ):
+            tracer.trace(
+                {"url": "https://ups.com"}, "request", dict(connection=connection)
+            )
+
+        utils.bulk_save_tracing_records(
+            tracer, context=types.SimpleNamespace(user=self.user, test_mode=True)
+        )
+        timings = models.TracingRecord.objects.get(key="timings")
+        [span] = timings.record["spans"]
+
+        self.assertEqual(models.TracingRecord.objects.filter(key="request").count(), 1)
+        self.assertEqual(span["name"], "proxy")
+        self.assertEqual(span["attributes"]["operation"], "get_rates")
+        self.assertEqual(timings.meta["tracer_id"], tracer.id)
+        self.assertEqual(timings.meta["connection"]["carrier_id"], "ups")
+        self.assertGreater(span["duration"], 0)
+
+    def test_spans_are_not_persisted_by_default(self):
+        tracer = lib.Tracer(exporters=[])
+
+        with tracer.span("proxy", carrier_id="ups", carrier_name="ups"):
+            tracer.trace({"url": "https://ups.com"}, "request", dict(connection={}))
+
+        utils.bulk_save_tracing_records(
+            tracer, context=types.SimpleNamespace(user=self.user, test_mode=True)
+        )
+
+        self.assertEqual(models.TracingRecord.objects.count(), 1)
+        self.assertFalse(models.TracingRecord.objects.filter(key="timings").exists())
@@ -38,7 +38,7 @@ def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None)
             if exists:
                 return
 
-            for record in tracer.records:
+            for record in [*tracer.records, *timing_records(tracer)]:
                 connection: dict = record.metadata.get("connection")
 
                 records.append(
@@ -83,7 +83,7 @@ def bulk_save_tracing_records(tracer: lib.Tracer, context=None):
 
     records = []
 
-    for record in tracer.records:
+    for record in [*tracer.records, *timing_records(tracer)]:
         logger.debug([f"record: {record.key}", record.metadata])
         records.append(
             models.TracingRecord(
@@ -104,6 +104,31 @@ def bulk_save_tracing_records(tracer: lib.Tracer, context=None):
     logger.info("> tracing records saved...")
 
 
+def timing_records(tracer: lib.Tracer) -> list:
+    """Return one "timings" record per carrier connection aggregating the
+    tracer spans, when their persistence is enabled (PERSIST_SDK_SPANS).
+    """
+    if not conf.settings.PERSIST_SDK_SPANS:
+        return []
+
+    timings: dict = {}
+    for record in tracer.span_records:
+        connection = record.metadata["connection"]
+        timing = timings.setdefault(
+            connection.get("id"),
+            lib.Record(
+                key="timings",
+                data=dict(spans=[]),
+                timestamp=record.timestamp,
+                metadata=record.metadata,
+            ),
+        )
+        timing.data["spans"].append(record.data)
+        timing.timestamp = min(timing.timestamp, record.timestamp)
+
+    return list(timings.values())
+
+
 def set_tracing_context(**kwargs):
 
     from karrio.server.core import middleware
@@ -1,3 +1,70 @@
-from django.test import TestCase
+import io
+import base64
+import PyPDF2
+from PIL import Image
+from django.urls import reverse
+from rest_framework import status
+from karrio.server.core.tests import APITestCase
+import karrio.server.manager.models as manager
 
-# Create your tests here.
+
+class TestShipmentDocsPrinter(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.shipments = [
+            manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(
+                    postal_code="E1C4Z8", country_code="CA", created_by=self.user
+                ),
+                recipient=manager.Address.objects.create(
+                    postal_code="V6M2V9", country_code="CA", created_by=self.user
+                ),
+                label=label,
+                label_type=label_type,
+                created_by=self.user,
+                test_mode=True,
+            )
+            for label, label_type in [
+                (PDF_LABEL, "PDF"),
+                (PDF_LABEL, "PDF"),
+                (ZPL_LABEL, "ZPL"),
+            ]
+        ]
+
+    def test_print_pdf_labels(self):
+        url = reverse(
+            "karrio.server.documents:shipments-documents-print",
+            kwargs=dict(doc="label", format="pdf"),
+        )
+        ids = ",".join(_.id for _ in self.shipments)
+
+        response = self.client.get(f"{url}?shipments={ids}")
+        content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertEqual(len(PyPDF2.PdfReader(io.BytesIO(content)).pages), 2)
+
+    def test_print_zpl_labels(self):
+        url = reverse(
+            "karrio.server.documents:shipments-documents-print",
+            kwargs=dict(doc="label", format="zpl"),
+        )
+        ids = ",".join(_.id for _ in self.shipments)
+
+        response = self.client.get(f"{url}?shipments={ids}")
+        content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(content.decode().strip(), base64.b64decode(ZPL_LABEL).decode())
+
+
+def _pdf_label() -> str:
+    buffer = io.BytesIO()
+    Image.new("1", (400, 600), 1).save(buffer, "PDF")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+PDF_LABEL = _pdf_label()
+ZPL_LABEL = base64.b64encode(b"^XA^FO10,10^A0N,30,30^FDLABEL^FS^XZ").decode("utf-8")
@@ -1,12 +1,12 @@
-import io
 import sys
-import base64
+import typing
 import logging
+import tempfile
 from django.urls import re_path
 from django.utils import timezone
 from django.http import JsonResponse
 from django.core.files.base import ContentFile
-from django_downloadview import VirtualDownloadView
+from django_downloadview import VirtualDownloadView, VirtualFile
 from rest_framework import status
 
 import karrio.lib as lib
@@ -15,6 +15,18 @@ import karrio.server.documents.models as models
 import karrio.server.documents.generator as generator
 
 logger = logging.getLogger(__name__)
+# bundles larger than this are spooled to disk while being written.
+SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
+
+def bundle_file(documents: typing.Iterable[str], format: str, name: str) -> VirtualFile:
+    """Write a documents bundle to a spooled file streamed back in chunks."""
+    sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    lib.write_bundle(documents, sink, format.upper())
+    size = sink.tell()
+    sink.seek(0)
+
+    return VirtualFile(sink, name=name, size=size)
 
 
 class TemplateDocsPrinter(VirtualDownloadView):
@@ -100,13 +112,9 @@ class ShipmentDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
+        return bundle_file(
+            (doc for doc, _ in self.documents.iterator()), self.format, self.name
         )
-        buffer = io.BytesIO()
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
 
 
 class OrderDocsPrinter(VirtualDownloadView):
@@ -156,13 +164,7 @@ class OrderDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
+        return bundle_file((doc for doc, _ in self.documents), self.format, self.name)
 
 
 class ManifestDocsPrinter(VirtualDownloadView):
@@ -200,13 +202,9 @@ class ManifestDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
+        return bundle_file(
+            (doc for doc, _ in self.documents.iterator()), self.format, self.name
         )
-        buffer = io.BytesIO()
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
 
 
 urlpatterns = [
@@ -272,6 +272,12 @@ class Mutation:
     ) -> mutations.ChangeShipmentStatusMutation:
         return mutations.ChangeShipmentStatusMutation.mutate(info, **input.to_dict())
 
+    @strawberry.mutation
+    def fetch_bulk_rates(
+        self, info: Info, input: inputs.BulkRateMutationInput
+    ) -> mutations.BulkRateMutation:
+        return mutations.BulkRateMutation.mutate(info, **input.to_dict())
+
     @strawberry.mutation
     def delete_template(
         self, info: Info, input: inputs.DeleteMutationInput
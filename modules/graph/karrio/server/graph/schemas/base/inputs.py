@@ -341,6 +341,24 @@ class PartialShipmentMutationInput(utils.BaseInput):
     reference: typing.Optional[str] = strawberry.UNSET
 
 
+@strawberry.input
+class RateRequestInput:
+    shipper: AddressInput
+    recipient: AddressInput
+    parcels: typing.List[ParcelInput]
+    services: typing.Optional[typing.List[str]] = strawberry.UNSET
+    options: typing.Optional[utils.JSON] = strawberry.UNSET
+    reference: typing.Optional[str] = strawberry.UNSET
+    carrier_ids: typing.Optional[typing.List[str]] = strawberry.UNSET
+
+
+@strawberry.input
+class BulkRateMutationInput(utils.BaseInput):
+    shipments: typing.List[RateRequestInput]
+    deadline: typing.Optional[float] = strawberry.UNSET
+    carrier_timeout: typing.Optional[float] = strawberry.UNSET
+
+
 @strawberry.input
 class ChangeShipmentStatusMutationInput(utils.BaseInput):
     id: str
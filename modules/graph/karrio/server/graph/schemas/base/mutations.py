@@ -20,6 +20,7 @@ from karrio.server.serializers import (
 )
 import karrio.server.providers.serializers as providers_serializers
 import karrio.server.manager.serializers as manager_serializers
+import karrio.server.core.serializers as core_serializers
 import karrio.server.graph.schemas.base.inputs as inputs
 import karrio.server.graph.schemas.base.types as types
 import karrio.server.graph.serializers as serializers
@@ -531,7 +532,7 @@ class CreateRateSheetMutation(utils.BaseMutation):
             )
 
         if any(carriers):
-            _carriers = gateway.Carriers.list(
+            _carriers = gateway.Carriers.query(
                 context=info.context.request,
                 carrier_name=rate_sheet.carrier_name,
             ).filter(id__in=carriers)
@@ -582,7 +583,7 @@ class UpdateRateSheetMutation(utils.BaseMutation):
 
         if carriers is not None:
             _ids = set([*carriers, *(rate_sheet.carriers.values_list("id", flat=True))])
-            _carriers = gateway.Carriers.list(
+            _carriers = gateway.Carriers.query(
                 context=info.context.request,
                 carrier_name=rate_sheet.carrier_name,
             ).filter(id__in=list(_ids))
@@ -661,6 +662,37 @@ class ChangeShipmentStatusMutation(utils.BaseMutation):
         return ChangeShipmentStatusMutation(shipment=shipment)  # type:ignore
 
 
+@strawberry.type
+class BulkRateMutation(utils.BaseMutation):
+    results: typing.List[types.RateResponseType] = strawberry.field(
+        default_factory=list
+    )
+
+    @staticmethod
+    @utils.authentication_required
+    def mutate(
+        info: Info, **input: inputs.BulkRateMutationInput
+    ) -> "BulkRateMutation":
+        payloads = core_serializers.BulkRateRequest.map(data=input).data["shipments"]
+        responses = gateway.Rates.fetch_many(
+            payloads,
+            context=info.context.request,
+            deadline=input.get("deadline"),
+            carrier_timeout=input.get("carrier_timeout"),
+        )
+        results = sorted(
+            (
+                dict(index=index, **core_serializers.RateResponse(response).data)
+                for index, response in responses
+            ),
+            key=lambda result: result["index"],
+        )
+
+        return BulkRateMutation(
+            results=[types.RateResponseType.parse(_) for _ in results]
+        )  # type:ignore
+
+
 def create_template_mutation(name: str, template_type: str) -> typing.Type:
     _type: typing.Any = dict(
         address=types.AddressTemplateType,
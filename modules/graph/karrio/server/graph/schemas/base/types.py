@@ -547,6 +547,24 @@ class RateType:
         )
 
 
+@strawberry.type
+class RateResponseType:
+    index: int
+    rates: typing.List[RateType]
+    messages: typing.List[MessageType]
+
+    @staticmethod
+    def parse(response: dict):
+        return RateResponseType(
+            index=response["index"],
+            rates=[RateType.parse(rate) for rate in response.get("rates") or []],
+            messages=[
+                MessageType.parse(message)
+                for message in response.get("messages") or []
+            ],
+        )
+
+
 @strawberry.type
 class CommodityType:
     id: str
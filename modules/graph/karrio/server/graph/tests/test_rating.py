@@ -0,0 +1,122 @@
+import karrio.lib as lib
+from unittest.mock import patch, ANY
+from karrio.core.models import RateDetails, ChargeDetails
+from karrio.server.graph.tests.base import GraphTestCase
+
+
+class TestBulkRating(GraphTestCase):
+    def test_fetch_bulk_rates(self):
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            response = self.query(
+                """
+                mutation fetch_bulk_rates($data: BulkRateMutationInput!) {
+                  fetch_bulk_rates(input: $data) {
+                    results {
+                      index
+                      rates {
+                        carrier_name
+                        carrier_id
+                        service
+                        total_charge
+                        currency
+                        test_mode
+                      }
+                      messages {
+                        carrier_id
+                        code
+                      }
+                    }
+                    errors {
+                      field
+                      messages
+                    }
+                  }
+                }
+                """,
+                operation_name="fetch_bulk_rates",
+                variables=BULK_RATE_DATA,
+            )
+            response_data = response.data
+
+            self.assertResponseNoErrors(response)
+            self.assertDictEqual(lib.to_dict(response_data), BULK_RATE_RESPONSE)
+
+
+RATE_REQUEST_DATA = {
+    "shipper": {
+        "postal_code": "V6M2V9",
+        "city": "Vancouver",
+        "country_code": "CA",
+        "state_code": "BC",
+        "address_line1": "5840 Oak St",
+    },
+    "recipient": {
+        "postal_code": "E1C4Z8",
+        "city": "Moncton",
+        "country_code": "CA",
+        "state_code": "NB",
+        "address_line1": "125 Church St",
+    },
+    "parcels": [
+        {
+            "weight": 1,
+            "weight_unit": "KG",
+            "package_preset": "canadapost_corrugated_small_box",
+        }
+    ],
+    "services": ["canadapost_priority"],
+    "carrier_ids": ["canadapost"],
+}
+
+BULK_RATE_DATA = {
+    "data": {
+        "shipments": [
+            RATE_REQUEST_DATA,
+            {**RATE_REQUEST_DATA, "carrier_ids": ["unknown"]},
+        ]
+    }
+}
+
+RETURNED_VALUE = (
+    [
+        RateDetails(
+            carrier_id="canadapost",
+            carrier_name="canadapost",
+            currency="CAD",
+            transit_days=2,
+            service="canadapost_priority",
+            total_charge=106.71,
+            extra_charges=[
+                ChargeDetails(amount=101.83, currency="CAD", name="Base charge"),
+            ],
+        )
+    ],
+    [],
+)
+
+BULK_RATE_RESPONSE = {
+    "data": {
+        "fetch_bulk_rates": {
+            "results": [
+                {
+                    "index": 0,
+                    "rates": [
+                        {
+                            "carrier_name": "canadapost",
+                            "carrier_id": "canadapost",
+                            "service": "canadapost_priority",
+                            "total_charge": 106.71,
+                            "currency": "CAD",
+                            "test_mode": False,
+                        }
+                    ],
+                },
+                {
+                    "index": 1,
+                    "messages": [{"code": "not_found"}],
+                },
+            ],
+        }
+    }
+}
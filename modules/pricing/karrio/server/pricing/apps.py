@@ -7,6 +7,7 @@ class PricingConfig(AppConfig):
     verbose_name = _("Shipping Markup")
 
     def ready(self):
-        from karrio.server.pricing.signals import register_rate_post_processing
+        from karrio.server.pricing import signals
 
-        register_rate_post_processing()
+        signals.register_rate_post_processing()
+        signals.register_signals()
@@ -0,0 +1,220 @@
+"""Compiled markup table of the active surcharges of a tenant.
+
+Instead of loading and evaluating every active surcharge for every rate, the
+surcharges are compiled once into a matcher table indexed by carrier name,
+carrier account (carrier_id) and service, where an empty condition is indexed
+as a wildcard. Resolving the markups of a rate is then a fixed number of
+lookups whatever the number of surcharges.
+
+The table is dropped when a surcharge (or a carrier connection) changes (see
+`karrio.server.pricing.signals`). Like the carrier connections snapshot, its
+version is kept in the system cache so every process drops its own copy,
+which is only reliable with a cache shared by every process (e.g. Redis): with
+a per process cache (the default local memory cache) the table is compiled for
+every request unless `MARKUP_TABLE` is set.
+"""
+
+import attr
+import uuid
+import typing
+import logging
+import itertools
+import importlib
+import threading
+import django.conf as conf
+import django.db as db
+import django.core.cache as caching
+from django.db.models import Q
+
+import karrio.lib as lib
+import karrio.core.models as karrio
+import karrio.server.conf as server_conf
+import karrio.server.core.utils as utils
+import karrio.server.core.datatypes as datatypes
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "karrio:markup-table:{schema}"
+ANY = None
+
+_lock = threading.Lock()
+_tables: typing.Dict[typing.Tuple[str, typing.Any], "MarkupTable"] = {}
+
+
+class Markup(typing.NamedTuple):
+    name: str
+    amount: float
+    surcharge_type: str
+    carriers: typing.List[str]
+    carrier_ids: typing.List[str]
+    services: typing.List[str]
+
+    @staticmethod
+    def compile(surcharge) -> "Markup":
+        return Markup(
+            name=surcharge.name,
+            amount=surcharge.amount,
+            surcharge_type=surcharge.surcharge_type,
+            carriers=list(surcharge.carriers or []),
+            carrier_ids=[_.carrier_id for _ in surcharge.carrier_accounts.all()],
+            services=list(surcharge.services or []),
+        )
+
+    @property
+    def keys(self) -> typing.Iterator[tuple]:
+        """The (carrier name, carrier id, service) keys the markup applies to.
+
+        A markup without any condition applies to nothing.
+        """
+        if not any([self.carriers, self.carrier_ids, self.services]):
+            return iter([])
+
+        return itertools.product(
+            self.carriers or [ANY], self.carrier_ids or [ANY], self.services or [ANY]
+        )
+
+    def charge(self, total_charge: float) -> float:
+        return lib.to_decimal(
+            self.amount
+            if self.surcharge_type == "AMOUNT"
+            else (total_charge * (typing.cast(float, self.amount) / 100))
+        )
+
+
+class MarkupTable:
+    """The compiled markups of a list of surcharges, kept in their order."""
+
+    def __init__(self, surcharges: typing.Iterable, version: str = None):
+        self.version = version
+        self.markups = [Markup.compile(surcharge) for surcharge in surcharges]
+        self.index: typing.Dict[tuple, typing.List[int]] = {}
+        self._matches: typing.Dict[tuple, typing.Tuple[Markup, ...]] = {}
+
+        for position, markup in enumerate(self.markups):
+            for key in markup.keys:
+                self.index.setdefault(key, []).append(position)
+
+    def match(
+        self, carrier_name: str, carrier_id: str, service: str
+    ) -> typing.Tuple[Markup, ...]:
+        """Return the markups applicable to a rate in the surcharges order."""
+        key = (carrier_name, carrier_id, service)
+
+        if key not in self._matches:
+            positions = {
+                position
+                for candidate in itertools.product(
+                    (carrier_name, ANY), (carrier_id, ANY), (service, ANY)
+                )
+                for position in self.index.get(candidate, [])
+            }
+            self._matches[key] = tuple(self.markups[_] for _ in sorted(positions))
+
+        return self._matches[key]
+
+    def apply_rate(self, rate: datatypes.Rate) -> datatypes.Rate:
+        markups = self.match(rate.carrier_name, rate.carrier_id, rate.service)
+
+        if len(markups) == 0:
+            return rate
+
+        logger.debug("applying broker surcharges to rate")
+        total_charge = rate.total_charge
+        extra_charges = list(rate.extra_charges or [])
+
+        # percentages apply to the total charge including the previous markups.
+        for markup in markups:
+            amount = markup.charge(total_charge)
+            total_charge = lib.to_decimal(total_charge + amount)
+            extra_charges.append(
+                karrio.ChargeDetails(
+                    name=typing.cast(str, markup.name),
+                    amount=amount,
+                    currency=rate.currency,
+                )
+            )
+
+        return attr.evolve(rate, total_charge=total_charge, extra_charges=extra_charges)
+
+    def apply(self, response: datatypes.RateResponse) -> datatypes.RateResponse:
+        return datatypes.RateResponse(
+            messages=response.messages,
+            rates=sorted(
+                [self.apply_rate(rate) for rate in response.rates],
+                key=lambda rate: rate.total_charge,
+            ),
+        )
+
+
+def is_enabled() -> bool:
+    """Return whether the compiled markup tables are kept between requests.
+
+    Enabled when the system cache is shared by every process, unless
+    explicitly set with `MARKUP_TABLE`.
+    """
+    enabled = getattr(conf.settings, "MARKUP_TABLE", None)
+
+    if enabled is None or enabled == "":
+        return utils.is_shared_cache()
+
+    return str(enabled).lower() in ("1", "true", "yes", "on")
+
+
+def get_table(context) -> MarkupTable:
+    """Return the compiled markup table of the current tenant (and organization)."""
+    schema = server_conf.settings.schema or "public"
+    org_id = getattr(getattr(context, "org", None), "id", None)
+
+    if not is_enabled():
+        return MarkupTable(_surcharges(org_id))
+
+    version = _version(schema)
+    is_stale = lambda table: table is None or table.version != version
+
+    if is_stale(_tables.get((schema, org_id))):
+        with _lock:
+            if is_stale(_tables.get((schema, org_id))):
+                _tables[(schema, org_id)] = MarkupTable(_surcharges(org_id), version)
+
+    return _tables[(schema, org_id)]
+
+
+def invalidate_table():
+    """Drop the markup tables of the current tenant (in every process sharing
+    the system cache), again once the transaction commits.
+    """
+    schema = server_conf.settings.schema or "public"
+
+    def _invalidate():
+        for key in [_ for _ in _tables if _[0] == schema]:
+            _tables.pop(key, None)
+        caching.cache.set(VERSION_KEY.format(schema=schema), uuid.uuid4().hex, None)
+
+    _invalidate()
+    db.transaction.on_commit(_invalidate)
+
+
+def _surcharges(org_id: typing.Any):
+    import karrio.server.pricing.models as models
+
+    _filters = tuple()
+
+    if importlib.util.find_spec("karrio.server.orgs") is not None:
+        _filters += (Q(active=True, org__id=org_id) | Q(active=True, org=None),)
+    else:
+        _filters += (Q(active=True),)
+
+    return models.Surcharge.objects.filter(*_filters).prefetch_related(
+        "carrier_accounts"
+    )
+
+
+def _version(schema: str) -> str:
+    key = VERSION_KEY.format(schema=schema)
+    version = caching.cache.get(key)
+
+    if version is None:
+        caching.cache.add(key, uuid.uuid4().hex, None)
+        version = caching.cache.get(key)
+
+    return version
@@ -4,13 +4,12 @@ import functools
 import django.db.models as models
 import django.core.validators as validators
 
-import karrio.lib as lib
-import karrio.core.models as karrio
 import karrio.server.core.models as core
 import karrio.server.core.fields as fields
 import karrio.server.core.datatypes as datatypes
 import karrio.server.providers.models as providers
 import karrio.server.pricing.serializers as serializers
+import karrio.server.pricing.engine as engine
 
 logger = logging.getLogger(__name__)
 
@@ -93,51 +92,4 @@ class Surcharge(core.Entity):
         return f"{self.id} ({self.amount} {type_})"
 
     def apply_charge(self, response: datatypes.RateResponse) -> datatypes.RateResponse:
-        def apply(rate: datatypes.Rate) -> datatypes.Rate:
-            applicable = []
-            carrier_ids = [c.carrier_id for c in self.carrier_accounts.all()]
-            charges = getattr(rate, "extra_charges", None) or []
-
-            if any(self.carriers or []):
-                applicable.append(rate.carrier_name in self.carriers)
-
-            if any(carrier_ids):
-                applicable.append(rate.carrier_id in carrier_ids)
-
-            if any(self.services or []):
-                applicable.append(rate.service in self.services)
-
-            if any(applicable) and all(applicable):
-                logger.debug("applying broker surcharge to rate")
-
-                amount = lib.to_decimal(
-                    self.amount
-                    if self.surcharge_type == "AMOUNT"
-                    else (rate.total_charge * (typing.cast(float, self.amount) / 100))
-                )
-                total_charge = lib.to_decimal(rate.total_charge + amount)
-                extra_charges = rate.extra_charges + [
-                    karrio.ChargeDetails(
-                        name=typing.cast(str, self.name),
-                        amount=amount,
-                        currency=rate.currency,
-                    )
-                ]
-
-                return datatypes.Rate(
-                    **{
-                        **lib.to_dict(rate),
-                        "total_charge": total_charge,
-                        "extra_charges": extra_charges,
-                    }
-                )
-
-            return rate
-
-        return datatypes.RateResponse(
-            messages=response.messages,
-            rates=sorted(
-                [apply(rate) for rate in response.rates],
-                key=lambda rate: rate.total_charge,
-            ),
-        )
+        return engine.MarkupTable([self]).apply(response)
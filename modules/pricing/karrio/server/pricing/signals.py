@@ -1,11 +1,11 @@
 import logging
-import functools
-import importlib
-from django.db.models import Q
+from django.db.models import signals
 
 from karrio.server.serializers import Context
 from karrio.server.core.gateway import Rates
+import karrio.server.providers.models as providers
 import karrio.server.pricing.models as models
+import karrio.server.pricing.engine as engine
 
 logger = logging.getLogger(__name__)
 
@@ -15,21 +15,29 @@ def register_rate_post_processing(*args, **kwargs):
     logger.info("karrio.pricing signals registered...")
 
 
-def apply_custom_surcharges(context: Context, result):
-    _filters = tuple()
-
-    if importlib.util.find_spec("karrio.server.orgs") is not None:
-        _filters += (
-            Q(active=True, org__id=getattr(context.org, "id", None))
-            | Q(active=True, org=None),
-        )
-    else:
-        _filters += (Q(active=True),)
-
-    charges = models.Surcharge.objects.filter(*_filters)
-
-    return functools.reduce(
-        lambda cummulated_result, charge: charge.apply_charge(cummulated_result),
-        charges,
-        result,
+def register_signals():
+    signals.post_save.connect(markup_updated, sender=models.Surcharge)
+    signals.post_delete.connect(markup_updated, sender=models.Surcharge)
+    signals.m2m_changed.connect(
+        markup_updated, sender=models.Surcharge.carrier_accounts.through
     )
+    # connect without sender to also cover the carrier proxy models
+    signals.post_save.connect(carrier_updated)
+    signals.post_delete.connect(carrier_updated)
+
+
+def markup_updated(sender, instance, *args, **kwargs):
+    """Drop the compiled markup tables when a surcharge changes."""
+    engine.invalidate_table()
+
+
+def carrier_updated(sender, instance, *args, **kwargs):
+    """Drop the compiled markup tables when a carrier account changes since the
+    surcharges match the accounts by carrier_id.
+    """
+    if isinstance(instance, providers.Carrier):
+        engine.invalidate_table()
+
+
+def apply_custom_surcharges(context: Context, result):
+    return engine.get_table(context).apply(result)
@@ -2,10 +2,13 @@ import json
 import logging
 from unittest.mock import patch, ANY
 from django.urls import reverse
+from django.test import override_settings
 from rest_framework import status
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
+import karrio.server.core.datatypes as datatypes
 import karrio.server.pricing.models as models
+import karrio.server.pricing.engine as engine
 
 logging.disable(logging.CRITICAL)
 
@@ -51,6 +54,72 @@ class TestPricing(APITestCase):
             self.assertDictEqual(response_data, RATING_WITH_PERCENTAGE_RESPONSE)
 
 
+class TestMarkupTable(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.brokerage = models.Surcharge.objects.create(
+            amount=1.0, name="brokerage", carriers=["canadapost"]
+        )
+        self.handling = models.Surcharge.objects.create(
+            amount=10.0,
+            name="handling",
+            surcharge_type="PERCENTAGE",
+            services=["canadapost_priority"],
+        )
+        self.handling.carrier_accounts.set([self.carrier])
+        models.Surcharge.objects.create(amount=5.0, name="all", active=True)
+        models.Surcharge.objects.create(
+            amount=5.0, name="inactive", carriers=["canadapost"], active=False
+        )
+
+    def test_apply_markups_in_a_single_pass(self):
+        response = engine.get_table(None).apply(RATE_RESPONSE)
+        priority, expedited = response.rates
+
+        self.assertEqual(expedited.service, "canadapost_expedited_parcel")
+        self.assertEqual(expedited.total_charge, 101.0)
+        self.assertListEqual(
+            [_.name for _ in expedited.extra_charges], ["Base charge", "brokerage"]
+        )
+        self.assertEqual(priority.total_charge, 56.1)
+        self.assertListEqual(
+            [(_.name, _.amount) for _ in priority.extra_charges],
+            [("Base charge", 50.0), ("brokerage", 1.0), ("handling", 5.1)],
+        )
+
+    @override_settings(MARKUP_TABLE=True)
+    def test_cached_table_until_a_markup_changes(self):
+        table = engine.get_table(None)
+
+        with self.assertNumQueries(0):
+            self.assertIs(engine.get_table(None), table)
+
+        self.brokerage.amount = 2.0
+        self.brokerage.save()
+        updated = engine.get_table(None)
+
+        self.assertIsNot(updated, table)
+        self.assertEqual(updated.apply(RATE_RESPONSE).rates[0].total_charge, 57.2)
+
+        self.handling.carrier_accounts.set([self.ups_carrier])
+
+        self.assertEqual(
+            engine.get_table(None).apply(RATE_RESPONSE).rates[0].total_charge, 52.0
+        )
+
+    def test_table_requires_a_shared_cache(self):
+        table = engine.get_table(None)
+
+        self.assertIsNot(engine.get_table(None), table)
+
+        models.Surcharge.objects.filter(name="brokerage").update(amount=2.0)
+
+        self.assertEqual(
+            engine.get_table(None).apply(RATE_RESPONSE).rates[0].total_charge, 57.2
+        )
+
+
 RATING_DATA = {
     "shipper": {
         "postal_code": "V6M2V9",
@@ -299,3 +368,29 @@ RATING_WITH_PERCENTAGE_RESPONSE = {
         },
     ],
 }
+
+RATE_RESPONSE = datatypes.RateResponse(
+    messages=[],
+    rates=[
+        datatypes.Rate(
+            carrier_id="canadapost",
+            carrier_name="canadapost",
+            currency="CAD",
+            service="canadapost_expedited_parcel",
+            total_charge=100.0,
+            extra_charges=[
+                ChargeDetails(amount=100.0, currency="CAD", name="Base charge")
+            ],
+        ),
+        datatypes.Rate(
+            carrier_id="canadapost",
+            carrier_name="canadapost",
+            currency="CAD",
+            service="canadapost_priority",
+            total_charge=50.0,
+            extra_charges=[
+                ChargeDetails(amount=50.0, currency="CAD", name="Base charge")
+            ],
+        ),
+    ],
+)
@@ -1,9 +1,16 @@
 import json
-from unittest.mock import patch, ANY
+import time
+import uuid
+import threading
+from concurrent import futures
+from unittest.mock import patch, ANY, MagicMock
 from django.urls import reverse
+from django.test import override_settings
 from rest_framework import status
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
+import karrio.server.core.coalescing as coalescing
+import karrio.server.core.gateway as gateway
 
 
 class TestRating(APITestCase):
@@ -19,6 +26,385 @@ class TestRating(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, RATING_RESPONSE)
 
+    def test_fetch_shipment_rates_with_deadline(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        data = RATING_DATA
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.core.gateway.karrio.Rating.fetch"
+        ) as fetch:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(
+                f"{url}?deadline=2.5&carrier_timeout=1", data, format="json"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            fetch.assert_called_once_with(ANY, deadline=2.5, carrier_timeout=1.0)
+
+    def test_stream_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates-stream")
+        data = RATING_DATA
+
+        with patch("karrio.server.core.gateway.karrio.Rating.fetch") as fetch:
+            fetch.return_value.stream.return_value = iter(
+                [MagicMock(parse=MagicMock(return_value=RETURNED_VALUE))]
+            )
+            response = self.client.post(f"{url}", data, format="json")
+            events = b"".join(response.streaming_content).decode().split("\n\n")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            self.assertTrue(events[0].startswith("event: rates\ndata: "))
+            self.assertDictEqual(
+                json.loads(events[0].split("data: ", 1)[1]), RATING_RESPONSE
+            )
+            self.assertEqual(events[1], "event: done\ndata: {}")
+
+    @override_settings(RATE_CACHE_TTL=60)
+    def test_stream_cached_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates-stream")
+        data = RATING_DATA
+
+        with patch("karrio.server.core.gateway.karrio.Rating.fetch") as fetch:
+            fetch.return_value.stream.side_effect = lambda *_: iter(
+                [MagicMock(parse=MagicMock(return_value=RETURNED_VALUE))]
+            )
+            rates = [
+                json.loads(
+                    b"".join(response.streaming_content)
+                    .decode()
+                    .split("\n\n")[0]
+                    .split("data: ", 1)[1]
+                )["rates"][0]
+                for response in [
+                    self.client.post(f"{url}", data, format="json") for _ in range(2)
+                ]
+            ]
+
+            self.assertEqual(fetch.return_value.stream.call_count, 1)
+            self.assertFalse(rates[0]["meta"]["cache_hit"])
+            self.assertTrue(rates[1]["meta"]["cache_hit"])
+
+    def test_skip_rate_cache_when_disabled(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.core.gateway.rate_cache.RateCache"
+        ) as cache:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(f"{url}", RATING_DATA, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            cache.assert_not_called()
+
+    @override_settings(RATE_CACHE_TTL=60)
+    def test_fetch_cached_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        data = RATING_DATA
+        equivalent_data = {
+            **RATING_DATA,
+            "recipient": {
+                **RATING_DATA["recipient"],
+                "city": "moncton ",
+                "postal_code": "E1C 4Z8",
+                "person_name": "Jane Doe",
+            },
+            "parcels": [{**RATING_DATA["parcels"][0], "weight": 1.01}],
+        }
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(f"{url}", data, format="json")
+            cached_response = self.client.post(f"{url}", equivalent_data, format="json")
+            rate = json.loads(response.content)["rates"][0]
+            cached_rate = json.loads(cached_response.content)["rates"][0]
+
+            self.assertEqual(mock.call_count, 1)
+            self.assertFalse(rate["meta"]["cache_hit"])
+            self.assertTrue(cached_rate["meta"]["cache_hit"])
+            self.assertFalse(cached_rate["meta"]["cache_stale"])
+            self.assertNotEqual(cached_rate["id"], rate["id"])
+            self.assertListEqual(cached_rate["extra_charges"], rate["extra_charges"])
+
+            self.client.post(
+                f"{url}",
+                {**data, "options": {"signature_confirmation": True}},
+                format="json",
+            )
+
+            self.assertEqual(mock.call_count, 2)
+
+    @override_settings(RATE_CACHE_TTL=60, RATE_CACHE_STALE_TTL=60)
+    def test_serve_stale_shipment_rates_while_revalidating(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        data = RATING_DATA
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.core.rate_cache.utils.run_async", side_effect=lambda _: _()
+        ), patch("karrio.server.core.rate_cache.time") as clock:
+            mock.return_value = RETURNED_VALUE
+            clock.time.return_value = 1000.0
+            self.client.post(f"{url}", data, format="json")
+
+            clock.time.return_value = 1061.0
+            stale_response = self.client.post(f"{url}", data, format="json")
+            response = self.client.post(f"{url}", data, format="json")
+            stale_rate = json.loads(stale_response.content)["rates"][0]
+            rate = json.loads(response.content)["rates"][0]
+
+            self.assertEqual(mock.call_count, 2)
+            self.assertTrue(stale_rate["meta"]["cache_stale"])
+            self.assertTrue(rate["meta"]["cache_hit"])
+            self.assertFalse(rate["meta"]["cache_stale"])
+
+
+class TestBulkRating(APITestCase):
+    def test_fetch_bulk_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates-bulk")
+        data = dict(shipments=[RATING_DATA, {**RATING_DATA, "carrier_ids": ["fedex"]}])
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(f"{url}", data, format="json")
+            response_data = json.loads(response.content)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([_["index"] for _ in response_data["results"]], [0, 1])
+            self.assertDictEqual(
+                response_data["results"][0], {"index": 0, **RATING_RESPONSE}
+            )
+            self.assertListEqual(response_data["results"][1]["rates"], [])
+            self.assertEqual(
+                response_data["results"][1]["messages"][0]["code"], "not_found"
+            )
+
+    def test_stream_bulk_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates-bulk")
+        data = dict(shipments=[RATING_DATA, RATING_DATA])
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(f"{url}?stream=true", data, format="json")
+            lines = b"".join(response.streaming_content).decode().splitlines()
+            results = sorted([json.loads(_) for _ in lines], key=lambda _: _["index"])
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            self.assertListEqual(
+                results,
+                [{"index": 0, **RATING_RESPONSE}, {"index": 1, **RATING_RESPONSE}],
+            )
+
+    def test_resolve_bulk_carrier_connections_once(self):
+        url = reverse("karrio.server.proxy:shipment-rates-bulk")
+        data = dict(shipments=[RATING_DATA] * 3)
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.core.gateway.Rates.resolve", wraps=gateway.Rates.resolve
+        ) as resolve:
+            mock.return_value = RETURNED_VALUE
+            response = self.client.post(f"{url}", data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(json.loads(response.content)["results"]), 3)
+            self.assertEqual(resolve.call_count, 1)
+
+    @override_settings(BULK_RATING_MAX_SHIPMENTS=2)
+    def test_bulk_shipments_limit(self):
+        url = reverse("karrio.server.proxy:shipment-rates-bulk")
+        data = dict(shipments=[RATING_DATA] * 3)
+
+        response = self.client.post(f"{url}", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_limit_in_flight_calls_per_carrier(self):
+        lock = threading.Lock()
+        calls = dict(in_flight=0, max_in_flight=0)
+
+        def request(*_):
+            with lock:
+                calls["in_flight"] += 1
+                calls["max_in_flight"] = max(calls["max_in_flight"], calls["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                calls["in_flight"] -= 1
+            return RETURNED_VALUE
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.side_effect = request
+            responses = [
+                gateway.Rates.fetch_many(
+                    [RATING_DATA] * 2,
+                    carriers=[self.carrier],
+                    max_workers=2,
+                    carrier_concurrency=1,
+                )
+                for _ in range(2)
+            ]
+            with futures.ThreadPoolExecutor(2) as pool:
+                results = list(pool.map(list, responses))
+
+        self.assertEqual(sum(len(_) for _ in results), 4)
+        self.assertEqual(calls["max_in_flight"], 1)
+
+    def test_cancel_pending_calls_on_close(self):
+        calls = []
+
+        def request(*_):
+            calls.append(_)
+            time.sleep(0.05)
+            return RETURNED_VALUE
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.side_effect = request
+            responses = gateway.Rates.fetch_many(
+                [RATING_DATA] * 4, carriers=[self.carrier], max_workers=1
+            )
+            next(responses)
+            responses.close()
+            time.sleep(0.2)
+
+        self.assertLess(len(calls), 4)
+
+    def test_run_calls_on_the_network_executor(self):
+        threads = []
+
+        def request(*_):
+            threads.append(threading.current_thread().name)
+            return RETURNED_VALUE
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.side_effect = request
+            responses = list(
+                gateway.Rates.fetch_many(
+                    [RATING_DATA] * 2,
+                    carriers=[self.carrier],
+                    carrier_concurrency=1,
+                )
+            )
+
+        self.assertEqual(len(responses), 2)
+        self.assertTrue(all(_.startswith("karrio-network") for _ in threads))
+        self.assertEqual(len(gateway._carrier_slots), 0)
+
+
+class TestRatingCoalescing(APITestCase):
+    def fetch_concurrently(self, registry: type, *responses):
+        gateway = self.carrier.gateway
+        claimed = threading.Event()
+        responses = list(responses or [RETURNED_VALUE])
+        request = MagicMock()
+        claim = registry.claim
+
+        def follow(*args):
+            leads, wait = claim(*args)
+            if not leads:
+                claimed.set()
+            return leads, wait
+
+        def parse():
+            claimed.wait(5)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        request.stream.side_effect = lambda *_: iter([MagicMock(parse=parse)])
+        request.from_.return_value.parse.side_effect = parse
+
+        with patch.object(registry, "claim", autospec=True) as mock:
+            mock.side_effect = follow
+            with futures.ThreadPoolExecutor(2) as pool:
+                results = [
+                    pool.submit(coalescing.fetch, RATING_DATA, request, [gateway])
+                    for _ in range(2)
+                ]
+                futures.wait(results, 10)
+
+        return request, results
+
+    def test_coalescing_is_disabled_by_default(self):
+        self.assertIsNone(coalescing.registry())
+
+    @override_settings(RATING_COALESCING="local")
+    def test_coalesce_identical_in_flight_requests(self):
+        stats = coalescing.stats()
+        request, results = self.fetch_concurrently(coalescing.LocalRegistry)
+
+        self.assertEqual(request.stream.call_count + request.from_.call_count, 1)
+        self.assertListEqual(
+            [[_.service for _ in result.result()[0]] for result in results],
+            [["canadapost_priority"], ["canadapost_priority"]],
+        )
+        self.assertEqual(coalescing.stats()["coalesced"], stats["coalesced"] + 1)
+
+    @override_settings(RATING_COALESCING="local")
+    def test_do_not_coalesce_near_identical_requests(self):
+        request = MagicMock()
+        request.stream.side_effect = lambda *_: iter([])
+        payloads = [
+            RATING_DATA,
+            {**RATING_DATA, "parcels": [{**RATING_DATA["parcels"][0], "weight": 1.04}]},
+            {**RATING_DATA, "reference": "order #1"},
+        ]
+
+        with patch.object(
+            coalescing.LocalRegistry,
+            "claim",
+            autospec=True,
+            side_effect=coalescing.LocalRegistry.claim,
+        ) as claim:
+            for payload in payloads:
+                coalescing.fetch(payload, request, [self.carrier.gateway])
+
+        keys = [_.args[1] for _ in claim.call_args_list]
+
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(len(set(keys)), 3)
+
+    @override_settings(RATING_COALESCING="cache")
+    def test_coalesce_identical_in_flight_requests_across_workers(self):
+        request, results = self.fetch_concurrently(coalescing.CacheRegistry)
+
+        self.assertEqual(request.stream.call_count + request.from_.call_count, 1)
+        self.assertListEqual(
+            [[_.total_charge for _ in result.result()[0]] for result in results],
+            [[106.71], [106.71]],
+        )
+
+    def test_scope_shared_results_per_flight(self):
+        flights = coalescing.CacheRegistry()
+        key = f"karrio:test:{uuid.uuid4().hex}"
+        previous, _ = flights.claim(key, 5)
+        flights.publish(previous, dict(rates=[], messages=["previous"]))
+
+        flight, _ = flights.claim(key, 5)
+        follower, wait = flights.claim(key, 5)
+
+        self.assertIsNotNone(flight)
+        self.assertIsNone(follower)
+        self.assertIsNone(wait(0.1))
+
+        flights.publish(flight, dict(rates=[], messages=[]))
+
+        self.assertDictEqual(wait(0.1), dict(rates=[], messages=[]))
+
+    @override_settings(RATING_COALESCING="local")
+    def test_fall_back_when_the_leader_fails(self):
+        stats = coalescing.stats()
+        request, results = self.fetch_concurrently(
+            coalescing.LocalRegistry, Exception("carrier error"), RETURNED_VALUE
+        )
+        [leader] = [_ for _ in results if _.exception() is not None]
+        [follower] = [_ for _ in results if _.exception() is None]
+        rates, messages = follower.result()
+
+        self.assertEqual(str(leader.exception()), "carrier error")
+        self.assertEqual(request.stream.call_count + request.from_.call_count, 2)
+        self.assertEqual(len(rates), 1)
+        self.assertEqual(coalescing.stats()["fallbacks"], stats["fallbacks"] + 1)
+
 
 RATING_DATA = {
     "shipper": {
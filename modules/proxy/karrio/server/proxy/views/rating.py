@@ -1,6 +1,9 @@
+import json
 import logging
 from django.urls import path
+from django.http import StreamingHttpResponse
 from rest_framework import status
+from rest_framework.utils import encoders
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -8,10 +11,15 @@ from karrio.server.core.views.api import APIView
 from karrio.server.core.serializers import (
     RateRequest,
     RateResponse,
+    BulkRateRequest,
+    BulkRateResponse,
     ErrorResponse,
     ErrorMessages,
 )
 from karrio.server.core.gateway import Rates
+from karrio.server.tracing.utils import save_tracing_records
+from karrio.server.conf import settings
+import karrio.server.serializers as serializers
 from karrio.server.proxy.router import router
 import karrio.server.openapi as openapi
 
@@ -22,6 +30,26 @@ DESCRIPTIONS = """
 The Shipping process begins by fetching rates for your shipment.
 Use this service to fetch a shipping rates available.
 """
+STREAM_DESCRIPTIONS = """
+Fetch shipment rates as server-sent events.
+A `rates` event carrying a rate response is sent as soon as each carrier responds,
+followed by a final `done` event.
+"""
+BULK_DESCRIPTIONS = """
+Fetch the rates of many shipments in a single call.
+The carrier connections are resolved once for the whole batch and the rate response
+of each shipment is returned in request order. With `stream=true`, each shipment
+rate response is sent as a line of newline delimited JSON as soon as it is ready.
+"""
+
+
+class RateBudgetQuery(serializers.Serializer):
+    deadline = serializers.FloatField(required=False, min_value=0)
+    carrier_timeout = serializers.FloatField(required=False, min_value=0)
+
+
+class BulkRateQuery(RateBudgetQuery):
+    stream = serializers.BooleanField(required=False, default=False)
 
 
 class RateViewAPI(APIView):
@@ -40,11 +68,28 @@ class RateViewAPI(APIView):
             500: ErrorResponse(),
         },
         request=RateRequest(),
+        parameters=[
+            openapi.OpenApiParameter(
+                "deadline",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for all carriers.",
+            ),
+            openapi.OpenApiParameter(
+                "carrier_timeout",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for each carrier.",
+            ),
+        ],
     )
     def post(self, request: Request):
         payload = RateRequest.map(data=request.data).data
+        query = RateBudgetQuery.map(data=request.query_params).data
 
-        response = Rates.fetch(payload, context=request)
+        response = Rates.fetch(payload, context=request, **query)
         status_code = (
             status.HTTP_207_MULTI_STATUS
             if len(response.messages) > 0
@@ -54,4 +99,132 @@ class RateViewAPI(APIView):
         return Response(RateResponse(response).data, status=status_code)
 
 
+class RateStreamAPI(APIView):
+    throttle_scope = "carrier_request"
+
+    @openapi.extend_schema(
+        tags=["Proxy"],
+        operation_id=f"{ENDPOINT_ID}stream_rates",
+        extensions={"x-operationId": "streamRates"},
+        summary="Stream shipment rates",
+        description=STREAM_DESCRIPTIONS,
+        responses={
+            (200, "text/event-stream"): RateResponse(),
+            400: ErrorResponse(),
+            404: ErrorResponse(),
+            500: ErrorResponse(),
+        },
+        request=RateRequest(),
+        parameters=[
+            openapi.OpenApiParameter(
+                "deadline",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for all carriers.",
+            ),
+            openapi.OpenApiParameter(
+                "carrier_timeout",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for each carrier.",
+            ),
+        ],
+    )
+    def post(self, request: Request):
+        payload = RateRequest.map(data=request.data).data
+        query = RateBudgetQuery.map(data=request.query_params).data
+        responses = Rates.stream(payload, context=request, **query)
+
+        def events():
+            for response in responses:
+                data = json.dumps(RateResponse(response).data, cls=encoders.JSONEncoder)
+                yield f"event: rates\ndata: {data}\n\n"
+
+            # the carrier requests run after the view returned: save their traces
+            save_tracing_records(request, schema=settings.schema)
+            yield "event: done\ndata: {}\n\n"
+
+        response = StreamingHttpResponse(events(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+
+class RateBulkAPI(APIView):
+    throttle_scope = "carrier_request"
+
+    @openapi.extend_schema(
+        tags=["Proxy"],
+        operation_id=f"{ENDPOINT_ID}fetch_bulk_rates",
+        extensions={"x-operationId": "fetchBulkRates"},
+        summary="Fetch bulk shipment rates",
+        description=BULK_DESCRIPTIONS,
+        responses={
+            200: BulkRateResponse(),
+            (200, "application/x-ndjson"): BulkRateResponse(),
+            400: ErrorResponse(),
+            500: ErrorResponse(),
+        },
+        request=BulkRateRequest(),
+        parameters=[
+            openapi.OpenApiParameter(
+                "deadline",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for all carriers of a shipment.",
+            ),
+            openapi.OpenApiParameter(
+                "carrier_timeout",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.NUMBER,
+                required=False,
+                description="The maximum time in seconds to wait for each carrier.",
+            ),
+            openapi.OpenApiParameter(
+                "stream",
+                location=openapi.OpenApiParameter.QUERY,
+                type=openapi.OpenApiTypes.BOOL,
+                required=False,
+                description="Stream the shipment rate responses as newline delimited JSON.",
+            ),
+        ],
+    )
+    def post(self, request: Request):
+        payloads = BulkRateRequest.map(data=request.data).data["shipments"]
+        query = BulkRateQuery.map(data=request.query_params).data
+        stream = query.pop("stream", False)
+        responses = Rates.fetch_many(payloads, context=request, **query)
+        result = lambda index, response: dict(
+            index=index, **RateResponse(response).data
+        )
+
+        if not stream:
+            results = sorted((result(*_) for _ in responses), key=lambda _: _["index"])
+            return Response(BulkRateResponse(dict(results=results)).data)
+
+        def lines():
+            for index, response in responses:
+                data = json.dumps(result(index, response), cls=encoders.JSONEncoder)
+                yield f"{data}\n"
+
+            # the carrier requests run after the view returned: save their traces
+            save_tracing_records(request, schema=settings.schema)
+
+        response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+
 router.urls.append(path("proxy/rates", RateViewAPI.as_view(), name="shipment-rates"))
+router.urls.append(
+    path("proxy/rates/stream", RateStreamAPI.as_view(), name="shipment-rates-stream")
+)
+router.urls.append(
+    path("proxy/rates/bulk", RateBulkAPI.as_view(), name="shipment-rates-bulk")
+)
@@ -0,0 +1,126 @@
+"""Benchmark label bundling for document printing.
+
+Compares the base64 bundling round trip previously used by the document
+printers (decode, merge, re-encode then decode again) against writing the
+bundle straight to a file-like sink. Image bundles are stacked on a single
+canvas so at most 50 image labels are bundled. Memory is the peak Python
+heap allocation reported by tracemalloc.
+
+Usage: python modules/sdk/benchmarks/bench_bundle.py [--labels 500] [--number 1]
+"""
+
+import io
+import time
+import base64
+import typing
+import argparse
+import tracemalloc
+import PyPDF2
+import PIL.Image
+import karrio.lib as lib
+
+IMAGE_LABELS = 50
+
+
+def legacy_bundle_base64(base64_strings: typing.List[str], format: str) -> str:
+    """lib.bundle_base64 before the streaming bundler."""
+    result = io.BytesIO()
+
+    if format == "PDF":
+        merger = PyPDF2.PdfMerger(strict=False)
+        for b64_str in base64_strings:
+            buffer = io.BytesIO()
+            buffer.write(base64.b64decode(b64_str))
+            merger.append(buffer)
+        merger.write(result)
+
+    elif "ZPL" in format:
+        content = "".join(
+            f'{base64.b64decode(_).decode("utf-8")}\n' for _ in base64_strings
+        )
+        result.write(content.encode("utf-8"))
+
+    else:
+        images = [
+            PIL.Image.open(io.BytesIO(base64.b64decode(_))) for _ in base64_strings
+        ]
+        widths, heights = zip(*(i.size for i in images))
+        image = PIL.Image.new("RGB", (max(widths), sum(heights)))
+        offset = 0
+        for im in images:
+            image.paste(im, (0, offset))
+            offset += im.size[1]
+        image.save(result, format)
+
+    return base64.b64encode(result.getvalue()).decode("utf-8")
+
+
+def create_labels(count: int) -> typing.Dict[str, typing.List[str]]:
+    label = PIL.Image.new("1", (812, 1218), 1)
+    label.paste(0, (40, 40, 772, 240))
+    png, pdf = io.BytesIO(), io.BytesIO()
+    label.save(png, "PNG")
+    label.save(pdf, "PDF", resolution=203)
+    zpl = b"^XA^FO40,40^GB732,200,200^FS^FO40,300^A0N,60,60^FDLABEL^FS^XZ"
+
+    return dict(
+        PDF=[base64.b64encode(pdf.getvalue()).decode()] * count,
+        PNG=[base64.b64encode(png.getvalue()).decode()] * min(count, IMAGE_LABELS),
+        ZPL=[base64.b64encode(zpl).decode()] * count,
+    )
+
+
+def pages(content: bytes, format: str) -> typing.Any:
+    if format == "PDF":
+        return len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+    if format == "PNG":
+        return PIL.Image.open(io.BytesIO(content)).size
+
+    return content
+
+
+def measure(run: typing.Callable[[], typing.Any], number: int):
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    elapsed = (time.perf_counter() - start) / number
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labels", type=int, default=500)
+    parser.add_argument("--number", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{'format':<8}{'before (ms)':>14}{'after (ms)':>14}"
+        f"{'before (MiB)':>15}{'after (MiB)':>14}{'speedup':>10}"
+    )
+    for format, labels in create_labels(args.labels).items():
+        before = lambda: base64.b64decode(legacy_bundle_base64(labels, format))
+        after = lambda: lib.write_bundle(labels, io.BytesIO(), format).getvalue()
+
+        assert pages(before(), format) == pages(after(), format)
+
+        before_time, before_peak = measure(before, args.number)
+        after_time, after_peak = measure(after, args.number)
+
+        print(
+            f"{format:<8}"
+            f"{before_time * 1e3:>14.1f}"
+            f"{after_time * 1e3:>14.1f}"
+            f"{before_peak / 2**20:>15.1f}"
+            f"{after_peak / 2**20:>14.1f}"
+            f"{before_time / after_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Replay the connector test fixtures as benchmarks.
+
+Every `test_create_*_request` and `test_parse_*_response` test of the
+connectors under modules/connectors/*/tests builds a request from its fixture
+payload and serializes it, or parses a mocked carrier response. This suite
+times those tests offline, compares them against the stored baselines and
+reports the regressions. Each case is replayed up to --number times per
+repeat, within a --budget of seconds.
+
+Like bin/run-sdk-tests, each connector is replayed in its own process since
+some connectors mutate shared request defaults. Timings are stored in units
+of a calibration workload measured in the same process, so baselines
+recorded on another machine remain comparable.
+
+Usage: python modules/sdk/benchmarks/bench_connectors.py [--carriers ups fedex] [--number 20] [--budget 0.2] [--threshold 2.5] [--save]
+"""
+
+import sys
+import json
+import time
+import timeit
+import typing
+import logging
+import fnmatch
+import argparse
+import unittest
+import importlib
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = Path(__file__).resolve().parents[3]
+CONNECTORS_DIR = ROOT / "modules" / "connectors"
+BASELINES = Path(__file__).resolve().parent / "baselines" / "connectors.json"
+PATTERNS = ["test_create_*_request", "test_parse_*_response"]
+REPEAT = 5
+
+
+def calibrate() -> float:
+    """Time a fixed pure python workload (dict building and json round trip)."""
+    payload = {f"key_{i}": [i, str(i), {"value": i * 1.5}] for i in range(200)}
+    run = lambda: json.loads(json.dumps(payload))
+
+    return min(timeit.repeat(run, number=200, repeat=5)) / 200
+
+
+def collect(tests_dir: Path) -> dict:
+    """Return the replayable fixture tests of a connector by case name."""
+    cases = {}
+    loader = unittest.TestLoader()
+    carrier = tests_dir.parent.name
+    sys.path.insert(0, str(tests_dir))
+    packages = [_ for _ in tests_dir.iterdir() if (_ / "__init__.py").exists()]
+
+    for package in packages:
+        for file in sorted(package.glob("test_*.py")):
+            module = importlib.import_module(f"{package.name}.{file.stem}")
+
+            for suite in loader.loadTestsFromModule(module):
+                for test in suite:
+                    method = test._testMethodName
+                    if any(fnmatch.fnmatch(method, _) for _ in PATTERNS):
+                        cases[f"{carrier}.{type(test).__name__}.{method}"] = test
+
+    return cases
+
+
+def replay(test: unittest.TestCase):
+    test.setUp()
+    try:
+        getattr(test, test._testMethodName)()
+    finally:
+        test.tearDown()
+
+
+def passes(test: unittest.TestCase) -> bool:
+    result = unittest.TestResult()
+    type(test)(test._testMethodName).run(result)
+
+    return result.wasSuccessful()
+
+
+def bench(tests_dir: Path, number: int, budget: float) -> typing.Tuple[float, dict]:
+    """Return the calibration and time per replay of the cases of a connector.
+
+    Failing cases are timed as None.
+    """
+    logging.disable(logging.CRITICAL)
+    calibration = calibrate()
+    timings = {}
+
+    for name, test in collect(tests_dir).items():
+        if not passes(test):
+            timings[name] = None
+            continue
+
+        # slow cases (e.g. label processing) are replayed fewer times.
+        run = lambda: replay(test)
+        count = max(1, min(number, int(budget / timeit.timeit(run, number=1))))
+        timings[name] = min(timeit.repeat(run, number=count, repeat=REPEAT)) / count
+
+    return min(calibration, calibrate()), timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--carriers", nargs="*", default=[])
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=2.5)
+    parser.add_argument("--save", action="store_true")
+    args = parser.parse_args()
+
+    connectors = [
+        _
+        for _ in sorted(CONNECTORS_DIR.glob("*/tests"))
+        if not args.carriers or _.parent.name in args.carriers
+    ]
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    baselines = stored.get("cases", {})
+    results, regressions, skipped = {}, [], []
+    width = max(len(_) for _ in baselines) + 2 if baselines else 80
+
+    print(f"{'case':<{width}}{'baseline (us)':>15}{'current (us)':>14}{'ratio':>8}")
+    for tests_dir in connectors:
+        with ProcessPoolExecutor(1, multiprocessing.get_context("spawn")) as pool:
+            calibration, timings = pool.submit(
+                bench, tests_dir, args.number, args.budget
+            ).result()
+
+        for name, current in timings.items():
+            if current is None:
+                skipped.append(name)
+                continue
+
+            results[name] = current / calibration
+            baseline = baselines.get(name)
+
+            if baseline is None:
+                print(f"{name:<{width}}{'-':>15}{current * 1e6:>14.1f}{'new':>8}")
+                continue
+
+            ratio = current / (baseline * calibration)
+            flag = "  REGRESSION" if ratio > args.threshold else ""
+            if flag:
+                regressions.append(name)
+
+            print(
+                f"{name:<{width}}"
+                f"{baseline * calibration * 1e6:>15.1f}"
+                f"{current * 1e6:>14.1f}"
+                f"{ratio:>7.2f}x{flag}"
+            )
+
+    print(
+        f"\n{len(results)} cases, {len(regressions)} regressions "
+        f"(> {args.threshold}x baseline), {len(skipped)} failing cases skipped"
+    )
+    for name in skipped:
+        print(f"  skipped: {name}")
+
+    if args.save:
+        BASELINES.parent.mkdir(exist_ok=True)
+        BASELINES.write_text(
+            json.dumps(
+                dict(
+                    recorded_at=time.strftime("%Y-%m-%d"),
+                    cases={**baselines, **results},
+                ),
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+
+    sys.exit(1 if regressions and not args.save else 0)
+
+
+if __name__ == "__main__":
+    main()
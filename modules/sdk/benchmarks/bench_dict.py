@@ -0,0 +1,96 @@
+"""Benchmark DICTPARSE.to_dict and DICTPARSE.to_object.
+
+Compares the direct conversion against the JSON round trip it replaces on
+rate and shipment details payloads.
+
+Usage: python modules/sdk/benchmarks/bench_dict.py [--number 2000]
+"""
+
+import json
+import timeit
+import argparse
+import jstruct.utils as jstruct
+import karrio.core.models as models
+from karrio.core.utils import DP
+
+
+def json_round_trip(entity):
+    return json.loads(
+        DP.jsonify(entity),
+        object_hook=lambda d: {k: v for k, v in d.items() if v not in (None, [], "")},
+    )
+
+
+RateDetails = models.RateDetails(
+    carrier_name="ups",
+    carrier_id="ups",
+    service="ups_ground",
+    currency="USD",
+    total_charge=120.5,
+    extra_charges=[
+        models.ChargeDetails(name=f"Surcharge {index}", amount=2.5, currency="USD")
+        for index in range(6)
+    ],
+    transit_days=3,
+    meta=dict(service_name="UPS Ground", rate_provider="ups"),
+)
+
+ShipmentDetails = models.ShipmentDetails(
+    carrier_name="ups",
+    carrier_id="ups",
+    tracking_number="1Z12345E6205277936",
+    shipment_identifier="1Z12345E6205277936",
+    docs=models.Documents(label="JVBERi0xLjQKJ" * 2000),
+    selected_rate=RateDetails,
+    label_type="PDF",
+    meta=dict(tracking_numbers=["1Z12345E6205277936"] * 4),
+)
+
+CASES = {
+    "to_dict(RateDetails)": (
+        lambda: json_round_trip(RateDetails),
+        lambda: DP.to_dict(RateDetails),
+    ),
+    "to_dict(ShipmentDetails)": (
+        lambda: json_round_trip(ShipmentDetails),
+        lambda: DP.to_dict(ShipmentDetails),
+    ),
+    "to_dict([RateDetails] * 20)": (
+        lambda: json_round_trip([RateDetails] * 20),
+        lambda: DP.to_dict([RateDetails] * 20),
+    ),
+    "to_object(RateDetails)": (
+        lambda: jstruct.instantiate(models.RateDetails, RATE_DATA),
+        lambda: DP.to_object(models.RateDetails, RATE_DATA),
+    ),
+    "to_object(ShipmentDetails)": (
+        lambda: jstruct.instantiate(models.ShipmentDetails, SHIPMENT_DATA),
+        lambda: DP.to_object(models.ShipmentDetails, SHIPMENT_DATA),
+    ),
+}
+RATE_DATA = DP.to_dict(RateDetails)
+SHIPMENT_DATA = DP.to_dict(ShipmentDetails)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'case':<30}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, (before, after) in CASES.items():
+        assert json.dumps(before(), default=str) == json.dumps(after(), default=str)
+
+        before_time = min(timeit.repeat(before, number=args.number, repeat=3))
+        after_time = min(timeit.repeat(after, number=args.number, repeat=3))
+
+        print(
+            f"{name:<30}"
+            f"{before_time / args.number * 1e6:>14.1f}"
+            f"{after_time / args.number * 1e6:>14.1f}"
+            f"{before_time / after_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
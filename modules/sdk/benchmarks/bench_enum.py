@@ -0,0 +1,82 @@
+"""Benchmark MetaEnum.map on the enums mapped the most by the connectors.
+
+Compares the precomputed reverse lookup table against the membership tests
+and linear scans it replaces.
+
+Usage: python modules/sdk/benchmarks/bench_enum.py [--number 20000]
+"""
+
+import timeit
+import typing
+import argparse
+import karrio.core.units as units
+import karrio.core.utils.enum as enum
+import karrio.providers.ups.units as ups
+import karrio.providers.fedex.units as fedex
+import karrio.providers.canadapost.units as canadapost
+import karrio.providers.dhl_express.units as dhl_express
+
+
+def legacy_map(cls: typing.Any, key: typing.Any):
+    """MetaEnum.map before the reverse lookup table."""
+    if key in cls:
+        return enum.EnumWrapper(key, cls[key])
+    elif key in cls._value2member_map_:
+        return enum.EnumWrapper(key, cls(key))
+    elif key in [str(v.value) for v in cls.__members__.values()]:
+        return enum.EnumWrapper(
+            key, next(v for v in cls.__members__.values() if v.value == key)
+        )
+
+    return enum.EnumWrapper(key)
+
+
+def last_value(cls: typing.Any) -> str:
+    return list(cls.__members__.values())[-1].value
+
+
+CASES = {
+    "Country.map(name)": (units.Country, "CA"),
+    "Country.map(value)": (units.Country, "Canada"),
+    "Currency.map(name)": (units.Currency, "USD"),
+    "CountryState.map(name)": (units.CountryState, "US"),
+    "ups.ShippingService(value)": (
+        ups.ShippingService,
+        last_value(ups.ShippingService),
+    ),
+    "fedex.ShippingService(value)": (
+        fedex.ShippingService,
+        last_value(fedex.ShippingService),
+    ),
+    "canadapost.ServiceType(value)": (
+        canadapost.ServiceType,
+        last_value(canadapost.ServiceType),
+    ),
+    "dhl_express.ShippingOption(miss)": (dhl_express.ShippingOption, "unknown"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'case':<34}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, (cls, key) in CASES.items():
+        before = lambda: legacy_map(cls, key)
+        after = lambda: cls.map(key)
+        assert before().enum is after().enum
+
+        before_time = min(timeit.repeat(before, number=args.number, repeat=3))
+        after_time = min(timeit.repeat(after, number=args.number, repeat=3))
+
+        print(
+            f"{name:<34}"
+            f"{before_time / args.number * 1e6:>14.2f}"
+            f"{after_time / args.number * 1e6:>14.2f}"
+            f"{before_time / after_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
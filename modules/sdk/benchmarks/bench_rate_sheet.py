@@ -0,0 +1,131 @@
+"""Benchmark the universal rate sheet zone resolution.
+
+Compares the compiled service index lookup against the linear zone scan it
+replaces on rate sheets with a growing number of postal code zones.
+
+Usage: python modules/sdk/benchmarks/bench_rate_sheet.py [--number 200]
+"""
+
+import timeit
+import typing
+import argparse
+import karrio.core.units as units
+import karrio.core.models as models
+import karrio.universal.providers.rating.index as index
+
+SIZES = [10, 100, 1000, 5000]
+
+
+def create_service(size: int) -> models.ServiceLevel:
+    return models.ServiceLevel(
+        service_name="Zoned",
+        service_code="carrier_zoned",
+        currency="USD",
+        weight_unit="LB",
+        zones=[
+            models.ServiceZone(
+                rate=10.0 + bracket,
+                min_weight=bracket * 5.0,
+                max_weight=(bracket + 1) * 5.0,
+                country_codes=["US"],
+                postal_codes=[f"{zone:05}"],
+            )
+            for zone in range(size // 4)
+            for bracket in range(4)
+        ],
+    )
+
+
+def scan_zones(
+    service: models.ServiceLevel,
+    recipient: units.ComputedAddress,
+    package_weight: float,
+) -> typing.Optional[models.ServiceZone]:
+    """The zone scan of get_available_rates before the index."""
+    selected_zone: typing.Optional[models.ServiceZone] = None
+
+    for zone in service.zones or []:
+        _cover_supported_cities = (
+            zone.cities is not None
+            and recipient.city is not None
+            and recipient.city.lower() in [_.lower() for _ in zone.cities]
+        ) or not any(zone.cities or [])
+        _cover_supported_countries = (
+            zone.country_codes is not None
+            and recipient.country_code in zone.country_codes
+        ) or not any(zone.country_codes or [])
+        _cover_supported_postal_codes = (
+            zone.postal_codes is not None
+            and recipient.postal_code is not None
+            and str(recipient.postal_code).lower()
+            in [str(_).lower() for _ in zone.postal_codes]
+        ) or not any(zone.postal_codes or [])
+        _match_zone_min_weight_requirements = (
+            zone.min_weight is not None
+            and package_weight
+            >= units.Weight(zone.min_weight, service.weight_unit).value
+        ) or (zone.min_weight is None)
+        _match_zone_max_weight_requirements = (
+            zone.max_weight is not None
+            and package_weight
+            <= units.Weight(zone.max_weight, service.weight_unit).value
+        ) or (zone.max_weight is None)
+        _best_fit_zone_selected = (
+            selected_zone is not None
+            and selected_zone.max_weight is not None
+            and (
+                selected_zone.rate < zone.rate
+                or (
+                    selected_zone.max_weight is not None
+                    and zone.max_weight is not None
+                    and selected_zone.max_weight < zone.max_weight
+                )
+                or (
+                    selected_zone.min_weight is not None
+                    and zone.min_weight is not None
+                    and selected_zone.min_weight < zone.min_weight
+                )
+            )
+        )
+
+        if (
+            _cover_supported_cities
+            and _cover_supported_countries
+            and _cover_supported_postal_codes
+            and _match_zone_min_weight_requirements
+            and _match_zone_max_weight_requirements
+            and _best_fit_zone_selected is False
+        ):
+            selected_zone = zone
+
+    return selected_zone
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'zones':<30}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for size in SIZES:
+        service = create_service(size)
+        recipient = units.ComputedAddress(
+            models.Address(country_code="US", postal_code=f"{size // 8:05}")
+        )
+        before = lambda: scan_zones(service, recipient, 12.0)
+        after = lambda: index.compile_service(service).select_zone(recipient, 12.0)
+        assert before() is after() and after() is not None
+
+        before_time = min(timeit.repeat(before, number=args.number, repeat=3))
+        after_time = min(timeit.repeat(after, number=args.number, repeat=3))
+
+        print(
+            f"{size:<30}"
+            f"{before_time / args.number * 1e6:>14.1f}"
+            f"{after_time / args.number * 1e6:>14.1f}"
+            f"{before_time / after_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Benchmark the SVG label renderer used by the generic and custom carriers.
+
+Compares rendering the default label template without the font, style,
+barcode and template caches against the cached renderer, then renders a
+batch of labels sequentially and in a process pool.
+
+Usage: python modules/sdk/benchmarks/bench_renderer.py [--number 20] [--labels 50] [--workers 4]
+"""
+
+import io
+import time
+import base64
+import argparse
+from jinja2 import Template
+from barcode import Code128
+from lxml.etree import fromstring
+from barcode.writer import ImageWriter
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+import karrio.addons.renderer as renderer
+from karrio.addons.label import DEFAULT_SVG_LABEL_TEMPLATE
+
+CONTEXT = dict(
+    shipment=dict(
+        shipper=dict(
+            company_name="CGI",
+            address_line1="502 MAIN ST N",
+            city="MONTREAL",
+            state_code="QC",
+            postal_code="H2B1A0",
+        ),
+        recipient=dict(
+            company_name="CGI",
+            address_line1="23 jardin private",
+            city="Ottawa",
+            state_code="ON",
+            postal_code="K1K4T3",
+            country_code="CA",
+        ),
+    ),
+    carrier=dict(display_name="Custom Carrier", metadata={}),
+    metadata=dict(RFF_CN="037-2332855", BGM="040000000000016256"),
+    package_index=1,
+    total_packages=1,
+    is_multi_item=False,
+    master_item={},
+    total_quantity=1,
+    tracking_number="1234567890",
+    units=dict(CountryISO={"CA": "124"}),
+)
+
+
+def legacy_generate_pdf_from_svg_label(content: str) -> Image.Image:
+    """generate_pdf_from_svg_label before the renderer caches."""
+    template = fromstring(content)
+    label = Image.new("L", (1200, 1800), "white")
+    draw = ImageDraw.Draw(label)
+    font = lambda size=10, bold=False: ImageFont.truetype(
+        f"{renderer.FONTS_DIR}/Oswald-{'SemiBold' if bold else 'Regular'}.ttf", size
+    )
+    parse = lambda text: dict(
+        [[k.strip() for k in s.split(":")] for s in text.split(";") if s != ""]
+    )
+
+    for element in template:
+        tag = element.tag if isinstance(element.tag, str) else ""
+
+        if "g" in tag and element.get("data-type") == "barcode":
+            parse(element.get("style"))
+            barcode = Code128(element.get("data-value"), writer=ImageWriter()).render(
+                writer_options=dict(
+                    quiet_zone=1.0,
+                    module_width=0.5,
+                    module_height=30.0,
+                    font_size=1,
+                    text_distance=0.0,
+                    dpi=300,
+                ),
+                text="",
+            )
+            barcode.thumbnail((int(element.get("width")), int(element.get("height"))))
+            label.paste(barcode, (int(element.get("x")), int(element.get("y"))))
+
+        if "line" in tag:
+            draw.line(
+                (
+                    int(element.get("x1")),
+                    int(element.get("y1")) + 20,
+                    int(element.get("x2")),
+                    int(element.get("y2")) + 20,
+                ),
+                fill=element.get("fill"),
+                width=int(element.get("stroke-width") or 3),
+            )
+
+        if "text" in tag:
+            x, y = int(element.get("x")), int(element.get("y")) - 20
+            style_text = element.get("style")
+            font_size = int(parse(style_text).get("font-size", "10"))
+
+            if element.get("data-type") == "barcode-text":
+                for i, char in enumerate(element.text or "", 0):
+                    draw.text(
+                        (x + ((font_size * 0.66) * i), y),
+                        char,
+                        fill="black",
+                        font=font(font_size, False),
+                    )
+            else:
+                draw.text(
+                    (x, y),
+                    element.text or "",
+                    fill=element.get("fill"),
+                    font=font(font_size, "bold" in style_text),
+                )
+
+    return label
+
+
+def legacy_render(context: dict) -> str:
+    label = Template(DEFAULT_SVG_LABEL_TEMPLATE).render(**context)
+    result = io.BytesIO()
+    legacy_generate_pdf_from_svg_label(label).save(result, "PDF", resolution=300)
+
+    return base64.b64encode(result.getvalue()).decode("utf-8")
+
+
+def render(context: dict) -> str:
+    label = renderer.compile_template(DEFAULT_SVG_LABEL_TEMPLATE).render(**context)
+    return renderer.render_label(label, label_type="PDF", template_type="SVG")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--labels", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    svg = Template(DEFAULT_SVG_LABEL_TEMPLATE).render(**CONTEXT)
+    assert not ImageChops.difference(
+        legacy_generate_pdf_from_svg_label(svg),
+        renderer.generate_pdf_from_svg_label(svg),
+    ).getbbox()
+
+    start = time.perf_counter()
+    for _ in range(args.number):
+        legacy_render(CONTEXT)
+    before = (time.perf_counter() - start) / args.number
+
+    start = time.perf_counter()
+    for _ in range(args.number):
+        render(CONTEXT)
+    after = (time.perf_counter() - start) / args.number
+
+    print(f"{'case':<28}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    print(
+        f"{'single label':<28}{before * 1e3:>14.1f}{after * 1e3:>14.1f}{before / after:>9.1f}x"
+    )
+
+    contexts = [{**CONTEXT, "package_index": i} for i in range(args.labels)]
+    start = time.perf_counter()
+    for context in contexts:
+        legacy_render(context)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    renderer.render_labels(
+        DEFAULT_SVG_LABEL_TEMPLATE,
+        contexts,
+        label_type="PDF",
+        template_type="SVG",
+        max_workers=args.workers,
+    )
+    after = time.perf_counter() - start
+
+    case = f"{args.labels} labels ({args.workers} workers)"
+    print(f"{case:<28}{before * 1e3:>14.1f}{after * 1e3:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark the import time and memory of the carrier mappers.
+
+Imports the mappers in a fresh interpreter with the lazy schema modules
+enabled and disabled (`KARRIO_LAZY_SCHEMAS=0`), and reports the import
+time, the peak RSS and the number of schema modules actually executed.
+
+Usage: python modules/sdk/benchmarks/bench_startup.py [--carriers dhl_express fedex_ws]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+SCRIPT = """
+import sys, json, time, resource
+start = time.perf_counter()
+import karrio.references as references
+carriers = json.loads(sys.argv[1])
+if carriers:
+    [references.get_provider(carrier) for carrier in carriers]
+else:
+    references.import_extensions()
+duration = time.perf_counter() - start
+schemas = [
+    module for name, module in sys.modules.items()
+    if name.startswith("karrio.schemas.") and type(module).__name__ != "LazyModule"
+]
+print(json.dumps(dict(
+    duration=duration,
+    rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    schemas=len(schemas),
+)))
+"""
+
+
+def measure(carriers: list, lazy: bool) -> dict:
+    env = dict(os.environ, KARRIO_LAZY_SCHEMAS="1" if lazy else "0")
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT, json.dumps(carriers)], env=env
+    )
+
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--carriers", nargs="*", default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'import (s)':>12}{'rss (MB)':>12}{'schemas loaded':>16}")
+    for mode, lazy in (("eager", False), ("lazy", True)):
+        runs = [measure(args.carriers, lazy) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["duration"])
+
+        print(
+            f"{mode:<10}"
+            f"{best['duration']:>12.2f}"
+            f"{best['rss']:>12.0f}"
+            f"{best['schemas']:>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
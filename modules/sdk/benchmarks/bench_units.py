@@ -0,0 +1,120 @@
+"""Profile multi-piece rate request builds and the unit objects they use.
+
+Builds FedEx and UPS rate requests for a multi-piece shipment and reports
+the build time, the number of unit objects allocated and the allocated
+memory. Pass --profile to print the top cumulative cProfile entries.
+
+Usage: python modules/sdk/benchmarks/bench_units.py [--number 200] [--parcels 10] [--profile]
+"""
+
+import pstats
+import timeit
+import cProfile
+import argparse
+import tracemalloc
+import karrio
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+
+UNIT_TYPES = [
+    units.Weight,
+    units.Dimension,
+    units.Volume,
+    units.Girth,
+    units.Products,
+    units.ShippingOptions,
+]
+
+
+def create_request(parcels: int) -> models.RateRequest:
+    return lib.to_object(
+        models.RateRequest,
+        dict(
+            shipper=dict(postal_code="H3N1S4", country_code="CA", state_code="QC"),
+            recipient=dict(postal_code="89109", country_code="US", state_code="NV"),
+            parcels=[
+                dict(
+                    id=str(index),
+                    weight=2.0 + index,
+                    width=10.0,
+                    height=12.0,
+                    length=15.0,
+                    weight_unit="LB",
+                    dimension_unit="IN",
+                    items=[dict(weight=1.0, title="item", quantity=2)],
+                    options=dict(insurance=25.0),
+                )
+                for index in range(parcels)
+            ],
+            options=dict(currency="USD", shipment_date="2024-02-15"),
+        ),
+    )
+
+
+GATEWAYS = {
+    "fedex": dict(api_key="key", secret_key="secret", account_number="123"),
+    "ups": dict(client_id="id", client_secret="secret", account_number="123"),
+}
+
+
+def count_allocations(build) -> dict:
+    """Count the unit objects created by one build."""
+    counts = {_.__name__: 0 for _ in UNIT_TYPES}
+    originals = {_: _.__init__ for _ in UNIT_TYPES}
+
+    def counting(unit_type, init):
+        def __init__(self, *args, **kwargs):
+            if type(self) is unit_type:
+                counts[unit_type.__name__] += 1
+            init(self, *args, **kwargs)
+
+        return __init__
+
+    try:
+        for unit_type, init in originals.items():
+            unit_type.__init__ = counting(unit_type, init)
+        build()
+    finally:
+        for unit_type, init in originals.items():
+            unit_type.__init__ = init
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--parcels", type=int, default=10)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    request = create_request(args.parcels)
+
+    for carrier_name, settings in GATEWAYS.items():
+        gateway = karrio.gateway[carrier_name].create(settings)
+        build = lambda: gateway.mapper.create_rate_request(request).serialize()
+
+        build_time = min(timeit.repeat(build, number=args.number, repeat=3))
+        counts = count_allocations(build)
+        tracemalloc.start()
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{carrier_name} ({args.parcels} parcels)")
+        print(f"  build: {build_time / args.number * 1e3:.2f} ms")
+        print(f"  peak memory: {peak / 1024:.1f} KiB")
+        print(
+            "  unit objects: "
+            + ", ".join(f"{name}={count}" for name, count in counts.items())
+        )
+
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(build)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,10 @@ Attributes:
 
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)  # type: ignore
 
+from karrio.core.utils.imports import enable_lazy_schemas
+
+enable_lazy_schemas()
+
 from karrio.api.gateway import GatewayInitializer
 import karrio.api.interface as interface
 
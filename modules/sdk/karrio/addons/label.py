@@ -1,8 +1,7 @@
-from jinja2 import Template
 from karrio.core.utils import DP
 from karrio.core.units import Package, CountryISO
 from karrio.core.models import ShipmentRequest
-from karrio.addons.renderer import render_label
+from karrio.addons.renderer import compile_template, render_label
 from karrio.universal.providers.shipping import (
     ShippingMixinSettings,
 )
@@ -37,7 +36,7 @@ def generate_label(
     )
 
     return render_label(
-        label=Template(template).render(**context),
+        label=compile_template(template).render(**context),
         label_type=getattr(shipment, "label_type", "PDF"),
         template_type=getattr(settings.label_template, "type", "SVG"),
         width=getattr(settings.label_template, "width", 4),
@@ -1,24 +1,80 @@
 import io
+import os
+import typing
 import base64
+import functools
+import threading
+import multiprocessing
+import concurrent.futures as futures
 from pathlib import Path
+from jinja2 import Template
 from barcode import Code128
 from lxml.etree import fromstring
 from barcode.writer import ImageWriter
 from PIL import Image, ImageDraw, ImageFont
-from karrio.core.utils import DP, request
+import karrio.addons.zpl as zpl
 
 FONTS_DIR = Path(__file__).resolve().parent / "fonts"
 LINE_SEPARATOR = """
 """
 
+_pool_lock = threading.Lock()
+_pools: typing.Dict[typing.Optional[int], futures.ProcessPoolExecutor] = {}
+
+
+@functools.lru_cache(maxsize=128)
+def load_font(family: str, weight: str, size: int) -> ImageFont.FreeTypeFont:
+    """Return a process wide shared truetype font."""
+    return ImageFont.truetype(f"{FONTS_DIR}/{family}-{weight}.ttf", size)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_style(style_text: str) -> typing.Dict[str, str]:
+    """Return the properties of an inline style (e.g. "font-size: 40; ...")."""
+    return dict(
+        [
+            [k.strip() for k in s.split(":")]
+            for s in (style_text or "").split(";")
+            if s != ""
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def render_barcode(value: str, width: int, height: int) -> Image.Image:
+    """Return a Code128 barcode raster fitted to the given box.
+
+    The raster is shared between labels and must not be modified.
+    """
+    barcode = Code128(value, writer=ImageWriter()).render(
+        writer_options=dict(
+            quiet_zone=1.0,
+            module_width=0.5,
+            module_height=30.0,
+            font_size=1,
+            text_distance=0.0,
+            dpi=300,
+        ),
+        text="",
+    )
+    barcode.thumbnail((width, height))
+
+    return barcode
+
+
+@functools.lru_cache(maxsize=64)
+def compile_template(template: str) -> Template:
+    """Return the compiled jinja template of a label template source."""
+    return Template(template)
+
 
 def generate_pdf_from_svg_label(content: str, **kwargs):
     template = fromstring(content)
     label = Image.new("L", (1200, 1800), "white")
     draw = ImageDraw.Draw(label)
 
-    font = lambda size=10, bold=False: ImageFont.truetype(
-        f"{FONTS_DIR}/Oswald-{'SemiBold' if bold else 'Regular'}.ttf", size
+    font = lambda size=10, bold=False: load_font(
+        "Oswald", "SemiBold" if bold else "Regular", size
     )
 
     for element in template:
@@ -30,31 +86,8 @@ def generate_pdf_from_svg_label(content: str, **kwargs):
             width = int(element.get("width") or 0)
             height = int(element.get("height") or 0)
             value = element.get("data-value")
-            style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
-            bold = "bold" in style_text
-            font_size = int(style.get("font-size", "40").replace("px", ""))
-
-            barcode = Code128(value, writer=ImageWriter()).render(
-                writer_options=dict(
-                    quiet_zone=1.0,
-                    module_width=0.5,
-                    module_height=30.0,
-                    font_size=1,
-                    text_distance=0.0,
-                    dpi=300,
-                ),
-                text="",
-            )
-            barcode.thumbnail((width, height))
 
-            label.paste(barcode, (x, y))
+            label.paste(render_barcode(value, width, height), (x, y))
 
         if "line" in tag:
             fill = element.get("fill")
@@ -72,13 +105,7 @@ def generate_pdf_from_svg_label(content: str, **kwargs):
             text = element.text or ""
             fill = element.get("fill")
             style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
+            style = parse_style(style_text)
             bold = "bold" in style_text
             font_size = int(style.get("font-size", "10").replace("px", ""))
 
@@ -113,13 +140,7 @@ def generate_zpl_from_svg_label(content: str, **kwargs) -> str:
             width_ratio = int(element.get("data-width-ratio") or 2)
             value = element.get("data-value")
             style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
+            style = parse_style(style_text)
             bold = "bold" in style_text
             font_size = int(style.get("font-size", "40").replace("px", ""))
 
@@ -151,13 +172,7 @@ def generate_zpl_from_svg_label(content: str, **kwargs) -> str:
             y = int(element.get("y") or 0)
             text = element.text
             style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
+            style = parse_style(style_text)
             bold = "bold" in style_text
             font_size = int(style.get("font-size", "10").replace("px", ""))
 
@@ -187,16 +202,7 @@ def render_label(label: str, label_type: str, template_type: str, **kwargs) -> s
 
     elif template_type == "ZPL" and label_type == "PDF":
         width, height = kwargs.get("width"), kwargs.get("height")
-        data = DP.jsonify(dict(file=label))
-        pdf = request(
-            url=f"http://api.labelary.com/v1/printers/12dpmm/labels/{width}x{height}/0/",
-            data=data,
-            headers={"Accept": "application/pdf"},
-            decoder=lambda b: base64.encodebytes(b).decode("utf-8"),
-        )
-
-        # return it as is because it's already a base64 string.
-        return pdf
+        result.write(zpl.to_pdf(label, width, height, dpmm=12))
 
     elif template_type == "SVG" and label_type == "ZPL":
         doc = generate_zpl_from_svg_label(label, **kwargs)
@@ -206,3 +212,66 @@ def render_label(label: str, label_type: str, template_type: str, **kwargs) -> s
         result.write(label.encode("utf-8"))
 
     return base64.b64encode(result.getvalue()).decode("utf-8")
+
+
+def render_labels(
+    template: str,
+    contexts: typing.List[dict],
+    label_type: str,
+    template_type: str,
+    max_workers: typing.Optional[int] = None,
+    **kwargs,
+) -> typing.List[str]:
+    """Render a label per context from one template in a process pool.
+
+    The pool is started on first use with the "spawn" start method (forking a
+    multi-threaded server process can deadlock) and reused by the next calls.
+    Each worker process compiles the template once and keeps its own font
+    and barcode caches. The contexts must be picklable.
+    """
+    render = functools.partial(
+        _render_template,
+        template,
+        label_type=label_type,
+        template_type=template_type,
+        **kwargs,
+    )
+
+    if len(contexts) <= 1 or max_workers == 1:
+        return [render(context) for context in contexts]
+
+    executor = get_process_pool(max_workers)
+
+    try:
+        return list(executor.map(render, contexts))
+    except futures.process.BrokenProcessPool:
+        with _pool_lock:
+            if _pools.get(max_workers) is executor:
+                _pools.pop(max_workers)
+        raise
+
+
+def get_process_pool(max_workers: int = None) -> futures.ProcessPoolExecutor:
+    """Return the long-lived "spawn" process pool of the given size."""
+    with _pool_lock:
+        if max_workers not in _pools:
+            _pools[max_workers] = futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return _pools[max_workers]
+
+
+def _render_template(template: str, context: dict, **kwargs) -> str:
+    return render_label(compile_template(template).render(**context), **kwargs)
+
+
+def _reset_pools_after_fork():
+    global _pool_lock
+    _pool_lock = threading.Lock()
+    _pools.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
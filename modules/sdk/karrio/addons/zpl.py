@@ -0,0 +1,659 @@
+"""Offline ZPL II label rendering.
+
+Interprets the ZPL commands commonly found on carrier labels (fields, fonts,
+field blocks, graphic boxes and fields, Code 128, Code 39 and QR barcodes)
+and rasterizes them with Pillow into PNG images or PDF documents.
+
+Positions are expressed in printer dots, so a label designed for a 203 dpi
+printer (8 dpmm) appears smaller when rendered at 300 dpi (12 dpmm), as it
+would on a 300 dpi printer.
+"""
+
+import io
+import re
+import zlib
+import base64
+import typing
+import string
+import logging
+import functools
+import attr
+import barcode
+from pathlib import Path
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+FONTS_DIR = Path(__file__).resolve().parent / "fonts"
+MM_PER_INCH = 25.4
+ORIENTATIONS = {
+    "N": None,
+    "R": Image.Transpose.ROTATE_270,
+    "I": Image.Transpose.ROTATE_180,
+    "B": Image.Transpose.ROTATE_90,
+}
+# (height, width) in dots of the printer resident bitmap fonts.
+BITMAP_FONTS = {
+    "A": (9, 5),
+    "B": (11, 7),
+    "C": (18, 10),
+    "D": (18, 10),
+    "E": (28, 15),
+    "F": (26, 13),
+    "G": (60, 40),
+    "H": (21, 13),
+    "P": (20, 18),
+    "Q": (28, 24),
+    "R": (35, 31),
+    "S": (40, 35),
+    "T": (48, 42),
+    "U": (59, 53),
+    "V": (80, 71),
+}
+# Code 128 invocation characters allowed in the ^FD of a ^BC field.
+CODE128_ESCAPES = {"<": "<", "0": ">", "=": "~"}
+INK = 255
+QR_ERROR_CORRECTIONS = {"L": 1, "M": 0, "Q": 3, "H": 2}
+
+
+@attr.s(auto_attribs=True)
+class Font:
+    name: str = "A"
+    height: int = 9
+    width: int = 5
+    orientation: str = "N"
+
+
+@attr.s(auto_attribs=True)
+class Block:
+    width: int = 0
+    lines: int = 1
+    spacing: int = 0
+    justify: str = "L"
+
+
+@attr.s(auto_attribs=True)
+class Field:
+    x: int = 0
+    y: int = 0
+    positioned: bool = False
+    typeset: bool = False
+    font: Font = None
+    block: Block = None
+    reverse: bool = False
+    hex_indicator: str = None
+    number: str = None
+    data: str = None
+    kind: str = "text"
+    params: typing.List[typing.Any] = attr.Factory(list)
+
+
+@attr.s(auto_attribs=True)
+class Label:
+    fields: typing.List[Field] = attr.Factory(list)
+    inverted: bool = False
+
+
+def parse(zpl: str) -> typing.Iterator[typing.Tuple[str, str]]:
+    """Split a ZPL document into (command, parameters) pairs."""
+    content = zpl.replace("\r", "").replace("\n", "")
+    index = next((i for i, char in enumerate(content) if char in "^~"), len(content))
+
+    while index < len(content):
+        prefix, name = content[index], content[index + 1 : index + 3].upper()
+        start = index + (2 if name[:1] == "A" else 3)
+        name = "A" if name[:1] == "A" else name
+
+        # field data runs up to the next caret whatever it contains.
+        stops = "^" if name in ("FD", "FV", "FX") else "^~"
+        end = next(
+            (i for i in range(start, len(content)) if content[i] in stops),
+            len(content),
+        )
+
+        yield prefix + name, content[start:end]
+        index = end
+
+
+def interpret(zpl: str) -> typing.List[Label]:
+    """Return the labels (^XA...^XZ) described by a ZPL document.
+
+    A trailing label missing its closing ^XZ is kept like a printer would.
+    """
+    labels: typing.List[Label] = []
+    label = Label()
+    opened = False
+    home = (0, 0)
+    default_font = Font()
+    orientation = "N"
+    module = dict(width=2, ratio=3.0, height=10)
+    reverse_all = False
+    field = Field()
+    fields: typing.Dict[str, Field] = {}
+
+    def values(params: str, count: int) -> typing.List[str]:
+        items = [_.strip() for _ in params.split(",")]
+        return (items + [""] * count)[:count]
+
+    def number(value: str, default: typing.Any = None) -> typing.Any:
+        try:
+            return int(float(value))
+        except ValueError:
+            return default
+
+    def font_size(name: str, height: int, width: int) -> typing.Tuple[int, int]:
+        base_height, base_width = BITMAP_FONTS.get(name, (0, 0))
+
+        if name not in BITMAP_FONTS:
+            return (height or width or 15, width or height or 15)
+        if height and not width:
+            return (height, round(base_width * height / base_height))
+        if width and not height:
+            return (round(base_height * width / base_width), width)
+
+        return (height or base_height, width or base_width)
+
+    for command, params in parse(zpl):
+        name = command[1:]
+
+        if name == "XA":
+            label = Label()
+            field = Field()
+            fields = {}
+            opened = True
+
+        elif name == "XZ":
+            labels.append(label)
+            opened = False
+
+        elif name == "LH":
+            x, y = values(params, 2)
+            home = (number(x, 0), number(y, 0))
+
+        elif name == "LR":
+            reverse_all = params.strip().upper() == "Y"
+
+        elif name == "PO":
+            label.inverted = params.strip().upper() == "I"
+
+        elif name == "FW":
+            orientation = (params.strip()[:1] or "N").upper()
+
+        elif name == "CF":
+            font, height, width = values(params, 3)
+            font = (font or default_font.name).upper()
+            height, width = font_size(font, number(height, 0), number(width, 0))
+            default_font = Font(font, height, width)
+
+        elif name == "A":
+            font, height, width = values(params, 3)
+            face, rotation = (font[:1] or "0").upper(), font[1:2].upper()
+            face = "0" if face == "@" else face
+            height, width = font_size(face, number(height, 0), number(width, 0))
+            field.font = Font(face, height, width, rotation or orientation)
+
+        elif name in ("FO", "FT"):
+            x, y = values(params, 2)
+            field.x = number(x, 0) + home[0]
+            field.y = number(y, 0) + home[1]
+            field.positioned = True
+            field.typeset = name == "FT"
+
+        elif name == "FB":
+            width, lines, spacing, justify = values(params, 4)
+            field.block = Block(
+                number(width, 0),
+                number(lines, 1),
+                number(spacing, 0),
+                (justify or "L").upper(),
+            )
+
+        elif name == "FR":
+            field.reverse = True
+
+        elif name == "FH":
+            field.hex_indicator = params[:1] or "_"
+
+        elif name == "FN":
+            field.number = params.strip()
+
+        elif name in ("FD", "FV"):
+            field.data = params
+
+        elif name == "BY":
+            width, ratio, height = values(params, 3)
+            module = dict(
+                width=number(width, module["width"]),
+                ratio=float(ratio or module["ratio"]),
+                height=number(height, module["height"]),
+            )
+
+        elif name in ("BC", "BQ"):
+            field.kind = name
+            field.params = [*values(params, 6), module]
+
+        elif name == "B3":
+            # reordered as the ^BC parameters: orientation, height, line, above, check.
+            rotation, check, height, line, above = values(params, 5)
+            field.kind = name
+            field.params = [rotation, height, line, above, check, "", module]
+
+        elif name in ("GB", "GC", "GF"):
+            field.kind = name
+            field.params = values(params, 5) if name != "GF" else params.split(",", 4)
+
+        elif name == "FS":
+            field.font = field.font or attr.evolve(
+                default_font, orientation=orientation
+            )
+            field.reverse = field.reverse or reverse_all
+            pending = fields.get(field.number) if field.number else None
+
+            # a ^FN field without origin fills the field it was declared by.
+            if pending is not None and field.data is not None and not field.positioned:
+                pending.data = field.data
+            else:
+                label.fields.append(field)
+                if field.number and field.data is None:
+                    fields[field.number] = field
+
+            field = Field()
+
+    if opened:
+        labels.append(label)
+
+    return labels
+
+
+def render(
+    zpl: str, width: float, height: float, dpmm: int = 8
+) -> typing.List[Image.Image]:
+    """Rasterize every label of a ZPL document.
+
+    :param zpl: the ZPL document.
+    :param width: the label width in inches.
+    :param height: the label height in inches.
+    :param dpmm: the printer density in dots per millimeter (8 = 203 dpi, 12 = 300 dpi).
+    :return: a black and white image per label (a blank page without label).
+    """
+    size = (int(width * dpmm * MM_PER_INCH), int(height * dpmm * MM_PER_INCH))
+    images = []
+    labels = interpret(zpl)
+
+    if len(labels) == 0:
+        logger.warning("no ^XA...^XZ label found in the ZPL document")
+        return [Image.new("1", size, INK)]
+
+    for label in labels:
+        # ink is drawn white on a black background and inverted once done.
+        canvas = Image.new("1", size, 0)
+
+        for field in label.fields:
+            drawn = _draw_field(field)
+
+            if drawn is not None:
+                layer, position, ink = drawn
+                _paste(canvas, layer, position, ink, field.reverse)
+
+        image = ImageChops.invert(canvas)
+        images.append(image.rotate(180) if label.inverted else image)
+
+    return images
+
+
+def to_png(zpl: str, width: float, height: float, dpmm: int = 8) -> bytes:
+    """Return a PNG of the labels of a ZPL document stacked vertically."""
+    images = render(zpl, width, height, dpmm=dpmm)
+    image = Image.new("1", (images[0].width, sum(_.height for _ in images)), INK)
+
+    for index, page in enumerate(images):
+        image.paste(page, (0, index * page.height))
+
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", dpi=(_dpi(dpmm), _dpi(dpmm)))
+
+    return buffer.getvalue()
+
+
+def to_pdf(zpl: str, width: float, height: float, dpmm: int = 8) -> bytes:
+    """Return a PDF with one page per label of a ZPL document."""
+    first, *others = render(zpl, width, height, dpmm=dpmm)
+    buffer = io.BytesIO()
+    first.save(
+        buffer,
+        "PDF",
+        resolution=dpmm * MM_PER_INCH,
+        save_all=True,
+        append_images=others,
+    )
+
+    return buffer.getvalue()
+
+
+def _dpi(dpmm: int) -> int:
+    return round(dpmm * MM_PER_INCH)
+
+
+def _paste(
+    canvas: Image.Image,
+    layer: Image.Image,
+    position: typing.Tuple[int, int],
+    ink: int,
+    reverse: bool,
+):
+    box = (*position, position[0] + layer.width, position[1] + layer.height)
+
+    if reverse:
+        region = canvas.crop(box)
+        canvas.paste(ImageChops.logical_xor(region, layer), box)
+    else:
+        canvas.paste(ink, box, layer)
+
+
+def _draw_field(field: Field):
+    draw = {
+        "text": _draw_text,
+        "BC": _draw_barcode,
+        "B3": _draw_barcode,
+        "BQ": _draw_qrcode,
+        "GB": _draw_box,
+        "GC": _draw_circle,
+        "GF": _draw_graphic,
+    }[field.kind]
+
+    try:
+        return draw(field)
+    except Exception as e:
+        logger.warning(f"skipping unsupported ZPL field {field.kind}: {e}")
+        return None
+
+
+def _field_data(field: Field) -> str:
+    data = field.data or ""
+
+    if field.hex_indicator:
+        indicator = re.escape(field.hex_indicator)
+        data = re.sub(
+            f"{indicator}([0-9A-Fa-f]{{2}})",
+            lambda match: chr(int(match.group(1), 16)),
+            data,
+        )
+
+    return data
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(name: str, height: int) -> typing.Tuple[ImageFont.FreeTypeFont, int]:
+    """Return a truetype font whose line height fits `height` dots and its ascent."""
+    file = "Oswald-SemiBold" if name == "0" else "Oswald-Regular"
+    font = ImageFont.truetype(f"{FONTS_DIR}/{file}.ttf", height)
+    ascent, descent = font.getmetrics()
+    size = max(1, round(height * height / (ascent + descent)))
+    font = ImageFont.truetype(f"{FONTS_DIR}/{file}.ttf", size)
+
+    return font, font.getmetrics()[0]
+
+
+def _text_line(text: str, font: Font) -> typing.Tuple[Image.Image, int]:
+    """Draw a line of text scaled to the font cell and return it with its baseline."""
+    face, ascent = _load_font(font.name, font.height)
+    width = max(1, round(face.getlength(text)))
+    image = Image.new("1", (width, font.height), 0)
+    ImageDraw.Draw(image).text((0, 0), text, fill=INK, font=face)
+
+    # the font cell is scaled horizontally to the requested character width.
+    scale = font.width / font.height if font.name == "0" else 1.0
+    if scale != 1.0 and text:
+        image = image.resize((max(1, round(width * scale)), font.height))
+
+    return image, ascent
+
+
+def _wrap(text: str, font: Font, width: int) -> typing.List[str]:
+    face, _ = _load_font(font.name, font.height)
+    scale = font.width / font.height if font.name == "0" else 1.0
+    measure = lambda line: face.getlength(line) * scale
+    lines = []
+
+    for paragraph in text.split("\\&"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and measure(candidate) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+
+    return lines
+
+
+def _draw_text(field: Field):
+    text = _field_data(field)
+    font = field.font
+
+    if not text:
+        return None
+
+    if field.block is None:
+        image, baseline = _text_line(text, font)
+    else:
+        block = field.block
+        lines = _wrap(text, font, block.width)[: max(block.lines, 1)]
+        line_height = font.height + block.spacing
+        image = Image.new("1", (max(block.width, 1), line_height * len(lines)), 0)
+
+        for index, line in enumerate(lines):
+            drawn, _ = _text_line(line, font)
+            offset = {
+                "C": (block.width - drawn.width) // 2,
+                "R": block.width - drawn.width,
+            }.get(block.justify, 0)
+            image.paste(drawn, (offset, index * line_height))
+
+        baseline = (
+            line_height * (len(lines) - 1) + _load_font(font.name, font.height)[1]
+        )
+
+    return _orient(image, field), _position(image, field, baseline), INK
+
+
+def _orient(image: Image.Image, field: Field) -> Image.Image:
+    transpose = ORIENTATIONS.get(field.font.orientation)
+    return image.transpose(transpose) if transpose is not None else image
+
+
+def _position(
+    image: Image.Image, field: Field, baseline: int
+) -> typing.Tuple[int, int]:
+    """Return the top left corner of a field given its origin."""
+    if not field.typeset:
+        return field.x, field.y
+
+    # ^FT positions the baseline (text) or the bottom (barcodes) of a field.
+    width, height = image.size
+    descent = height - baseline
+    return {
+        "R": (field.x - descent, field.y),
+        "I": (field.x - width, field.y - descent),
+        "B": (field.x - baseline, field.y - width),
+    }.get(field.font.orientation, (field.x, field.y - baseline))
+
+
+def _modules_image(modules: typing.List[str], module_width: int, height: int):
+    """Draw a row of bars, `1` modules being drawn as bars of the module width."""
+    row = modules[0]
+    image = Image.new("1", (len(row) * module_width, height), 0)
+    draw = ImageDraw.Draw(image)
+
+    for match in re.finditer("1+", row):
+        start, end = match.span()
+        draw.rectangle(
+            (start * module_width, 0, end * module_width - 1, height - 1), fill=INK
+        )
+
+    return image
+
+
+def _draw_barcode(field: Field):
+    rotation, height, line, above, check, mode, module = field.params
+    text = _field_data(field)
+
+    if field.kind == "B3":
+        symbol = barcode.get_barcode_class("code39")(
+            text, add_checksum=check.upper() == "Y"
+        )
+    elif mode.upper() == "D":
+        # UCC/EAN mode: application identifiers are printed in parentheses.
+        text = re.sub(">(.)", lambda match: CODE128_ESCAPES.get(match[1], ""), text)
+        symbol = barcode.get_barcode_class("gs1_128")(re.sub(r"[()\s]", "", text))
+    else:
+        text = re.sub(">(.)", lambda match: CODE128_ESCAPES.get(match[1], ""), text)
+        symbol = barcode.get_barcode_class("code128")(text)
+
+    bars = _modules_image(
+        symbol.build(), module["width"], int(height or module["height"])
+    )
+    image, baseline = bars, bars.height
+
+    if line.upper() != "N":
+        caption, _ = _text_line(
+            text, Font("0", module["width"] * 9, module["width"] * 9)
+        )
+        image = Image.new("1", (bars.width, bars.height + caption.height + 2), 0)
+        offset = (bars.width - caption.width) // 2
+
+        if above.upper() == "Y":
+            image.paste(caption, (offset, 0))
+            image.paste(bars, (0, caption.height + 2))
+            baseline = image.height
+        else:
+            image.paste(bars, (0, 0))
+            image.paste(caption, (offset, bars.height + 2))
+
+    if rotation:
+        field = attr.evolve(
+            field, font=attr.evolve(field.font, orientation=rotation.upper())
+        )
+
+    return _orient(image, field), _position(image, field, baseline), INK
+
+
+def _draw_qrcode(field: Field):
+    import qrcode
+
+    rotation, model, magnification, *_, module = field.params
+    data = _field_data(field)
+    correction = "Q"
+
+    # the field data is prefixed by the error correction and input mode: "QA,"
+    match = re.match("([HQML])([AM]),", data)
+    if match is not None:
+        correction, data = match.group(1), data[match.end() :]
+
+    symbol = qrcode.QRCode(
+        border=0,
+        box_size=1,
+        error_correction=QR_ERROR_CORRECTIONS[correction],
+    )
+    symbol.add_data(data)
+    matrix = symbol.get_matrix()
+    size = int(magnification or 2)
+    image = Image.new("1", (len(matrix) * size, len(matrix) * size), 0)
+    draw = ImageDraw.Draw(image)
+
+    for y, row in enumerate(matrix):
+        for x, dark in enumerate(row):
+            if dark:
+                draw.rectangle(
+                    (x * size, y * size, (x + 1) * size - 1, (y + 1) * size - 1),
+                    fill=INK,
+                )
+
+    return image, _position(image, field, image.height), INK
+
+
+def _color(value: str) -> int:
+    return 0 if value.upper() == "W" else INK
+
+
+def _draw_box(field: Field):
+    width, height, thickness, color, rounding = field.params
+    thickness = int(thickness or 1)
+    width = max(int(width or 0), thickness)
+    height = max(int(height or 0), thickness)
+    radius = int(rounding or 0) * min(width, height) // 16
+    image = Image.new("1", (width, height), 0)
+    ImageDraw.Draw(image).rounded_rectangle(
+        (0, 0, width - 1, height - 1),
+        radius=radius,
+        outline=INK,
+        fill=INK if thickness * 2 >= min(width, height) else None,
+        width=thickness,
+    )
+
+    return image, _position(image, field, height), _color(color)
+
+
+def _draw_circle(field: Field):
+    diameter, thickness, color, *_ = field.params
+    thickness = int(thickness or 1)
+    diameter = max(int(diameter or 3), thickness)
+    image = Image.new("1", (diameter, diameter), 0)
+    ImageDraw.Draw(image).ellipse(
+        (0, 0, diameter - 1, diameter - 1), outline=INK, width=thickness
+    )
+
+    return image, _position(image, field, diameter), _color(color)
+
+
+def _draw_graphic(field: Field):
+    encoding, total, _, row_bytes, data = (field.params + [""] * 5)[:5]
+    row_bytes = int(row_bytes)
+
+    if data.startswith((":Z64:", ":B64:")):
+        content = base64.b64decode(data[5:].split(":")[0])
+        content = zlib.decompress(content) if data.startswith(":Z64:") else content
+    elif encoding.upper() == "A":
+        content = bytes.fromhex("".join(_decompress_hex(data, row_bytes)))
+    else:
+        content = data.encode("latin-1")
+
+    rows = len(content) // row_bytes
+    image = Image.frombytes("1", (row_bytes * 8, rows), content[: rows * row_bytes])
+
+    return image, _position(image, field, rows), INK
+
+
+def _decompress_hex(data: str, row_bytes: int) -> typing.Iterator[str]:
+    """Expand the ZPL ASCII hex compression scheme into rows of hex digits.
+
+    G-Y and g-z repeat the next digit (1-19 and 20-400 times), `,` fills
+    the rest of the row with 0, `!` fills it with 1 and `:` repeats the
+    previous row.
+    """
+    width = row_bytes * 2
+    row, previous, count = "", "0" * width, 0
+
+    for char in data:
+        if "G" <= char <= "Y":
+            count += ord(char) - ord("F")
+        elif "g" <= char <= "z":
+            count += (ord(char) - ord("f")) * 20
+        elif char == ",":
+            row = row.ljust(width, "0")
+        elif char == "!":
+            row = row.ljust(width, "F")
+        elif char == ":" and not row:
+            row = previous
+        elif char in string.hexdigits:
+            row += char * (count or 1)
+            count = 0
+
+        if len(row) >= width:
+            previous, row = row[:width], row[width:]
+            yield previous
+
+    if row:
+        yield row.ljust(width, "0")
@@ -117,7 +117,7 @@ class GatewayInitializer:
         """
 
         try:
-            provider = self.providers[key]
+            provider = references.get_provider(key)
 
             def initializer(
                 settings: typing.Union[core.Settings, dict],
@@ -165,7 +165,11 @@ class GatewayInitializer:
 
     @property
     def providers(self):
-        return references.import_extensions()
+        return references.get_providers()
+
+    def refresh(self):
+        """Rescan the installed carrier mappers (e.g. after a plugin install)"""
+        return references.refresh_extensions()
 
     @staticmethod
     def get_instance() -> "GatewayInitializer":
@@ -2,6 +2,7 @@
 
 import attr
 import typing
+import asyncio
 import logging
 import functools
 import karrio.lib as lib
@@ -76,6 +77,56 @@ def fail_safe(gateway: gateway.Gateway):
     return catcher
 
 
+def fail_safe_async(gateway: gateway.Gateway):
+    """Decorate async operation calls to enrich any failure context
+
+    Args:
+        gateway (gateway.Gateway): The gateway in use
+
+    Returns:
+        Decorator
+    """
+
+    def catcher(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as error:
+                logger.exception(error)
+
+                return IDeserialize(
+                    functools.partial(abort, gateway=gateway, error=error)
+                )
+
+        return wrapper
+
+    return catcher
+
+
+def timeout_abort(gateway: gateway.Gateway, timeout: float) -> "IDeserialize":
+    """Return the timeout error messages of a gateway that missed its budget"""
+    return IDeserialize(
+        functools.partial(
+            abort, gateway=gateway, error=errors.RequestTimeoutError(timeout)
+        )
+    )
+
+
+def trace_stage(gateway: gateway.Gateway, operation: str, stage: str):
+    """Time an operation stage (create_request, proxy, parse_response) as a span
+    of the gateway tracer tagged with the carrier connection and operation.
+    """
+    return gateway.tracer.span(
+        stage,
+        operation=operation,
+        connection_id=gateway.settings.id,
+        test_mode=gateway.settings.test_mode,
+        carrier_id=gateway.settings.carrier_id,
+        carrier_name=gateway.settings.carrier_name,
+    )
+
+
 def check_operation(gateway: gateway.Gateway, request: str, **kwargs):
     errors = gateway.check(request, **kwargs)
 
@@ -106,6 +157,47 @@ def filter_rates(rates: typing.List[models.RateDetails], gateway: gateway.Gatewa
     ]
 
 
+def async_operation(
+    payload: typing.Any,
+    operation: str,
+    create_request: str,
+    parse_response: str,
+    **check_kwargs,
+) -> typing.Callable[[gateway.Gateway], typing.Awaitable["IDeserialize"]]:
+    """Create the asyncio action of a single gateway operation
+
+    Args:
+        payload: the unified request payload
+        operation (str): the proxy method name (e.g: "get_tracking")
+        create_request (str): the mapper request factory name
+        parse_response (str): the mapper response parser name
+
+    Returns:
+        Callable[[gateway.Gateway], Awaitable[IDeserialize]]: the async action
+    """
+
+    async def action(gateway: gateway.Gateway) -> IDeserialize:
+        is_valid, abortion = check_operation(gateway, operation, **check_kwargs)
+        if not is_valid:
+            return abortion
+
+        with trace_stage(gateway, operation, "create_request"):
+            request: lib.Serializable = getattr(gateway.mapper, create_request)(payload)
+        with trace_stage(gateway, operation, "proxy"):
+            response: lib.Deserializable = await lib.to_async(
+                getattr(gateway.proxy, operation), request
+            )
+
+        @fail_safe(gateway)
+        def deserialize():
+            with trace_stage(gateway, operation, "parse_response"):
+                return getattr(gateway.mapper, parse_response)(response)
+
+        return IDeserialize(deserialize)
+
+    return action
+
+
 @attr.s(auto_attribs=True)
 class IDeserialize:
     """A lazy deserializer type class"""
@@ -119,28 +211,94 @@ class IDeserialize:
             return result.parse()
         return result
 
+    async def parse_async(self):
+        """Execute the response deserialization on the running event loop"""
+        result = self.deserialize()
+        if asyncio.iscoroutine(result):
+            result = await result
+        if isinstance(result, IDeserialize):
+            return await result.parse_async()
+        return result
+
 
 @attr.s(auto_attribs=True)
 class IRequestFrom:
     """A lazy request (from) type class"""
 
     action: typing.Callable[[gateway.Gateway], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[[gateway.Gateway], typing.Awaitable[IDeserialize]]
+    ] = None
 
     def from_(self, gateway: gateway.Gateway) -> IDeserialize:
         """Execute the request action from the provided gateway"""
         return fail_safe(gateway)(self.action)(gateway)
 
+    async def from_async(self, gateway: gateway.Gateway) -> IDeserialize:
+        """Execute the request action from the provided gateway on the running event loop"""
+        if self.async_action is None:
+            return await asyncio.to_thread(self.from_, gateway)
+
+        return await fail_safe_async(gateway)(self.async_action)(gateway)
+
 
 @attr.s(auto_attribs=True)
 class IRequestFromMany:
     """A lazy request (from one or many) type class"""
 
     action: typing.Callable[[typing.List[gateway.Gateway]], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[[typing.List[gateway.Gateway]], typing.Awaitable[IDeserialize]]
+    ] = None
+    stream_action: typing.Optional[
+        typing.Callable[[typing.List[gateway.Gateway]], typing.Iterator[IDeserialize]]
+    ] = None
+    async_stream_action: typing.Optional[
+        typing.Callable[
+            [typing.List[gateway.Gateway]], typing.AsyncIterator[IDeserialize]
+        ]
+    ] = None
 
     def from_(self, *gateways: gateway.Gateway) -> IDeserialize:
         """Execute the request action(s) from the provided gateway(s)"""
         return self.action(list({_.settings.carrier_id: _ for _ in gateways}.values()))
 
+    async def from_async(self, *gateways: gateway.Gateway) -> IDeserialize:
+        """Execute the request action(s) from the provided gateway(s) on the running event loop"""
+        if self.async_action is None:
+            return await asyncio.to_thread(self.from_, *gateways)
+
+        return await self.async_action(
+            list({_.settings.carrier_id: _ for _ in gateways}.values())
+        )
+
+    def stream(self, *gateways: gateway.Gateway) -> typing.Iterator[IDeserialize]:
+        """Execute the request action(s) from the provided gateway(s) and yield
+        each gateway response as soon as it is received
+        """
+        if self.stream_action is None:
+            yield self.from_(*gateways)
+            return
+
+        yield from self.stream_action(
+            list({_.settings.carrier_id: _ for _ in gateways}.values())
+        )
+
+    async def stream_async(
+        self, *gateways: gateway.Gateway
+    ) -> typing.AsyncIterator[IDeserialize]:
+        """Execute the request action(s) from the provided gateway(s) on the running
+        event loop and yield each gateway response as soon as it is received
+        """
+        if self.async_stream_action is None:
+            yield await self.from_async(*gateways)
+            return
+
+        async for response in self.async_stream_action(
+            list({_.settings.carrier_id: _ for _ in gateways}.values())
+        ):
+            yield response
+
 
 class Address:
     """The unified Address API fluent interface"""
@@ -165,18 +323,31 @@ class Address:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = (
-                gateway.mapper.create_address_validation_request(payload)
-            )
-            response: lib.Deserializable = gateway.proxy.validate_address(request)
+            with trace_stage(gateway, "validate_address", "create_request"):
+                request: lib.Serializable = (
+                    gateway.mapper.create_address_validation_request(payload)
+                )
+            with trace_stage(gateway, "validate_address", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.validate_address(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_address_validation_response(response)
+                with trace_stage(gateway, "validate_address", "parse_response"):
+                    return gateway.mapper.parse_address_validation_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "validate_address",
+                "create_address_validation_request",
+                "parse_address_validation_response",
+            ),
+        )
 
 
 class Pickup:
@@ -200,16 +371,31 @@ class Pickup:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_pickup_request(payload)
-            response: lib.Deserializable = gateway.proxy.schedule_pickup(request)
+            with trace_stage(gateway, "schedule_pickup", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_pickup_request(
+                    payload
+                )
+            with trace_stage(gateway, "schedule_pickup", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.schedule_pickup(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_pickup_response(response)
+                with trace_stage(gateway, "schedule_pickup", "parse_response"):
+                    return gateway.mapper.parse_pickup_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "schedule_pickup",
+                "create_pickup_request",
+                "parse_pickup_response",
+            ),
+        )
 
     @staticmethod
     def cancel(args: typing.Union[models.PickupCancelRequest, dict]) -> IRequestFrom:
@@ -229,18 +415,31 @@ class Pickup:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_cancel_pickup_request(
-                payload
-            )
-            response: lib.Deserializable = gateway.proxy.cancel_pickup(request)
+            with trace_stage(gateway, "cancel_pickup", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_cancel_pickup_request(
+                    payload
+                )
+            with trace_stage(gateway, "cancel_pickup", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.cancel_pickup(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_cancel_pickup_response(response)
+                with trace_stage(gateway, "cancel_pickup", "parse_response"):
+                    return gateway.mapper.parse_cancel_pickup_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "cancel_pickup",
+                "create_cancel_pickup_request",
+                "parse_cancel_pickup_response",
+            ),
+        )
 
     @staticmethod
     def update(args: typing.Union[models.PickupUpdateRequest, dict]):
@@ -260,29 +459,51 @@ class Pickup:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_pickup_update_request(
-                payload
-            )
-            response: lib.Deserializable = gateway.proxy.modify_pickup(request)
+            with trace_stage(gateway, "modify_pickup", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_pickup_update_request(
+                    payload
+                )
+            with trace_stage(gateway, "modify_pickup", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.modify_pickup(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_pickup_update_response(response)
+                with trace_stage(gateway, "modify_pickup", "parse_response"):
+                    return gateway.mapper.parse_pickup_update_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "modify_pickup",
+                "create_pickup_update_request",
+                "parse_pickup_update_response",
+            ),
+        )
 
 
 class Rating:
     """The unified Rating API fluent interface"""
 
     @staticmethod
-    def fetch(args: typing.Union[models.RateRequest, dict]) -> IRequestFromMany:
+    def fetch(
+        args: typing.Union[models.RateRequest, dict],
+        deadline: float = None,
+        carrier_timeout: typing.Union[float, typing.Dict[str, float]] = None,
+    ) -> IRequestFromMany:
         """Fetch shipment rates from one or many carriers
 
         Args:
             args (Union[TrackingRequest, dict]): the rate fetching request payload
+            deadline (float, optional): the global time budget in seconds.
+            carrier_timeout (Union[float, Dict[str, float]], optional): the time
+                budget in seconds of each carrier (or per carrier_id).
+                Carriers missing their budget are reported as timeout messages
+                while the rates received in time are returned.
 
         Returns:
             IRequestFromMany: a lazy request dataclass instance
@@ -290,29 +511,43 @@ class Rating:
         logger.debug(f"fetch shipment rates. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.RateRequest, lib.to_dict(args))
 
-        def action(gateways: typing.List[gateway.Gateway]):
-            def process(gateway: gateway.Gateway):
-                is_valid, abortion = check_operation(
-                    gateway,
-                    "get_rates",
-                    origin_country_code=payload.shipper.country_code,
-                )
-                if not is_valid:
-                    return abortion
+        def budget(gateway: gateway.Gateway) -> typing.Optional[float]:
+            timeout = (
+                carrier_timeout.get(gateway.settings.carrier_id)
+                if isinstance(carrier_timeout, dict)
+                else carrier_timeout
+            )
+            timeouts = [_ for _ in (deadline, timeout) if _ is not None]
+
+            return min(timeouts) if timeouts else None
+
+        def process(gateway: gateway.Gateway):
+            is_valid, abortion = check_operation(
+                gateway,
+                "get_rates",
+                origin_country_code=payload.shipper.country_code,
+            )
+            if not is_valid:
+                return abortion
 
+            with trace_stage(gateway, "get_rates", "create_request"):
                 request: lib.Serializable = gateway.mapper.create_rate_request(payload)
-                response: lib.Deserializable = gateway.proxy.get_rates(request)
+            with trace_stage(gateway, "get_rates", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.get_rates(request)
+                )
 
-                @fail_safe(gateway)
-                def deserialize():
+            @fail_safe(gateway)
+            def deserialize():
+                with trace_stage(gateway, "get_rates", "parse_response"):
                     return gateway.mapper.parse_rate_response(response)
 
-                return IDeserialize(deserialize)
-
-            deserializable_collection: typing.List[IDeserialize] = (
-                lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
-            )
+            return IDeserialize(deserialize)
 
+        def collect(
+            deserializable_collection: typing.List[IDeserialize],
+            gateways: typing.List[gateway.Gateway],
+        ) -> IDeserialize:
             def flatten(*args):
                 responses = [p.parse() for p in deserializable_collection]
                 flattened_rates = sum(
@@ -343,7 +578,81 @@ class Rating:
 
             return IDeserialize(flatten)
 
-        return IRequestFromMany(action)
+        def action(gateways: typing.List[gateway.Gateway]):
+            if deadline is None and carrier_timeout is None:
+                deserializable_collection: typing.List[IDeserialize] = (
+                    lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
+                )
+                return collect(deserializable_collection, gateways)
+
+            timeouts = [budget(g) for g in gateways]
+            results = lib.run_with_timeout(
+                lambda g: fail_safe(g)(process)(g), gateways, timeouts
+            )
+            deserializable_collection = [
+                (
+                    timeout_abort(g, timeout)
+                    if isinstance(result, TimeoutError)
+                    else result
+                )
+                for g, timeout, result in zip(gateways, timeouts, results)
+            ]
+
+            return collect(deserializable_collection, gateways)
+
+        def stream_action(gateways: typing.List[gateway.Gateway]):
+            timeouts = [budget(g) for g in gateways]
+
+            for index, result in lib.run_as_completed(
+                lambda g: fail_safe(g)(process)(g), gateways, timeouts
+            ):
+                g = gateways[index]
+                yield collect(
+                    [
+                        (
+                            timeout_abort(g, timeouts[index])
+                            if isinstance(result, TimeoutError)
+                            else result
+                        )
+                    ],
+                    [g],
+                )
+
+        async def process_async(g: gateway.Gateway):
+            timeout = budget(g)
+            operation = async_operation(
+                payload,
+                "get_rates",
+                "create_rate_request",
+                "parse_rate_response",
+                origin_country_code=payload.shipper.country_code,
+            )
+
+            try:
+                return g, await asyncio.wait_for(
+                    fail_safe_async(g)(operation)(g), timeout
+                )
+            except asyncio.TimeoutError:
+                return g, timeout_abort(g, timeout)
+
+        async def async_action(gateways: typing.List[gateway.Gateway]):
+            deserializable_collection: typing.List[IDeserialize] = [
+                deserializable
+                for _, deserializable in await asyncio.gather(
+                    *[process_async(g) for g in gateways]
+                )
+            ]
+
+            return collect(deserializable_collection, gateways)
+
+        async def async_stream_action(gateways: typing.List[gateway.Gateway]):
+            for response in asyncio.as_completed([process_async(g) for g in gateways]):
+                g, deserializable = await response
+                yield collect([deserializable], [g])
+
+        return IRequestFromMany(
+            action, async_action, stream_action, async_stream_action
+        )
 
 
 class Shipment:
@@ -372,16 +681,32 @@ class Shipment:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_shipment_request(payload)
-            response: lib.Deserializable = gateway.proxy.create_shipment(request)
+            with trace_stage(gateway, "create_shipment", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_shipment_request(
+                    payload
+                )
+            with trace_stage(gateway, "create_shipment", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.create_shipment(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_shipment_response(response)
+                with trace_stage(gateway, "create_shipment", "parse_response"):
+                    return gateway.mapper.parse_shipment_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "create_shipment",
+                "create_shipment_request",
+                "parse_shipment_response",
+                origin_country_code=payload.shipper.country_code,
+            ),
+        )
 
     @staticmethod
     def cancel(args: typing.Union[models.ShipmentCancelRequest, dict]) -> IRequestFrom:
@@ -401,18 +726,31 @@ class Shipment:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_cancel_shipment_request(
-                payload
-            )
-            response: lib.Deserializable = gateway.proxy.cancel_shipment(request)
+            with trace_stage(gateway, "cancel_shipment", "create_request"):
+                request: lib.Serializable = (
+                    gateway.mapper.create_cancel_shipment_request(payload)
+                )
+            with trace_stage(gateway, "cancel_shipment", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.cancel_shipment(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_cancel_shipment_response(response)
+                with trace_stage(gateway, "cancel_shipment", "parse_response"):
+                    return gateway.mapper.parse_cancel_shipment_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "cancel_shipment",
+                "create_cancel_shipment_request",
+                "parse_cancel_shipment_response",
+            ),
+        )
 
 
 class Tracking:
@@ -436,16 +774,31 @@ class Tracking:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_tracking_request(payload)
-            response: lib.Deserializable = gateway.proxy.get_tracking(request)
+            with trace_stage(gateway, "get_tracking", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_tracking_request(
+                    payload
+                )
+            with trace_stage(gateway, "get_tracking", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.get_tracking(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_tracking_response(response)
+                with trace_stage(gateway, "get_tracking", "parse_response"):
+                    return gateway.mapper.parse_tracking_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "get_tracking",
+                "create_tracking_request",
+                "parse_tracking_response",
+            ),
+        )
 
 
 class Document:
@@ -473,18 +826,31 @@ class Document:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_document_upload_request(
-                payload
-            )
-            response: lib.Deserializable = gateway.proxy.upload_document(request)
+            with trace_stage(gateway, "upload_document", "create_request"):
+                request: lib.Serializable = (
+                    gateway.mapper.create_document_upload_request(payload)
+                )
+            with trace_stage(gateway, "upload_document", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.upload_document(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_document_upload_response(response)
+                with trace_stage(gateway, "upload_document", "parse_response"):
+                    return gateway.mapper.parse_document_upload_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "upload_document",
+                "create_document_upload_request",
+                "parse_document_upload_response",
+            ),
+        )
 
 
 class Manifest:
@@ -512,13 +878,28 @@ class Manifest:
             if not is_valid:
                 return abortion
 
-            request: lib.Serializable = gateway.mapper.create_manifest_request(payload)
-            response: lib.Deserializable = gateway.proxy.create_manifest(request)
+            with trace_stage(gateway, "create_manifest", "create_request"):
+                request: lib.Serializable = gateway.mapper.create_manifest_request(
+                    payload
+                )
+            with trace_stage(gateway, "create_manifest", "proxy"):
+                response: lib.Deserializable = lib.run_sync(
+                    gateway.proxy.create_manifest(request)
+                )
 
             @fail_safe(gateway)
             def deserialize():
-                return gateway.mapper.parse_manifest_response(response)
+                with trace_stage(gateway, "create_manifest", "parse_response"):
+                    return gateway.mapper.parse_manifest_response(response)
 
             return IDeserialize(deserialize)
 
-        return IRequestFrom(action)
+        return IRequestFrom(
+            action,
+            async_operation(
+                payload,
+                "create_manifest",
+                "create_manifest_request",
+                "parse_manifest_response",
+            ),
+        )
@@ -189,3 +189,73 @@ class Proxy(abc.ABC):
         raise errors.MethodNotSupportedError(
             self.__class__.create_manifest.__name__, self.settings.carrier_name
         )
+
+
+class AsyncProxy(Proxy):
+    """Unified Shipping API asyncio Proxy (Interface)
+
+    Carrier integrations extending this class implement their operations as
+    coroutines (e.g: `async def get_rates(self, request)`) using `lib.request_async`.
+    The fluent API awaits them natively with `from_async(...)` and runs them to
+    completion with `from_(...)`.
+    """
+
+    async def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.get_rates`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.get_rates.__name__, self.settings.carrier_name
+        )
+
+    async def get_tracking(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.get_tracking`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.get_tracking.__name__, self.settings.carrier_name
+        )
+
+    async def create_shipment(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.create_shipment`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.create_shipment.__name__, self.settings.carrier_name
+        )
+
+    async def cancel_shipment(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.cancel_shipment`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.cancel_shipment.__name__, self.settings.carrier_name
+        )
+
+    async def schedule_pickup(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.schedule_pickup`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.schedule_pickup.__name__, self.settings.carrier_name
+        )
+
+    async def modify_pickup(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.modify_pickup`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.modify_pickup.__name__, self.settings.carrier_name
+        )
+
+    async def cancel_pickup(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.cancel_pickup`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.cancel_pickup.__name__, self.settings.carrier_name
+        )
+
+    async def validate_address(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.validate_address`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.validate_address.__name__, self.settings.carrier_name
+        )
+
+    async def upload_document(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.upload_document`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.upload_document.__name__, self.settings.carrier_name
+        )
+
+    async def create_manifest(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `Proxy.create_manifest`"""
+        raise errors.MethodNotSupportedError(
+            self.__class__.create_manifest.__name__, self.settings.carrier_name
+        )
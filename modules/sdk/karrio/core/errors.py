@@ -84,3 +84,13 @@ class MultiParcelNotSupportedError(ShippingSDKError):
 
     def __init__(self):
         super().__init__(f"Multi-parcel shipment not supported")
+
+
+class RequestTimeoutError(ShippingSDKError):
+    """Raised when a carrier did not respond within the allowed time."""
+
+    code = "SHIPPING_SDK_TIMEOUT_ERROR"
+
+    def __init__(self, timeout: float):
+        super().__init__(f"The carrier did not respond within {timeout:g} seconds")
+        self.timeout = timeout
@@ -151,6 +151,27 @@ class UploadDocumentType(utils.StrEnum):
     other = "other"
 
 
+def cached_unit(compute: typing.Callable) -> property:
+    """A derived property computed once and kept in the instance `_cache`.
+
+    The measurement units (Weight, Dimension, Volume, Girth) are immutable
+    slotted value objects: their derived values are computed on first access
+    and reused for the lifetime of the object. Package and Packages drop
+    their cached values when their inputs are reassigned.
+    """
+    name = compute.__name__
+
+    def getter(self):
+        cache = self._cache
+        if name not in cache:
+            cache[name] = compute(self)
+        return cache[name]
+
+    getter.__name__ = name
+    getter.__doc__ = compute.__doc__
+    return property(getter)
+
+
 class MeasurementOptionsType(typing.NamedTuple):
     quant: typing.Optional[float] = None
 
@@ -206,6 +227,8 @@ class CarrierCapabilities(utils.Enum):
 class Dimension:
     """The dimension common processing helper"""
 
+    __slots__ = ("_value", "_unit", "_min_in", "_min_cm", "_quant", "_cache")
+
     def __init__(
         self,
         value: float,
@@ -219,6 +242,7 @@ class Dimension:
         self._min_in = options.min_in
         self._min_cm = options.min_cm
         self._quant = options.quant
+        self._cache: dict = {}
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -229,21 +253,21 @@ class Dimension:
             value=(min_value if below_min else value), quant=self._quant
         )
 
-    @property
+    @cached_unit
     def unit(self) -> str:
         if self._unit is None:
             return None
 
         return self._unit.value
 
-    @property
+    @cached_unit
     def value(self):
         if self._unit is None or self._value is None:
             return None
 
         return self.__getattribute__(str(self._unit.name))
 
-    @property
+    @cached_unit
     def CM(self):
         if self._unit is None or self._value is None:
             return None
@@ -252,7 +276,7 @@ class Dimension:
         else:
             return self._compute(self._value, self._min_cm)
 
-    @property
+    @cached_unit
     def IN(self):
         if self._unit is None or self._value is None:
             return None
@@ -261,14 +285,14 @@ class Dimension:
         else:
             return self._compute(self._value, self._min_in)
 
-    @property
+    @cached_unit
     def M(self):
         if self._unit is None or self._value is None:
             return None
         else:
             return self._compute(self.CM / 100)
 
-    @property
+    @cached_unit
     def MM(self):
         if self._unit is None or self._value is None:
             return None
@@ -276,12 +300,29 @@ class Dimension:
             return self._compute(self.CM * 10)
 
     def map(self, options: MeasurementOptionsType):
-        return Dimension(value=self._value, unit=self._unit, options=options)
+        key = ("map", options)
+        if key not in self._cache:
+            self._cache[key] = Dimension(
+                value=self._value, unit=self._unit, options=options
+            )
+
+        return self._cache[key]
 
 
 class Volume:
     """The volume common processing helper"""
 
+    __slots__ = (
+        "_side1",
+        "_side2",
+        "_side3",
+        "_value",
+        "_unit",
+        "_quant",
+        "_min_volume",
+        "_cache",
+    )
+
     def __init__(
         self,
         side1: Dimension = None,
@@ -300,6 +341,7 @@ class Volume:
 
         self._quant = 0.01
         self._min_volume = options.min_volume
+        self._cache: dict = {}
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -311,14 +353,14 @@ class Volume:
             quant=self._quant,
         )
 
-    @property
+    @cached_unit
     def unit(self) -> str:
         if self._unit is None:
             return None
 
         return self._unit.value
 
-    @property
+    @cached_unit
     def value(self):
         missing_side_value = not all(
             [
@@ -337,7 +379,7 @@ class Volume:
 
         return self._compute(self._side1.value * self._side2.value * self._side3.value)
 
-    @property
+    @cached_unit
     def l(self):
         if self.value is None:
             return None
@@ -352,7 +394,7 @@ class Volume:
         else:
             return self.value
 
-    @property
+    @cached_unit
     def m3(self):
         if self.value is None:
             return None
@@ -367,7 +409,7 @@ class Volume:
         else:
             return self.value
 
-    @property
+    @cached_unit
     def i3(self):
         if self.value is None:
             return None
@@ -382,7 +424,7 @@ class Volume:
         else:
             return self.value
 
-    @property
+    @cached_unit
     def ft3(self):
         if self.value is None:
             return None
@@ -397,7 +439,7 @@ class Volume:
         else:
             return self.value
 
-    @property
+    @cached_unit
     def cm3(self):
         if self.value is None:
             return None
@@ -430,14 +472,17 @@ class Volume:
 class Girth:
     """The girth common processing helper"""
 
+    __slots__ = ("_side1", "_side2", "_side3", "_cache")
+
     def __init__(
         self, side1: Dimension = None, side2: Dimension = None, side3: Dimension = None
     ):
         self._side1 = side1
         self._side2 = side2
         self._side3 = side3
+        self._cache: dict = {}
 
-    @property
+    @cached_unit
     def value(self):
         sides = [self._side1.CM, self._side2.CM, self._side3.CM]
         if not any(sides):
@@ -451,6 +496,17 @@ class Girth:
 class Weight:
     """The weight common processing helper"""
 
+    __slots__ = (
+        "_value",
+        "_unit",
+        "_min_lb",
+        "_min_kg",
+        "_min_oz",
+        "_min_g",
+        "_quant",
+        "_cache",
+    )
+
     def __init__(
         self,
         value: float,
@@ -466,6 +522,7 @@ class Weight:
         self._min_oz = options.min_oz
         self._min_g = options.min_g
         self._quant = options.quant
+        self._cache: dict = {}
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -476,21 +533,21 @@ class Weight:
             value=(min_value if below_min else value), quant=self._quant
         )
 
-    @property
+    @cached_unit
     def unit(self) -> str:
         if self._unit is None:
             return None
 
         return self._unit.value
 
-    @property
+    @cached_unit
     def value(self) -> typing.Optional[float]:
         if self._unit is None or self._value is None:
             return None
 
         return self.__getattribute__(str(self._unit.name))
 
-    @property
+    @cached_unit
     def KG(self) -> typing.Optional[float]:
         if self._unit is None or self._value is None:
             return None
@@ -505,7 +562,7 @@ class Weight:
 
         return None
 
-    @property
+    @cached_unit
     def LB(self) -> typing.Optional[float]:
         if self._unit is None or self._value is None:
             return None
@@ -520,7 +577,7 @@ class Weight:
 
         return None
 
-    @property
+    @cached_unit
     def OZ(self) -> typing.Optional[float]:
         if self._unit is None or self._value is None:
             return None
@@ -535,7 +592,7 @@ class Weight:
 
         return None
 
-    @property
+    @cached_unit
     def G(self) -> typing.Optional[float]:
         if self._unit is None or self._value is None:
             return None
@@ -551,7 +608,13 @@ class Weight:
         return None
 
     def map(self, options: MeasurementOptionsType):
-        return Weight(value=self._value, unit=self._unit, options=options)
+        key = ("map", options)
+        if key not in self._cache:
+            self._cache[key] = Weight(
+                value=self._value, unit=self._unit, options=options
+            )
+
+        return self._cache[key]
 
 
 class Product(models.Commodity):
@@ -651,7 +714,11 @@ class Products(typing.Iterable[Product]):
 
 
 class Package:
-    """The parcel common processing helper"""
+    """The parcel common processing helper
+
+    The derived values (weight, dimensions, items...) are cached: assigning
+    a new `parcel` or `preset` drops them (the parcel itself is not watched).
+    """
 
     def __init__(
         self,
@@ -663,8 +730,10 @@ class Package:
         dimension_unit: str = None,
         shipping_options_initializer: typing.Callable = None,
     ):
-        self.parcel: models.Parcel = parcel
-        self.preset: PackagePreset = template or PackagePreset()
+        self._cache: dict = {}
+        self._version = 0
+        self._parcel: models.Parcel = parcel
+        self._preset: PackagePreset = template or PackagePreset()
 
         _options = {**parcel.options, **getattr(options, "content", {})}
         self._options: "ShippingOptions" = (
@@ -679,6 +748,26 @@ class Package:
             weight_unit or self.parcel.weight_unit or self.preset.weight_unit
         )
 
+    @property
+    def parcel(self) -> models.Parcel:
+        return self._parcel
+
+    @parcel.setter
+    def parcel(self, parcel: models.Parcel):
+        self._parcel = parcel
+        self._cache.clear()
+        self._version += 1
+
+    @property
+    def preset(self) -> PackagePreset:
+        return self._preset
+
+    @preset.setter
+    def preset(self, preset: PackagePreset):
+        self._preset = preset
+        self._cache.clear()
+        self._version += 1
+
     def _compute_dimension(self, value):
         _dimension_unit = (
             self.parcel.dimension_unit or self._dimension_unit
@@ -701,14 +790,14 @@ class Package:
 
         return Weight(_weight[self.weight_unit.value], self.weight_unit)
 
-    @property
+    @cached_unit
     def dimension_unit(self) -> DimensionUnit:
         if self.weight_unit == WeightUnit.KG:
             return DimensionUnit.CM
 
         return DimensionUnit.IN
 
-    @property
+    @cached_unit
     def weight_unit(self) -> WeightUnit:
         return WeightUnit[self._weight_unit]
 
@@ -716,37 +805,37 @@ class Package:
     def packaging_type(self):
         return self.parcel.packaging_type or self.preset.packaging_type
 
-    @property
+    @cached_unit
     def weight(self) -> Weight:
         return self._compute_weight(self.parcel.weight or self.preset.weight)
 
-    @property
+    @cached_unit
     def width(self) -> Dimension:
         return self._compute_dimension(self.preset.width or self.parcel.width)
 
-    @property
+    @cached_unit
     def height(self) -> Dimension:
         return self._compute_dimension(self.preset.height or self.parcel.height)
 
-    @property
+    @cached_unit
     def length(self) -> Dimension:
         return self._compute_dimension(self.preset.length or self.parcel.length)
 
-    @property
+    @cached_unit
     def girth(self) -> Girth:
         return Girth(self.width, self.length, self.height)
 
-    @property
+    @cached_unit
     def volume(self) -> Volume:
         return Volume(
             self.width, self.length, self.height, unit=self.dimension_unit.value
         )
 
-    @property
+    @cached_unit
     def thickness(self) -> Dimension:
         return self._compute_dimension(self.preset.thickness)
 
-    @property
+    @cached_unit
     def description(self) -> typing.Optional[str]:
         if any(self.parcel.description or ""):
             return self.parcel.description
@@ -758,7 +847,7 @@ class Package:
 
         return description
 
-    @property
+    @cached_unit
     def has_dimensions(self) -> bool:
         return any(
             [
@@ -772,13 +861,13 @@ class Package:
     def options(self) -> "ShippingOptions":
         return self._options
 
-    @property
+    @cached_unit
     def items(self) -> Products:
         _items = self.parcel.items or []
 
         return Products(_items, self.weight_unit.value)
 
-    @property
+    @cached_unit
     def total_value(self) -> typing.Optional[float]:
         if not any(self.parcel.items or []):
             return None
@@ -803,6 +892,8 @@ class Packages(typing.Iterable[Package]):
         package_option_type: typing.Type[utils.Enum] = utils.Enum,
         shipping_options_initializer: typing.Callable = None,
     ):
+        self._values: dict = {}
+        self._versions: tuple = ()
         self._compatible_units = self._compute_compatible_units(parcels, presets)
         self._options = options or ShippingOptions({}, package_option_type)
         self._items = [
@@ -830,6 +921,16 @@ class Packages(typing.Iterable[Package]):
     def __len__(self) -> int:
         return len(self._items)
 
+    @property
+    def _cache(self) -> dict:
+        """The derived values, dropped when a package parcel is reassigned."""
+        versions = tuple(pkg._version for pkg in self._items)
+        if versions != self._versions:
+            self._values.clear()
+            self._versions = versions
+
+        return self._values
+
     def __iter__(self) -> typing.Iterator[Package]:
         return iter(self._items)
 
@@ -866,7 +967,7 @@ class Packages(typing.Iterable[Package]):
 
         return presets[parcel.package_preset].value
 
-    @property
+    @cached_unit
     def weight(self) -> Weight:
         unit, _ = self.compatible_units
         value = sum(
@@ -880,7 +981,7 @@ class Packages(typing.Iterable[Package]):
 
         return Weight(unit=unit, value=value)
 
-    @property
+    @cached_unit
     def volume(self) -> Volume:
         if not any([pkg.volume.value for pkg in self._items]):
             return Volume(value=None)
@@ -898,7 +999,7 @@ class Packages(typing.Iterable[Package]):
 
         return Volume(value=_total_volume, unit=_volume_unit)
 
-    @property
+    @cached_unit
     def package_type(self) -> str:
         return (
             (self._items[0].packaging_type or "your_packaging")
@@ -906,11 +1007,11 @@ class Packages(typing.Iterable[Package]):
             else None
         )
 
-    @property
+    @cached_unit
     def is_document(self) -> bool:
         return all([pkg.parcel.is_document for pkg in self._items])
 
-    @property
+    @cached_unit
     def description(self) -> typing.Optional[str]:
         descriptions = set([item.description for item in self._items])
         description: typing.Optional[str] = utils.SF.concat_str(
@@ -919,7 +1020,7 @@ class Packages(typing.Iterable[Package]):
 
         return description
 
-    @property
+    @cached_unit
     def content(self) -> typing.Optional[str]:
         contents = set([item.parcel.content for item in self._items])
         content: typing.Optional[str] = utils.SF.concat_str(
@@ -928,7 +1029,7 @@ class Packages(typing.Iterable[Package]):
 
         return content
 
-    @property
+    @cached_unit
     def options(self) -> "ShippingOptions":
         def merge_options(acc, pkg) -> dict:
             """Merge package options into one
@@ -971,7 +1072,7 @@ class Packages(typing.Iterable[Package]):
         _weight_unit, _ = self._compatible_units
         return _weight_unit.value
 
-    @property
+    @cached_unit
     def items(self) -> Products:
         _weight_unit, _ = self.compatible_units
         _items: typing.List[models.Commodity] = functools.reduce(
@@ -982,7 +1083,7 @@ class Packages(typing.Iterable[Package]):
 
         return Products(_items, _weight_unit.value)
 
-    @property
+    @cached_unit
     def total_value(self) -> typing.Optional[float]:
         if not any([_.total_value for _ in self._items]):
             return None
@@ -1046,6 +1147,42 @@ class Packages(typing.Iterable[Package]):
         )
 
 
+def option_table(
+    option_type: typing.Optional[typing.Type[utils.Enum]],
+    base_option_type: typing.Type[utils.Enum] = utils.Enum,
+) -> typing.Dict[str, typing.Tuple[str, utils.OptionEnum]]:
+    """Return the option resolution table of a connector option enum.
+
+    The table maps every supported option key to the resolved option name and
+    its OptionEnum definition. The connector options take precedence over the
+    base (universal) options. It is compiled once per option enum pair and
+    kept on the option enum class.
+    """
+    owner: typing.Any = option_type if option_type is not None else base_option_type
+    tables = owner.__dict__.get("_option_tables_")
+
+    if tables is None:
+        tables = {}
+        setattr(owner, "_option_tables_", tables)
+
+    pair = (option_type, base_option_type)
+    if pair not in tables:
+        table = {
+            key: (key, option.value)
+            for key, option in base_option_type.__members__.items()
+            if key
+        }
+        table.update(
+            {
+                key: (option.name, option.value)
+                for key, option in getattr(option_type, "__members__", {}).items()
+            }
+        )
+        tables[pair] = table
+
+    return tables[pair]
+
+
 class Options:
     """The options common processing helper"""
 
@@ -1057,16 +1194,14 @@ class Options:
         base_option_type: typing.Type[utils.Enum] = utils.Enum,
     ):
         option_values: typing.Dict[str, utils.OptionEnum] = {}
+        table = option_table(option_type, base_option_type)
 
         for key, val in options.items():
-            if option_type is not None and key in option_type:
-                _val = option_type[key].value(val)
-                _key = option_type[key].name
-                option_values[_key] = _val
-            elif key in base_option_type and key:
-                _val = base_option_type[key].value(val)
-                _key = key
-                option_values[key] = _val
+            entry = table.get(key) if isinstance(key, str) else None
+
+            if entry is not None:
+                _key, _option = entry
+                option_values[_key] = _option(val)
 
         self._raw_options = options
         self._options = option_values
@@ -8,6 +8,36 @@ from karrio.core.utils.xml import XMLPARSER as XP, Element
 from karrio.core.utils.serializable import Serializable, Deserializable
 from karrio.core.utils.pipeline import Pipeline, Job
 from karrio.core.utils.enum import Enum, Flag, StrEnum, OptionEnum, svcEnum
-from karrio.core.utils.tracing import Tracer, Record, Trace
+from karrio.core.utils.tracing import (
+    Tracer,
+    Record,
+    Trace,
+    Span,
+    SpanExporter,
+    InMemoryExporter,
+    LoggingExporter,
+    OpenTelemetryExporter,
+    add_exporter,
+    remove_exporter,
+)
 from karrio.core.utils.transformer import to_multi_piece_rates, to_multi_piece_shipment
 from karrio.core.utils.caching import Cache
+from karrio.core.utils.executor import (
+    BackgroundExecutor,
+    get_executor,
+    set_executor,
+    get_network_executor,
+    set_network_executor,
+)
+from karrio.core.utils.transport import (
+    Transport,
+    UrllibTransport,
+    PooledTransport,
+    AsyncTransport,
+    AsyncPooledTransport,
+    ThreadedAsyncTransport,
+    get_transport,
+    set_transport,
+    get_async_transport,
+    set_async_transport,
+)
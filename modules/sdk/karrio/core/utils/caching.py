@@ -1,5 +1,12 @@
+import time
 import typing
+import threading
+import collections
 import concurrent.futures as futures
+from karrio.core.utils.executor import get_executor
+
+DEFAULT_TIMEOUT = 86400
+DEFAULT_MAXSIZE = 1024
 
 
 class AbstractCache:
@@ -9,47 +16,156 @@ class AbstractCache:
     def set(self, key: str, value: typing.Any, **kwargs):
         pass
 
+    def delete(self, key: str):
+        pass
+
+
+class Entry(typing.NamedTuple):
+    promise: futures.Future
+    expires_at: typing.Optional[float] = None
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.monotonic()
+
 
 class Cache:
-    def __init__(self, cache: typing.Optional[AbstractCache] = None, **kwargs) -> None:
+    """A size bounded LRU cache with per entry expiry.
+
+    Values set as callables are loaded in the background and concurrent
+    callers of a key being loaded share the same loader call (single-flight).
+    When a system cache (e.g. the Django cache) is provided, it is used as a
+    second tier shared between processes.
+
+    :param cache: an optional system cache used as second tier.
+    :param maxsize: the maximum number of entries kept in memory.
+    :param local_timeout: an optional upper bound for the in memory entries
+        time to live, also applied to values collected from the system cache.
+    """
+
+    def __init__(
+        self,
+        cache: typing.Optional[AbstractCache] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        local_timeout: typing.Optional[float] = None,
+        **kwargs,
+    ) -> None:
         self._cache = cache  # system cache
-        self._values: typing.Dict[str, futures.Future] = {}  # shallow cache
+        self._values: typing.OrderedDict[str, Entry] = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.maxsize = maxsize
+        self.local_timeout = local_timeout
 
         for key, value in kwargs.items():
             self.set(key, value)
 
     def get(self, key: str):
-        _value = self._values.get(key)
-        _cache_value = None if self._cache is None else self._cache.get(key)
-        _result = None
+        entry = self._get_entry(key)
+
+        if entry is None and self._cache is not None:
+            _cache_value = self._cache.get(key)
+
+            # sync value in memory if it only exist in the system cache
+            if _cache_value is not None:
+                entry = self._set_entry(
+                    key, self._resolved(_cache_value), DEFAULT_TIMEOUT
+                )
+
+        if entry is None:
+            return None
+
+        try:
+            return entry.promise.result()
+        except Exception:
+            # drop failed loads so that the next call retries.
+            self._delete_entry(key, entry)
+            raise
+
+    def set(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: typing.Optional[float] = DEFAULT_TIMEOUT,
+    ):
+        if isinstance(value, typing.Callable):
+            with self._lock:
+                entry = self._values.get(key)
+
+                # share the loader call already in flight for the key
+                if entry is not None and not entry.promise.done():
+                    return
+
+                entry = self._set_entry(key, get_executor().submit(value), timeout)
+        else:
+            entry = self._set_entry(key, self._resolved(value), timeout)
+
+        # set value in system cache if it exist
+        if self._cache is not None:
+            entry.promise.add_done_callback(lambda _: self._save(key, entry, timeout))
 
-        if _value is not None:
-            _result = _value.result()
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
 
-        if self._cache is not None and _cache_value is not None:
-            _result = _cache_value
+        if self._cache is not None:
+            self._cache.delete(key)
 
-        # sync value in shallow cache if it only exist in the cache
-        if _value is None and _cache_value is not None:
-            self.set(key, _cache_value)
+    def clear(self):
+        with self._lock:
+            self._values.clear()
 
-        # sync value in cache if it only exist shallow cache
-        if _cache_value is None and _value is not None and self._cache is not None:
-            self._cache.set(key, _cache_value)
+    def __contains__(self, key: str) -> bool:
+        return self._get_entry(key) is not None
 
-        return _result
+    def __len__(self) -> int:
+        return len(self._values)
 
-    def set(self, key: str, value: typing.Any, timeout: int = 86400):
-        def _save():
-            if isinstance(value, typing.Callable):
-                return value()
+    def __bool__(self) -> bool:
+        return True
 
-            return value
+    def _get_entry(self, key: str) -> typing.Optional[Entry]:
+        with self._lock:
+            entry = self._values.get(key)
 
-        executor = futures.ThreadPoolExecutor(max_workers=1)
-        promise = executor.submit(_save)
-        self._values.update({key: promise})
+            if entry is not None and entry.expired:
+                del self._values[key]
+                return None
 
-        # set value in cache if it exist
-        if self._cache is not None:
-            promise.add_done_callback(lambda _: self._cache.set(key, _.result(), timeout=timeout))
+            if entry is not None:
+                self._values.move_to_end(key)
+
+            return entry
+
+    def _set_entry(
+        self,
+        key: str,
+        promise: futures.Future,
+        timeout: typing.Optional[float],
+    ) -> Entry:
+        timeouts = [_ for _ in (timeout, self.local_timeout) if _ is not None]
+        entry = Entry(promise, time.monotonic() + min(timeouts) if timeouts else None)
+
+        with self._lock:
+            self._values[key] = entry
+            self._values.move_to_end(key)
+
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+        return entry
+
+    def _delete_entry(self, key: str, entry: Entry):
+        with self._lock:
+            if self._values.get(key) is entry:
+                del self._values[key]
+
+    def _save(self, key: str, entry: Entry, timeout: typing.Optional[float]):
+        if entry.promise.exception() is None:
+            self._cache.set(key, entry.promise.result(), timeout=timeout)
+
+    @staticmethod
+    def _resolved(value: typing.Any) -> futures.Future:
+        promise: futures.Future = futures.Future()
+        promise.set_result(value)
+
+        return promise
@@ -3,10 +3,13 @@ import enum
 import attr
 import json
 import types
+import operator
 import jstruct.utils as jstruct
-from typing import Union, Any, TypeVar, Callable, Type, Optional
+from typing import Union, Any, Dict, TypeVar, Callable, Type, Optional
 
 T = TypeVar("T")
+EMPTY_VALUES = (None, [], "")
+ANNOTATED_FIELDS: Dict[Any, frozenset] = {}
 
 
 class DICTPARSE:
@@ -51,6 +54,14 @@ class DICTPARSE:
         :return: a dictionary.
         """
         _clear_empty = clear_empty is not False
+        if not isinstance(entity, (str, bytes)):
+            try:
+                return _to_primitive(entity, _clear_empty)
+            except Exception:
+                # fall back on the JSON round trip for entities the direct
+                # conversion does not support so that errors are unchanged.
+                pass
+
         if isinstance(entity, str):
             entity = re.sub(",[ \t\r\n]+}", "}", entity)
             entity = re.sub(",[ \t\r\n]+\]", "]", entity)
@@ -64,7 +75,7 @@ class DICTPARSE:
             object_hook=lambda d: {
                 k: v
                 for k, v in d.items()
-                if (v not in (None, [], "") if _clear_empty else True)
+                if (v not in EMPTY_VALUES if _clear_empty else True)
             },
         )
 
@@ -79,5 +90,94 @@ class DICTPARSE:
         if data is None or object_type is None:
             return None
 
+        fields = ANNOTATED_FIELDS.get(object_type)
+        if fields is None:
+            fields = ANNOTATED_FIELDS.setdefault(
+                object_type, frozenset(getattr(object_type, "__annotations__", {}))
+            )
+
+        if fields.issuperset(data):
+            return object_type(**data)
+
         entity: object_type = jstruct.instantiate(object_type, data)  # type: ignore
         return entity
+
+
+def _to_primitive(item: Any, clear_empty: bool, in_attrs: bool = False) -> Any:
+    """Convert a value into JSON compatible python primitives.
+
+    The result is identical to loading the output of `DICTPARSE.jsonify` back
+    but without serializing the value into an intermediate JSON string.
+    `in_attrs` flags values collected by `attr.asdict` in the JSON round trip.
+    """
+    if item is None or item is True or item is False:
+        return item
+
+    item_type = type(item)
+
+    if item_type is str or item_type is int or item_type is float:
+        return item
+    if isinstance(item, str):
+        return str.__str__(item)
+    if isinstance(item, int):
+        return int.__int__(item)
+    if isinstance(item, float):
+        return float.__float__(item)
+    if isinstance(item, (list, tuple)) or (
+        in_attrs and isinstance(item, (set, frozenset))
+    ):
+        return [_to_primitive(value, clear_empty, in_attrs) for value in item]
+    if isinstance(item, dict):
+        return _to_mapping(item.items(), clear_empty, in_attrs)
+    if attr.has(item_type):
+        if not in_attrs and isinstance(item, Callable) and hasattr(item, "__name__"):
+            return item.__name__
+
+        return _to_mapping(
+            [(_.name, getattr(item, _.name)) for _ in attr.fields(item_type)],
+            clear_empty,
+            True,
+        )
+    if isinstance(item, type):
+        return item.__name__ if attr.has(item) else str(item)
+    if isinstance(item, types.FunctionType):
+        return None
+    if isinstance(item, Callable):
+        return str(item)
+    if isinstance(item, enum.Enum):
+        return _to_primitive(item.value, clear_empty)
+    if hasattr(item, "__dict__"):
+        return _to_primitive(item.__dict__, clear_empty)
+
+    raise TypeError(f"Object of type {item_type.__name__} is not JSON serializable")
+
+
+def _to_mapping(items: Any, clear_empty: bool, in_attrs: bool) -> dict:
+    mapping = {}
+
+    for key, value in sorted(items, key=operator.itemgetter(0)):
+        value = _to_primitive(value, clear_empty, in_attrs)
+
+        if clear_empty and value in EMPTY_VALUES:
+            continue
+
+        mapping[_to_key(key)] = value
+
+    return mapping
+
+
+def _to_key(key: Any) -> str:
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return json.dumps(float.__float__(key))
+
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key)}")
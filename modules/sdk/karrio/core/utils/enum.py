@@ -10,28 +10,45 @@ class MetaEnum(enum.EnumMeta):
         if item is None:
             return False
         if isinstance(item, str):
-            return item in cls.__members__
+            return item in cls._member_map_
 
         return super().__contains__(item)
 
     def map(cls, key: typing.Any):
-        if key in cls:
-            return EnumWrapper(key, cls[key])
-        elif key in typing.cast(typing.Any, cls)._value2member_map_:
-            return EnumWrapper(key, cls(key))
-        elif key in [
-            str(v.value) for v in typing.cast(typing.Any, cls).__members__.values()
-        ]:
-            return EnumWrapper(
-                key,
-                next(
-                    v
-                    for v in typing.cast(typing.Any, cls).__members__.values()
-                    if v.value == key
-                ),
-            )
+        try:
+            member = cls.lookup().get(key)
+        except TypeError:  # unhashable key
+            member = None
+
+        return EnumWrapper(key, member)
+
+    def lookup(cls) -> typing.Dict[typing.Any, typing.Any]:
+        """Return the enum reverse lookup table, built on first use.
+
+        A key is resolved by member name first, then by value and finally by
+        stringified value.
+        """
+        table = cls.__dict__.get("_lookup_table_")
+
+        if table is None:
+            members = typing.cast(typing.Any, cls).__members__
+            table = {}
+
+            for member in members.values():
+                value = str(member.value)
+                if value not in table and member.value == value:
+                    table[value] = member
+
+            for member in members.values():
+                try:
+                    table[member.value] = member
+                except TypeError:  # unhashable value
+                    pass
+
+            table.update(members)
+            setattr(cls, "_lookup_table_", table)
 
-        return EnumWrapper(key)
+        return table
 
     def as_dict(self):
         return {name: enum.value for name, enum in self.__members__.items()}
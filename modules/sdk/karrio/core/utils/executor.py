@@ -0,0 +1,256 @@
+"""Karrio process wide executors for SDK background work.
+
+The cache and the tracer submit their work to a small bounded thread pool
+started on first use instead of spawning a new thread pool for every call.
+The I/O bound carrier calls fanned out by the `lib.run_asynchronously`,
+`lib.run_concurently` and `lib.run_as_completed` helpers run on a separate,
+larger network pool so they never queue behind unrelated background work.
+
+Waiting (without timeout) on a task that no worker picked up yet runs it in
+the waiting thread. Nested submissions (e.g. a proxy running concurrent
+requests from a rating task) therefore never deadlock on a saturated pool.
+A wait bounded by a timeout (e.g. a rating deadline) never runs the task
+inline as it could not be interrupted once its deadline has passed.
+
+Tasks run in a copy of the submitting context so the context variables
+(e.g. the current tracing span) follow the work into the pool.
+"""
+
+import os
+import typing
+import weakref
+import functools
+import threading
+import contextvars
+import concurrent.futures as futures
+
+T = typing.TypeVar("T")
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_NETWORK_MAX_WORKERS = 64
+
+
+class Task(futures.Future):
+    """A future that runs its callable inline when waited on (without timeout)
+    before it started.
+    """
+
+    def __init__(
+        self,
+        function: typing.Callable[..., T],
+        *args,
+        executor: "BackgroundExecutor" = None,
+        **kwargs,
+    ):
+        super().__init__()
+        self._function = functools.partial(function, *args, **kwargs)
+        self._context = contextvars.copy_context()
+        self._executor = executor
+        self._claim = threading.Lock()
+
+    def run(self) -> None:
+        """Run the task unless another thread already claimed it."""
+        if not self._claim.acquire(blocking=False):
+            return
+
+        function, self._function = self._function, None
+        if self._executor is not None:
+            self._executor._on_task_start()
+
+        try:
+            if not self.set_running_or_notify_cancel():
+                return
+
+            result = self._context.run(function)
+        except BaseException as error:
+            self.set_exception(error)
+        else:
+            self.set_result(result)
+        finally:
+            if self._executor is not None:
+                self._executor._on_task_done()
+
+    def result(self, timeout: float = None) -> T:
+        if timeout is None:
+            self.run()
+        return super().result(timeout)
+
+    def exception(self, timeout: float = None) -> typing.Optional[BaseException]:
+        if timeout is None:
+            self.run()
+        return super().exception(timeout)
+
+
+class BackgroundExecutor(futures.Executor):
+    """A bounded, lazily started thread pool shared by the SDK background work.
+
+    :param max_workers: the maximum number of worker threads.
+        `0` runs every task inline in the submitting thread.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        thread_name_prefix: str = "karrio",
+    ):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._pool: typing.Optional[futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+
+        _executors.add(self)
+
+    @property
+    def inline(self) -> bool:
+        return self.max_workers == 0
+
+    @property
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Return the executor counters, `queued` being the current queue depth."""
+        with self._lock:
+            return dict(
+                max_workers=self.max_workers,
+                started=self._pool is not None,
+                submitted=self._submitted,
+                queued=self._submitted - self._started,
+                running=self._started - self._completed,
+                completed=self._completed,
+            )
+
+    def submit(self, function: typing.Callable[..., T], *args, **kwargs) -> Task:
+        task = Task(function, *args, executor=self, **kwargs)
+        self._submit(task)
+
+        return task
+
+    def map_tasks(
+        self,
+        function: typing.Callable[..., T],
+        sequence: typing.Iterable[typing.Any],
+        max_workers: int = None,
+    ) -> typing.List[Task]:
+        """Run the function on each item with at most `max_workers` tasks queued
+        or running at once and return the completed tasks in sequence order.
+        """
+        tasks = [Task(function, item, executor=self) for item in sequence]
+        pending = iter(tasks)
+        lock = threading.Lock()
+
+        with self._lock:
+            self._submitted += len(tasks)
+
+        def _dispatch(_=None):
+            while True:
+                with lock:
+                    task = next(pending, None)
+                if task is None:
+                    return
+                if task.done():  # already run by the waiting thread
+                    continue
+
+                task.add_done_callback(_dispatch)
+                return self._dispatch(task)
+
+        if not self.inline:
+            for _ in range(min(len(tasks), max_workers or len(tasks))):
+                _dispatch()
+
+        for task in tasks:
+            task.exception()
+
+        return tasks
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _submit(self, task: Task):
+        with self._lock:
+            self._submitted += 1
+
+        self._dispatch(task)
+
+    def _dispatch(self, task: Task):
+        if self.inline:
+            return task.run()
+
+        self._get_pool().submit(task.run)
+
+    def _get_pool(self) -> futures.ThreadPoolExecutor:
+        pool = self._pool
+        if pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.thread_name_prefix,
+                    )
+                pool = self._pool
+
+        return pool
+
+    def _on_task_start(self):
+        with self._lock:
+            self._started += 1
+
+    def _on_task_done(self):
+        with self._lock:
+            self._completed += 1
+
+    def _reset_after_fork(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+
+_executors: "weakref.WeakSet[BackgroundExecutor]" = weakref.WeakSet()
+_default_executor: BackgroundExecutor = BackgroundExecutor()
+_network_executor: BackgroundExecutor = BackgroundExecutor(
+    max_workers=DEFAULT_NETWORK_MAX_WORKERS,
+    thread_name_prefix="karrio-network",
+)
+
+
+def _reset_executors_after_fork():
+    for executor in list(_executors):
+        executor._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executors_after_fork)
+
+
+def get_executor() -> BackgroundExecutor:
+    """Return the process wide executor used for SDK background work."""
+    return _default_executor
+
+
+def set_executor(executor: BackgroundExecutor) -> BackgroundExecutor:
+    """Replace the process wide executor used for SDK background work.
+
+    Returns the previous executor (shutting it down is left to the caller).
+    """
+    global _default_executor
+    previous, _default_executor = _default_executor, executor
+
+    return previous
+
+
+def get_network_executor() -> BackgroundExecutor:
+    """Return the process wide executor running the carrier calls fan-out."""
+    return _network_executor
+
+
+def set_network_executor(executor: BackgroundExecutor) -> BackgroundExecutor:
+    """Replace the process wide executor running the carrier calls fan-out.
+
+    Returns the previous executor (shutting it down is left to the caller).
+    """
+    global _network_executor
+    previous, _network_executor = _network_executor, executor
+
+    return previous
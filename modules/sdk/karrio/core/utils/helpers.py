@@ -1,19 +1,43 @@
 import io
 import re
 import ssl
+import time
 import uuid
 import string
+import threading
 import base64
 import PyPDF2
 import asyncio
+import inspect
 import logging
+import contextvars
 import urllib.parse
 import PIL.Image
 import PIL.ImageFile
 from urllib.error import HTTPError
-from urllib.request import urlopen, Request, ProxyHandler, build_opener, install_opener
-from typing import List, TypeVar, Callable, Optional, Any, cast
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.request import Request
+from typing import (
+    IO,
+    List,
+    TypeVar,
+    Callable,
+    Optional,
+    Any,
+    Iterable,
+    Iterator,
+    Tuple,
+    Union,
+    cast,
+)
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from karrio.core.utils.executor import get_network_executor
+from karrio.core.utils.tracing import span
+from karrio.core.utils.transport import (
+    Transport,
+    AsyncTransport,
+    get_transport,
+    get_async_transport,
+)
 
 logger = logging.getLogger(__name__)
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -73,76 +97,109 @@ def image_to_pdf(image_str: str, rotate: int = None, resize: dict = None) -> str
     return base64.b64encode(new_buffer.getvalue()).decode("utf-8")
 
 
+def to_bytes(document: Union[str, bytes]) -> bytes:
+    """Return the content of a base64 encoded (or already decoded) document."""
+    return document if isinstance(document, bytes) else base64.b64decode(document)
+
+
 def bundle_pdfs(base64_strings: List[str]) -> PyPDF2.PdfMerger:
     merger = PyPDF2.PdfMerger(strict=False)
 
     for b64_str in base64_strings:
-        buffer = to_buffer(b64_str)
-        merger.append(buffer)
+        merger.append(io.BytesIO(to_bytes(b64_str)))
 
     return merger
 
 
 def bundle_imgs(base64_strings: List[str]):
-    image_buffers = [
-        io.BytesIO(base64.b64decode(b64_str)) for b64_str in base64_strings
-    ]
-    images = [PIL.Image.open(buffer) for buffer in image_buffers]
-    widths, heights = zip(*(i.size for i in images))
+    """Stack images vertically on a canvas sharing their color mode.
 
-    max_width = max(widths)
-    total_height = sum(heights)
+    Images are opened lazily to size the canvas then decoded one at a time.
+    """
+    contents = [to_bytes(b64_str) for b64_str in base64_strings]
+    sizes, modes = [], set()
 
-    image = PIL.Image.new("RGB", (max_width, total_height))
+    for content in contents:
+        with PIL.Image.open(io.BytesIO(content)) as im:
+            sizes.append(im.size)
+            modes.add(im.mode)
 
-    x_offset = 0
-    for im in images:
-        image.paste(im, (0, x_offset))
-        x_offset += im.size[1]
+    mode = next(iter(modes)) if len(modes) == 1 else "RGB"
+    mode = mode if mode in ("1", "L", "RGB") else "RGB"
+    widths, heights = zip(*sizes)
+    image = PIL.Image.new(mode, (max(widths), sum(heights)))
+
+    y_offset = 0
+    for content in contents:
+        with PIL.Image.open(io.BytesIO(content)) as im:
+            image.paste(im if im.mode == mode else im.convert(mode), (0, y_offset))
+            y_offset += im.size[1]
 
     return image
 
 
 def bundle_zpls(base64_strings: List[str]) -> str:
-    doc = ""
-    for b64_str in base64_strings:
-        doc += f'{base64.b64decode(b64_str).decode("utf-8")}{NEW_LINE}'
+    return b"".join(_zpl_chunks(base64_strings)).decode("utf-8")
 
-    return doc
 
+def _zpl_chunks(documents: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+    for document in documents:
+        yield to_bytes(document)
+        yield NEW_LINE.encode("utf-8")
 
-def bundle_base64(base64_strings: List[str], format: str = "PDF") -> str:
-    """Return a base64 string from a list of base64 strings."""
-    result = io.BytesIO()
 
+def write_bundle(
+    documents: Iterable[Union[str, bytes]],
+    sink: IO[bytes],
+    format: str = "PDF",
+) -> IO[bytes]:
+    """Write a bundle of documents to a file-like sink.
+
+    Documents can be base64 strings or bytes and are consumed lazily: ZPL
+    documents are written as they come, PDF pages are written once all the
+    documents are appended and images are stacked on a single canvas.
+    """
     if format == "PDF":
-        pdf_buffer = bundle_pdfs(base64_strings)
-        pdf_buffer.write(result)
+        writer = PyPDF2.PdfWriter()
+        for document in documents:
+            reader = PyPDF2.PdfReader(io.BytesIO(to_bytes(document)), strict=False)
+            for page in reader.pages:
+                writer.add_page(page)
+        writer.write(sink)
 
     elif "ZPL" in format:
-        content = bundle_zpls(base64_strings)
-        result.write(content.encode("utf-8"))
+        for chunk in _zpl_chunks(documents):
+            sink.write(chunk)
 
     else:
-        image = bundle_imgs(base64_strings)
-        image.save(result, format)
+        bundle_imgs(list(documents)).save(sink, format)
+
+    return sink
+
+
+def bundle_base64(base64_strings: List[str], format: str = "PDF") -> str:
+    """Return a base64 string from a list of base64 strings."""
+    result = write_bundle(base64_strings, io.BytesIO(), format=format)
 
     return base64.b64encode(result.getvalue()).decode("utf-8")
 
 
 def zpl_to_pdf(zpl_str: str, width: int, height: int, dpmm: int = 12) -> str:
     """Return a PDF base64 string from a ZPL string."""
-    import karrio.lib as lib
-
-    data = lib.to_json(dict(file=base64.b64decode(zpl_str).decode("utf-8")))
-    doc = request(
-        url=f"http://api.labelary.com/v1/printers/{dpmm}dpmm/labels/{width}x{height}/",
-        data=data,
-        headers={"Accept": "application/pdf"},
-        decoder=lambda b: base64.encodebytes(b).decode("utf-8"),
-    )
+    import karrio.addons.zpl as zpl
+
+    content = zpl.to_pdf(decode_bytes(base64.b64decode(zpl_str)), width, height, dpmm)
+
+    return base64.b64encode(content).decode("utf-8")
+
+
+def zpl_to_png(zpl_str: str, width: int, height: int, dpmm: int = 12) -> str:
+    """Return a PNG base64 string from a ZPL string."""
+    import karrio.addons.zpl as zpl
+
+    content = zpl.to_png(decode_bytes(base64.b64decode(zpl_str)), width, height, dpmm)
 
-    return doc
+    return base64.b64encode(content).decode("utf-8")
 
 
 def binary_to_base64(binary_str: str) -> str:
@@ -183,21 +240,6 @@ def process_request(
 
     _request = Request(**{**kwargs, **payload})
 
-    # Apply proxy settings if provided: Proxy Example` 'username:password@IP_Address:Port'
-    if proxy:
-        proxy_info = proxy.split("@")
-        auth_info, host_port = proxy_info[0], proxy_info[1]
-        auth_info = urllib.parse.unquote(auth_info)
-        auth_encoded = base64.b64encode(auth_info.encode()).decode()
-        proxy_url = f"http://{host_port}"
-
-        # Create a ProxyHandler
-        proxy_handler = ProxyHandler({"http": proxy_url, "https": proxy_url})
-        opener = build_opener(proxy_handler)
-        opener.addheaders = [("Proxy-Authorization", f"Basic {auth_encoded}")]
-        install_opener(opener)
-        logger.info(f"Proxy set to: {proxy_url} with credentials")
-
     logger.info(f"Request URL:: {_request.full_url}")
 
     return _request
@@ -252,31 +294,82 @@ def request(
     on_error: Callable[[HTTPError], str] = None,
     trace: Callable[[Any, str], Any] = None,
     proxy: str = None,
+    timeout: float = None,
+    transport: Transport = None,
     **kwargs,
 ) -> str:
     """Return an HTTP response body.
 
-    make a http request (wrapper around Request method from built in urllib)
+    make a http request through the given transport (default: the process wide
+    keep-alive connection pool, see `karrio.core.utils.transport`)
     Proxy example: 'Username:Password@IP_Address:Port'
     """
 
     _request_id = str(uuid.uuid4())
+    _transport = transport or get_transport()
     logger.debug(f"sending request ({_request_id})...")
 
-    try:
-        _request = process_request(_request_id, trace, proxy, **kwargs)
+    with span("http_request", url=_trace_url(kwargs.get("url"))):
+        try:
+            _request = process_request(_request_id, trace, proxy, **kwargs)
 
-        with urlopen(_request) as f:
-            _response = process_response(
-                _request_id, f, decoder, on_ok=on_ok, trace=trace
-            )
+            with span("network"):
+                _result = _transport.open(_request, proxy=proxy, timeout=timeout)
 
-    except HTTPError as e:
-        _response = process_error(_request_id, e, on_error=on_error, trace=trace)
+            with _result as f, span("decode"):
+                _response = process_response(
+                    _request_id, f, decoder, on_ok=on_ok, trace=trace
+                )
+
+        except HTTPError as e:
+            _response = process_error(_request_id, e, on_error=on_error, trace=trace)
 
     return _response
 
 
+async def request_async(
+    decoder: Callable = decode_bytes,
+    on_ok: Callable[[Any], str] = None,
+    on_error: Callable[[HTTPError], str] = None,
+    trace: Callable[[Any, str], Any] = None,
+    proxy: str = None,
+    timeout: float = None,
+    transport: AsyncTransport = None,
+    **kwargs,
+) -> str:
+    """Return an HTTP response body (asyncio variant of `request`).
+
+    make a http request on the running event loop through the given async transport
+    Proxy example: 'Username:Password@IP_Address:Port'
+    """
+
+    _request_id = str(uuid.uuid4())
+    _transport = transport or get_async_transport()
+    logger.debug(f"sending request ({_request_id})...")
+
+    with span("http_request", url=_trace_url(kwargs.get("url"))):
+        try:
+            _request = process_request(_request_id, trace, proxy, **kwargs)
+
+            with span("network"):
+                _result = await _transport.open(_request, proxy=proxy, timeout=timeout)
+
+            with _result as f, span("decode"):
+                _response = process_response(
+                    _request_id, f, decoder, on_ok=on_ok, trace=trace
+                )
+
+        except HTTPError as e:
+            _response = process_error(_request_id, e, on_error=on_error, trace=trace)
+
+    return _response
+
+
+def _trace_url(url: Optional[str]) -> Optional[str]:
+    """Return the url without its query string (which may hold credentials)."""
+    return url.split("?")[0] if url else url
+
+
 def exec_parrallel(
     function: Callable, sequence: List[S], max_workers: int = None
 ) -> List[T]:
@@ -284,43 +377,128 @@ def exec_parrallel(
     if not sequence:
         return []  # No work to do
 
-    workers = min(len(sequence), max_workers or len(sequence))
+    # Run on the shared SDK network executor, at most `max_workers` at a time.
+    tasks = get_network_executor().map_tasks(function, sequence, max_workers=max_workers)
+
+    # Collect results in sequence order
+    results = []
+    for task in tasks:
+        try:
+            results.append(task.result())  # Append result of the completed task
+        except Exception as e:
+            results.append(e)  # Optionally handle or log exceptions here
+
+    return results
+
+
+def exec_as_completed(
+    function: Callable,
+    sequence: List[S],
+    timeouts: List[Optional[float]] = None,
+) -> Iterator[Tuple[int, T]]:
+    """Yield the `(index, result)` of the function execution on each element
+    of the sequence as soon as it completes.
+
+    Elements not completed within their timeout (seconds from the call) yield
+    a `TimeoutError` as result and are left to complete in the background.
+    A `None` timeout waits for the element to complete.
+    """
+    started = time.monotonic()
+    executor = get_network_executor()
+    timeouts = timeouts or [None] * len(sequence)
+    pending = {executor.submit(function, item): i for i, item in enumerate(sequence)}
+    in_worker = threading.current_thread().name.startswith(
+        executor.thread_name_prefix
+    )
+
+    while pending:
+        elapsed = time.monotonic() - started
+        budgets = [
+            timeouts[i] - elapsed for i in pending.values() if timeouts[i] is not None
+        ]
+
+        if not budgets and in_worker:
+            # help run the queued tasks instead of blocking a worker of the pool
+            next(iter(pending)).run()
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        # Submit tasks
-        futures = [executor.submit(function, item) for item in sequence]
+        done, _ = wait(
+            list(pending),
+            timeout=max(min(budgets), 0) if budgets else None,
+            return_when=FIRST_COMPLETED,
+        )
+        elapsed = time.monotonic() - started
 
-        # Collect results as tasks complete
-        results = []
-        for future in as_completed(futures):
+        for task in sorted(done, key=pending.get):
+            index = pending.pop(task)
             try:
-                results.append(future.result())  # Append result of the completed task
+                yield index, task.result()
             except Exception as e:
-                results.append(e)  # Optionally handle or log exceptions here
+                yield index, e
 
-        return results
+        for task, index in sorted(pending.items(), key=lambda _: _[1]):
+            if timeouts[index] is not None and timeouts[index] <= elapsed:
+                pending.pop(task)
+                task.cancel()  # skip it if no worker picked it up yet
+                yield index, TimeoutError(timeouts[index])
 
 
-def exec_async(action: Callable, sequence: List[S]) -> List[T]:
-    async def run_tasks():
-        # Use asyncio.to_thread instead of loop.run_in_executor
-        # This ensures proper task scheduling and prevents potential task dropping
-        return await asyncio.gather(
-            *[asyncio.to_thread(action, args) for args in sequence]
-        )
+def exec_with_timeout(
+    function: Callable,
+    sequence: List[S],
+    timeouts: List[Optional[float]],
+) -> List[T]:
+    """Return a list of result for function execution on each element of the sequence.
+
+    Elements not completed within their timeout (seconds from the call) get a
+    `TimeoutError` in place of their result and are left to complete in the
+    background. A `None` timeout waits for the element to complete.
+    """
+    results: List[Any] = [None] * len(sequence)
+    for index, result in exec_as_completed(function, sequence, timeouts):
+        results[index] = result
+
+    return results
+
 
-    async def run_loop():
-        # Simplified to just return the result of run_tasks
-        # No need for manual loop creation and closing
-        return await run_tasks()
+def run_sync(value: Any) -> Any:
+    """Return the value, running it to completion first if it is awaitable.
+
+    The coroutine runs on a fresh event loop, on the shared SDK network
+    executor when the current thread already runs a loop.
+    """
+    if not inspect.isawaitable(value):
+        return value
 
-    # Use asyncio.run instead of ThreadPoolExecutor
-    # This properly sets up and tears down the event loop
-    # Preventing issues with loop closure and task cleanup
-    result = asyncio.run(run_loop())
+    async def _await():
+        return await value
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await())
+
+    executor = get_network_executor()
+
+    if executor.inline:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            context = contextvars.copy_context()
+            return pool.submit(context.run, asyncio.run, _await()).result()
+
+    # wait without running the task inline: this thread already runs a loop.
+    task = executor.submit(asyncio.run, _await())
+    wait([task])
+
+    return task.result()
+
+
+def exec_async(action: Callable, sequence: List[S]) -> List[T]:
+    # Run on the shared SDK network executor instead of a new event loop and
+    # thread pool per call. Tasks not yet picked up by a worker run in the
+    # calling thread so nested calls from within a worker can not deadlock.
+    tasks = get_network_executor().map_tasks(action, sequence)
 
     # Cast the result to the expected type
-    return cast(List[T], result)
+    return cast(List[T], [task.result() for task in tasks])
 
 
 class Location:
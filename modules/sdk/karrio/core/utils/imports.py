@@ -0,0 +1,128 @@
+"""Karrio lazy import of the generated carrier schema modules.
+
+The `karrio.schemas.*` modules hold the generated data types of the carriers
+APIs (some generateDS modules have more than 50k lines). Importing a carrier
+mapper used to execute all of them at once, even for carriers never used.
+
+Once `enable_lazy_schemas` is called (by default on `import karrio`), the
+execution of a schema module imported with `import karrio.schemas.x.y as y`
+is deferred until one of its attributes is accessed for the first time.
+Setting the `KARRIO_LAZY_SCHEMAS` environment variable to `0` disables it.
+"""
+
+import os
+import sys
+import types
+import typing
+import threading
+import importlib.abc
+import importlib.machinery
+
+LAZY_PREFIXES = ("karrio.schemas.",)
+
+
+class LazyModule(types.ModuleType):
+    """A module executed on the first access to one of its attributes.
+
+    Unlike `importlib.util.LazyLoader`, accessing the module import attributes
+    (e.g. `__spec__` when the module is imported again) does not load it.
+    """
+
+    def __getattr__(self, name: str):
+        if not _load(self):
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+
+        return getattr(self, name)
+
+    def __dir__(self):
+        _load(self)
+        return dir(self)
+
+
+class LazyState:
+    """The loader of a lazy module and the lock serializing its execution."""
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self.loader = loader
+        self.lock = threading.RLock()
+        self.loading = False
+
+
+def _load(module: types.ModuleType) -> bool:
+    """Execute a lazy module body once and return whether it is loaded, False
+    while it is being executed by the current thread.
+
+    The state is kept until the module is executed so the other threads
+    accessing it meanwhile wait for its execution to complete.
+    """
+    state: typing.Optional[LazyState] = module.__dict__.get("__lazy_state__")
+    if state is None:
+        return True
+
+    with state.lock:
+        if module.__dict__.get("__lazy_state__") is None:
+            return True
+        if state.loading:
+            return False
+
+        state.loading = True
+        try:
+            state.loader.exec_module(module)
+        finally:
+            module.__class__ = types.ModuleType
+            module.__dict__.pop("__lazy_state__", None)
+
+    return True
+
+
+class LazySchemaLoader(importlib.abc.Loader):
+    def __init__(self, loader: importlib.abc.Loader):
+        self.loader = loader
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType):
+        module.__dict__["__lazy_state__"] = LazyState(self.loader)
+        module.__class__ = LazyModule
+
+
+class LazySchemaFinder(importlib.abc.MetaPathFinder):
+    """A meta path finder deferring the execution of the schema modules."""
+
+    def __init__(self, prefixes: typing.Tuple[str, ...] = LAZY_PREFIXES):
+        self.prefixes = prefixes
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        if not fullname.startswith(self.prefixes):
+            return None
+
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+
+        # packages are kept eager as their submodules are imported through them
+        if (
+            spec is None
+            or spec.submodule_search_locations is not None
+            or not hasattr(spec.loader, "exec_module")
+        ):
+            return None
+
+        spec.loader = LazySchemaLoader(spec.loader)
+        return spec
+
+
+def lazy_schemas_enabled() -> bool:
+    return any(isinstance(_, LazySchemaFinder) for _ in sys.meta_path)
+
+
+def enable_lazy_schemas() -> None:
+    """Defer the execution of the schema modules to their first use."""
+    if os.environ.get("KARRIO_LAZY_SCHEMAS", "1").lower() in ("0", "false"):
+        return
+    if not lazy_schemas_enabled():
+        sys.meta_path.insert(0, LazySchemaFinder())
+
+
+def disable_lazy_schemas() -> None:
+    """Import the schema modules eagerly again (already imported ones stay lazy)."""
+    sys.meta_path[:] = [_ for _ in sys.meta_path if not isinstance(_, LazySchemaFinder)]
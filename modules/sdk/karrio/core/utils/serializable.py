@@ -3,6 +3,7 @@ import typing
 import logging
 
 from karrio.core.utils.helpers import identity
+from karrio.core.utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,8 @@ class Serializable(typing.Generic[T]):
     _ctx: dict = {}
 
     def serialize(self) -> T:
-        serialized_value = self._serializer(self.value)
+        with span("serialize"):
+            serialized_value = self._serializer(self.value)
         logger.debug(serialized_value)
         return serialized_value
 
@@ -34,7 +36,8 @@ class Deserializable(typing.Generic[T]):
 
     def deserialize(self) -> T:
         logger.debug(self.value)
-        return self._deserializer(self.value)
+        with span("deserialize"):
+            return self._deserializer(self.value)
 
     @property
     def ctx(self) -> dict:
@@ -2,10 +2,19 @@ import uuid
 import attr
 import time
 import typing
+import logging
+import threading
 import functools
+import contextlib
+import contextvars
+import collections
 import concurrent.futures as futures
+from karrio.core.utils.executor import get_executor
 
+logger = logging.getLogger(__name__)
 Trace = typing.Callable[[typing.Any, str], typing.Any]
+# most recent spans kept by a tracer (e.g. the long-lived gateway tracers).
+MAX_SPANS = 1000
 
 
 @attr.s(auto_attribs=True)
@@ -15,11 +24,158 @@ class Record:
     timestamp: float
     metadata: dict = {}
 
+
+@attr.s(auto_attribs=True)
+class Span:
+    """A timed stage of an operation (e.g: create_request, network, parse_response).
+
+    `start` is an epoch timestamp and `duration` is in seconds.
+    Spans inherit the attributes of their parent span (carrier, operation...).
+    """
+
+    name: str
+    trace_id: str
+    start: float
+    span_id: str = attr.Factory(lambda: uuid.uuid4().hex[:16])
+    parent_id: typing.Optional[str] = None
+    duration: float = 0.0
+    status: str = "ok"
+    attributes: dict = attr.Factory(dict)
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def to_record(self) -> Record:
+        """Return the span as a tracing record (key: "span")."""
+        return Record(
+            key="span",
+            data=dict(
+                name=self.name,
+                span_id=self.span_id,
+                parent_id=self.parent_id,
+                duration=self.duration,
+                status=self.status,
+                attributes=self.attributes,
+            ),
+            timestamp=self.start,
+            metadata=dict(
+                connection=dict(
+                    id=self.attributes.get("connection_id"),
+                    test_mode=self.attributes.get("test_mode", False),
+                    carrier_id=self.attributes.get("carrier_id"),
+                    carrier_name=self.attributes.get("carrier_name"),
+                )
+            ),
+        )
+
+
+class SpanExporter:
+    """The span exporter interface.
+
+    Exporters receive the spans of an operation stage once its root span
+    completes, ordered by start time (parents before their children).
+    """
+
+    def export(self, spans: typing.List[Span]) -> None:
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep the exported spans in memory (e.g: for tests and benchmarks)."""
+
+    def __init__(self) -> None:
+        self.spans: typing.List[Span] = []
+
+    def export(self, spans: typing.List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class LoggingExporter(SpanExporter):
+    """Log the exported spans with their duration in milliseconds."""
+
+    def __init__(self, logger: logging.Logger = logger, level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def export(self, spans: typing.List[Span]) -> None:
+        for span in spans:
+            self.logger.log(
+                self.level,
+                f"span {span.name} {span.duration * 1000:.2f}ms {span.status}",
+                extra=dict(span=attr.asdict(span)),
+            )
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """Forward the exported spans to an OpenTelemetry tracer provider.
+
+    Requires the `opentelemetry-api` package (and an SDK to collect them).
+    """
+
+    def __init__(self, tracer_provider: typing.Any = None, name: str = "karrio"):
+        from opentelemetry import trace
+
+        self.trace = trace
+        self.tracer = trace.get_tracer(name, tracer_provider=tracer_provider)
+
+    def export(self, spans: typing.List[Span]) -> None:
+        exported: typing.Dict[str, typing.Any] = {}
+
+        for span in spans:
+            parent = exported.get(span.parent_id)
+            otel_span = self.tracer.start_span(
+                span.name,
+                context=(self.trace.set_span_in_context(parent) if parent else None),
+                start_time=int(span.start * 1e9),
+                attributes={
+                    f"karrio.{key}": value
+                    for key, value in span.attributes.items()
+                    if isinstance(value, (str, bool, int, float))
+                },
+            )
+            if span.status == "error":
+                otel_span.set_status(self.trace.Status(self.trace.StatusCode.ERROR))
+
+            otel_span.end(end_time=int(span.end * 1e9))
+            exported[span.span_id] = otel_span
+
+
+_exporters: typing.List[SpanExporter] = []
+_current_span: contextvars.ContextVar[typing.Optional[typing.Tuple["Tracer", Span]]] = (
+    contextvars.ContextVar("karrio_span", default=None)
+)
+
+
+def add_exporter(exporter: SpanExporter) -> SpanExporter:
+    """Register a span exporter used by every tracer created without exporters."""
+    _exporters.append(exporter)
+    return exporter
+
+
+def remove_exporter(exporter: SpanExporter) -> None:
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
 class Tracer:
-    def __init__(self, id: str = None) -> None:
+    def __init__(
+        self,
+        id: str = None,
+        exporters: typing.List[SpanExporter] = None,
+        max_spans: int = MAX_SPANS,
+    ) -> None:
         self.id = id or str(uuid.uuid4())
+        self.exporters = exporters
         self.inner_context: typing.Dict[str, typing.Any] = {}
         self.inner_recordings: typing.Dict[futures.Future, dict] = {}
+        self.inner_spans: typing.Deque[Span] = collections.deque(maxlen=max_spans)
+        self._open: typing.Set[str] = set()
+        self._pending: typing.Dict[str, typing.List[Span]] = {}
+        self._lock = threading.Lock()
 
     def trace(
         self, data: typing.Any, key: str, metadata: dict = {}, format: str = None
@@ -32,8 +188,8 @@ class Tracer:
                 metadata=metadata,
             )
 
-        promise = futures.ThreadPoolExecutor(max_workers=1)
-        self.inner_recordings.update({promise.submit(_save): data})
+        promise = get_executor().submit(_save)
+        self.inner_recordings.update({promise: data})
 
         return data
 
@@ -42,7 +198,69 @@ class Tracer:
 
     @property
     def records(self) -> typing.List[Record]:
-        return [rec.result() for rec in futures.as_completed(self.inner_recordings)]
+        return [rec.result() for rec in list(self.inner_recordings)]
+
+    @property
+    def spans(self) -> typing.List[Span]:
+        return list(self.inner_spans)
+
+    @property
+    def span_records(self) -> typing.List[Record]:
+        return [span.to_record() for span in self.spans]
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> typing.Iterator[Span]:
+        """Time the wrapped block as a span of this tracer.
+
+        The span becomes the parent of the spans started in the same context
+        (including `lib.request` and the tasks submitted to the SDK executor).
+        """
+        current = _current_span.get()
+        parent = current[1] if current is not None and current[0] is self else None
+        span = Span(
+            name=name,
+            trace_id=self.id,
+            start=time.time(),
+            parent_id=getattr(parent, "span_id", None),
+            attributes={**getattr(parent, "attributes", {}), **attributes},
+        )
+        token = _current_span.set((self, span))
+        started = time.perf_counter()
+
+        with self._lock:
+            self._open.add(span.span_id)
+
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            self._close(span)
+
+    def _close(self, span: Span) -> None:
+        """Keep a closed span with its open parent, or export it with its
+        children when it has no open parent (a root span, or a child that
+        outlived its parent, e.g. a task left running past a deadline).
+        """
+        with self._lock:
+            self._open.discard(span.span_id)
+            self.inner_spans.append(span)
+            root = self._pending.pop(span.span_id, [])
+            if span.parent_id in self._open:
+                self._pending.setdefault(span.parent_id, []).extend([*root, span])
+                return
+
+        exporters = _exporters if self.exporters is None else self.exporters
+        spans = sorted([span, *root], key=lambda _: _.start)
+
+        for exporter in list(exporters):
+            try:
+                exporter.export(spans)
+            except Exception as error:
+                logger.warning(f"failed to export spans: {error}")
 
     @property
     def context(self) -> typing.Dict[str, typing.Any]:
@@ -50,3 +268,18 @@ class Tracer:
 
     def add_context(self, data: typing.Dict[str, typing.Any]):
         self.inner_context.update(data)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes) -> typing.Iterator[typing.Optional[Span]]:
+    """Time the wrapped block as a child of the current span (if any).
+
+    Outside a traced stage, the block runs untimed and yields None.
+    """
+    current = _current_span.get()
+    if current is None:
+        yield None
+        return
+
+    with current[0].span(name, **attributes) as _span:
+        yield _span
@@ -0,0 +1,776 @@
+"""Karrio HTTP transports used by `lib.request` and `lib.request_async`.
+
+A transport sends a prepared `urllib.request.Request` and yields a response
+object compatible with the one returned by `urllib.request.urlopen`
+(`read()`, `status`, `headers`...). HTTP errors are raised as
+`urllib.error.HTTPError` so that `on_error` handlers keep working whatever
+the transport in use.
+"""
+
+import io
+import ssl
+import sys
+import time
+import weakref
+import asyncio
+import base64
+import typing
+import socket
+import logging
+import threading
+import http.client
+import urllib.parse
+import urllib.error
+import urllib.request
+
+logger = logging.getLogger(__name__)
+USER_AGENT = "Python-urllib/%s.%s" % sys.version_info[:2]
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+
+def parse_proxy(proxy: str) -> typing.Tuple[str, typing.Optional[str]]:
+    """Return the proxy 'host:port' and the encoded basic auth credentials.
+
+    Proxy example: 'username:password@IP_Address:Port'
+    """
+    if "@" not in proxy:
+        return proxy, None
+
+    auth_info, host_port = proxy.rsplit("@", 1)
+    auth_info = urllib.parse.unquote(auth_info)
+    auth_encoded = base64.b64encode(auth_info.encode()).decode()
+
+    return host_port, auth_encoded
+
+
+class Transport:
+    """The transport interface used by `lib.request`."""
+
+    def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ) -> typing.ContextManager[typing.Any]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class UrllibTransport(Transport):
+    """A transport opening a new connection for every request (`urlopen`)."""
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout
+
+    def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ):
+        _timeout = timeout or self.timeout or socket._GLOBAL_DEFAULT_TIMEOUT
+        opener = urllib.request.build_opener()
+
+        if proxy:
+            host_port, auth_encoded = parse_proxy(proxy)
+            proxy_url = f"http://{host_port}"
+            opener = urllib.request.build_opener(
+                urllib.request.ProxyHandler({"http": proxy_url, "https": proxy_url})
+            )
+            opener.addheaders = [
+                *opener.addheaders,
+                *(
+                    [("Proxy-Authorization", f"Basic {auth_encoded}")]
+                    if auth_encoded
+                    else []
+                ),
+            ]
+            logger.info(f"Proxy set to: {proxy_url}")
+
+        return opener.open(request, timeout=_timeout)
+
+
+class PooledResponse:
+    """A `urlopen` like response wrapper releasing its connection on close."""
+
+    def __init__(
+        self,
+        response: http.client.HTTPResponse,
+        url: str,
+        release: typing.Callable[[bool], None],
+    ):
+        self._response = response
+        self._release = release
+        self._released = False
+        self.url = url
+
+    @property
+    def status(self) -> int:
+        return self._response.status
+
+    @property
+    def code(self) -> int:
+        return self._response.status
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason
+
+    @property
+    def headers(self) -> http.client.HTTPMessage:
+        return self._response.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def info(self) -> http.client.HTTPMessage:
+        return self.headers
+
+    def getheader(self, name: str, default: typing.Any = None):
+        return self._response.getheader(name, default)
+
+    def getheaders(self):
+        return self._response.getheaders()
+
+    def read(self, *args) -> bytes:
+        return self._response.read(*args)
+
+    def close(self):
+        if self._released:
+            return
+
+        self._released = True
+        reusable = self._response.isclosed() and not self._response.will_close
+        self._response.close()
+        self._release(reusable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PooledTransport(Transport):
+    """A keep-alive transport reusing connections from per host pools.
+
+    Args:
+        pool_maxsize (int): the maximum number of idle connections kept per host.
+        timeout (float): the default socket timeout in seconds.
+        keepalive_expiry (float): discard idle connections older than this (seconds).
+        max_redirects (int): the maximum number of redirections followed.
+        ssl_context (ssl.SSLContext): the SSL context for https connections.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        timeout: float = None,
+        keepalive_expiry: float = 60.0,
+        max_redirects: int = 10,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl_context
+        self._lock = threading.Lock()
+        self._pools: typing.Dict[
+            tuple, typing.List[typing.Tuple[http.client.HTTPConnection, float]]
+        ] = {}
+
+    @property
+    def pools(self) -> typing.Dict[tuple, int]:
+        """Return the number of idle connections per pool key."""
+        with self._lock:
+            return {key: len(pool) for key, pool in self._pools.items()}
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = self._pools, {}
+
+        for pool in pools.values():
+            for connection, _ in pool:
+                connection.close()
+
+    def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ):
+        url = request.full_url
+        method = request.get_method()
+        data = request.data
+        headers = dict(request.header_items())
+
+        for _ in range(self.max_redirects + 1):
+            response = self._send(url, method, data, headers, proxy, timeout)
+
+            if response.status not in REDIRECT_CODES or not response.getheader(
+                "location"
+            ):
+                break
+
+            location = urllib.parse.urljoin(url, response.getheader("location"))
+            response.read()
+            response.close()
+
+            if response.status in (301, 302, 303) and method != "HEAD":
+                method, data = "GET", None
+                headers = {
+                    key: value
+                    for key, value in headers.items()
+                    if key.lower() not in ("content-length", "content-type")
+                }
+
+            url = location
+        else:
+            raise urllib.error.HTTPError(
+                url, response.status, "Too many redirects", response.headers, None
+            )
+
+        if response.status >= 400:
+            body = response.read()
+            response.close()
+            raise urllib.error.HTTPError(
+                url,
+                response.status,
+                response.reason,
+                response.headers,
+                io.BytesIO(body),
+            )
+
+        return response
+
+    def _send(
+        self,
+        url: str,
+        method: str,
+        data: typing.Optional[bytes],
+        headers: dict,
+        proxy: typing.Optional[str],
+        timeout: typing.Optional[float],
+    ) -> PooledResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unknown url type: {scheme}")
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port, proxy)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        _headers = {
+            "Host": parts.netloc,
+            "User-agent": USER_AGENT,
+            **({"Content-type": "application/x-www-form-urlencoded"} if data else {}),
+            **headers,
+            "Connection": "keep-alive",
+        }
+
+        if proxy and scheme == "http":
+            _, auth_encoded = parse_proxy(proxy)
+            path = url
+            if auth_encoded:
+                _headers.update({"Proxy-Authorization": f"Basic {auth_encoded}"})
+
+        connection, reused = self._checkout(key, timeout)
+
+        def exchange(connection: http.client.HTTPConnection):
+            connection.request(method, path, body=data, headers=_headers)
+            return connection.getresponse()
+
+        try:
+            try:
+                response = exchange(connection)
+            except RETRYABLE_ERRORS:
+                connection.close()
+                if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+
+                # the server closed the idle connection, retry on a fresh one.
+                # non idempotent requests are never retried as the server may
+                # have processed them before closing the connection.
+                connection = self._connect(key, timeout)
+                response = exchange(connection)
+        except OSError as e:
+            connection.close()
+            raise urllib.error.URLError(e) from e
+
+        def release(reusable: bool):
+            if reusable:
+                self._checkin(key, connection)
+            else:
+                connection.close()
+
+        return PooledResponse(response, url, release)
+
+    def _checkout(
+        self, key: tuple, timeout: typing.Optional[float]
+    ) -> typing.Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+
+        with self._lock:
+            pool = self._pools.get(key) or []
+            while pool:
+                connection, last_used = pool.pop()
+                if now - last_used <= self.keepalive_expiry:
+                    connection.timeout = (
+                        timeout or self.timeout or socket._GLOBAL_DEFAULT_TIMEOUT
+                    )
+                    if connection.sock is not None:
+                        connection.sock.settimeout(
+                            timeout or self.timeout or socket.getdefaulttimeout()
+                        )
+                    return connection, True
+
+                connection.close()
+
+        return self._connect(key, timeout), False
+
+    def _checkin(self, key: tuple, connection: http.client.HTTPConnection):
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self.pool_maxsize:
+                pool.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+    def _connect(
+        self, key: tuple, timeout: typing.Optional[float]
+    ) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        _timeout = timeout or self.timeout or socket._GLOBAL_DEFAULT_TIMEOUT
+        logger.debug(f"opening a new connection to {scheme}://{host}:{port}")
+
+        if proxy:
+            host_port, auth_encoded = parse_proxy(proxy)
+            proxy_host, _, proxy_port = host_port.partition(":")
+            proxy_port = int(proxy_port or 80)
+            logger.info(f"Proxy set to: http://{host_port}")
+
+            if scheme == "http":
+                return http.client.HTTPConnection(
+                    proxy_host, proxy_port, timeout=_timeout
+                )
+
+            connection = http.client.HTTPSConnection(
+                proxy_host, proxy_port, timeout=_timeout, context=self.ssl_context
+            )
+            connection.set_tunnel(
+                host,
+                port,
+                headers=(
+                    {"Proxy-Authorization": f"Basic {auth_encoded}"}
+                    if auth_encoded
+                    else None
+                ),
+            )
+            return connection
+
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=_timeout, context=self.ssl_context
+            )
+
+        return http.client.HTTPConnection(host, port, timeout=_timeout)
+
+
+class BufferedResponse:
+    """A `urlopen` like response holding an already received body."""
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        body: bytes,
+    ):
+        self.url = url
+        self.status = self.code = status
+        self.reason = reason
+        self.headers = headers
+        self._body = io.BytesIO(body)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def info(self) -> http.client.HTTPMessage:
+        return self.headers
+
+    def getheader(self, name: str, default: typing.Any = None):
+        return self.headers.get(name, default)
+
+    def getheaders(self):
+        return list(self.headers.items())
+
+    def read(self, *args) -> bytes:
+        return self._body.read(*args)
+
+    def close(self):
+        self._body.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AsyncTransport:
+    """The asyncio transport interface used by `lib.request_async`."""
+
+    async def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ) -> BufferedResponse:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class ThreadedAsyncTransport(AsyncTransport):
+    """Adapt a (blocking) transport by running requests in a worker thread."""
+
+    def __init__(self, transport: Transport = None):
+        self.transport = transport
+
+    async def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ) -> BufferedResponse:
+        transport = self.transport or get_transport()
+
+        def _open() -> BufferedResponse:
+            with transport.open(request, proxy=proxy, timeout=timeout) as response:
+                return BufferedResponse(
+                    response.geturl(),
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    response.read(),
+                )
+
+        return await asyncio.to_thread(_open)
+
+
+class AsyncPooledTransport(AsyncTransport):
+    """A native asyncio HTTP/1.1 transport with per host keep-alive pools.
+
+    Connections are bound to the event loop that opened them, pools are
+    therefore kept per running loop. Proxied requests are delegated to the
+    blocking transport through a worker thread.
+
+    Args:
+        pool_maxsize (int): the maximum number of idle connections kept per host.
+        timeout (float): the default request timeout in seconds.
+        keepalive_expiry (float): discard idle connections older than this (seconds).
+        max_redirects (int): the maximum number of redirections followed.
+        ssl_context (ssl.SSLContext): the SSL context for https connections.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        timeout: float = None,
+        keepalive_expiry: float = 60.0,
+        max_redirects: int = 10,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl_context
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def pools(self) -> typing.Dict[tuple, int]:
+        """Return the number of idle connections per pool key of the running loop."""
+        pools = self._pools.get(asyncio.get_running_loop()) or {}
+        return {key: len(pool) for key, pool in pools.items()}
+
+    async def close(self):
+        pools = self._pools.pop(asyncio.get_running_loop(), None) or {}
+
+        for pool in pools.values():
+            for (_, writer), _ in pool:
+                writer.close()
+
+    async def open(
+        self,
+        request: urllib.request.Request,
+        proxy: str = None,
+        timeout: float = None,
+    ) -> BufferedResponse:
+        if proxy:
+            return await ThreadedAsyncTransport().open(request, proxy, timeout)
+
+        url = request.full_url
+        method = request.get_method()
+        data = request.data
+        headers = dict(request.header_items())
+        _timeout = timeout or self.timeout
+
+        for _ in range(self.max_redirects + 1):
+            response = await asyncio.wait_for(
+                self._send(url, method, data, headers), _timeout
+            )
+            location = response.getheader("location")
+
+            if response.status not in REDIRECT_CODES or not location:
+                break
+
+            if response.status in (301, 302, 303) and method != "HEAD":
+                method, data = "GET", None
+                headers = {
+                    key: value
+                    for key, value in headers.items()
+                    if key.lower() not in ("content-length", "content-type")
+                }
+
+            url = urllib.parse.urljoin(url, location)
+        else:
+            raise urllib.error.HTTPError(
+                url, response.status, "Too many redirects", response.headers, None
+            )
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                url,
+                response.status,
+                response.reason,
+                response.headers,
+                response._body,
+            )
+
+        return response
+
+    async def _send(
+        self,
+        url: str,
+        method: str,
+        data: typing.Optional[bytes],
+        headers: dict,
+    ) -> BufferedResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unknown url type: {scheme}")
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        _headers = {
+            "Host": parts.netloc,
+            "User-agent": USER_AGENT,
+            "Accept-Encoding": "identity",
+            **({"Content-type": "application/x-www-form-urlencoded"} if data else {}),
+            **headers,
+            "Connection": "keep-alive",
+            **({"Content-Length": str(len(data))} if data is not None else {}),
+        }
+        head = "".join(
+            [
+                f"{method} {path} HTTP/1.1\r\n",
+                *(f"{name}: {value}\r\n" for name, value in _headers.items()),
+                "\r\n",
+            ]
+        ).encode("latin-1")
+
+        connection, reused = await self._checkout(key)
+
+        try:
+            try:
+                result = await self._exchange(connection, method, head, data)
+            except RETRYABLE_ERRORS + (asyncio.IncompleteReadError,):
+                connection[1].close()
+                if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+
+                # the server closed the idle connection, retry on a fresh one.
+                connection = await self._connect(key)
+                result = await self._exchange(connection, method, head, data)
+        except asyncio.IncompleteReadError as e:
+            connection[1].close()
+            raise http.client.RemoteDisconnected(
+                "Remote end closed connection without response"
+            ) from e
+        except OSError as e:
+            connection[1].close()
+            raise urllib.error.URLError(e) from e
+        except BaseException:
+            connection[1].close()
+            raise
+
+        status, reason, response_headers, body, reusable = result
+
+        if reusable:
+            self._checkin(key, connection)
+        else:
+            connection[1].close()
+
+        return BufferedResponse(url, status, reason, response_headers, body)
+
+    async def _exchange(
+        self,
+        connection: typing.Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        method: str,
+        head: bytes,
+        data: typing.Optional[bytes],
+    ) -> tuple:
+        reader, writer = connection
+        writer.write(head + (data or b""))
+        await writer.drain()
+
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise http.client.RemoteDisconnected(
+                    "Remote end closed connection without response"
+                )
+
+            version, _, rest = status_line.decode("latin-1").strip().partition(" ")
+            code, _, reason = rest.partition(" ")
+            if not version.startswith("HTTP/") or not code.isdigit():
+                raise http.client.BadStatusLine(status_line)
+
+            raw_headers = b""
+            while True:
+                line = await reader.readline()
+                raw_headers += line
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            # skip informational responses (e.g: 100 Continue)
+            if not 100 <= int(code) < 200:
+                break
+
+        status = int(code)
+        response_headers = http.client.parse_headers(io.BytesIO(raw_headers))
+        connection_header = (response_headers.get("connection") or "").lower()
+        reusable = connection_header != "close" and (
+            version != "HTTP/1.0" or connection_header == "keep-alive"
+        )
+
+        if method == "HEAD" or status in (204, 304):
+            body = b""
+        elif "chunked" in (response_headers.get("transfer-encoding") or "").lower():
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif response_headers.get("content-length") is not None:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await reader.read()
+            reusable = False
+
+        return status, reason, response_headers, body, reusable
+
+    async def _checkout(self, key: tuple) -> typing.Tuple[tuple, bool]:
+        now = time.monotonic()
+        pool = self._pools.setdefault(asyncio.get_running_loop(), {}).get(key) or []
+
+        while pool:
+            connection, last_used = pool.pop()
+            if now - last_used <= self.keepalive_expiry and not connection[0].at_eof():
+                return connection, True
+
+            connection[1].close()
+
+        return await self._connect(key), False
+
+    def _checkin(self, key: tuple, connection: tuple):
+        pools = self._pools.setdefault(asyncio.get_running_loop(), {})
+        pool = pools.setdefault(key, [])
+
+        if len(pool) < self.pool_maxsize:
+            pool.append((connection, time.monotonic()))
+        else:
+            connection[1].close()
+
+    async def _connect(self, key: tuple) -> tuple:
+        scheme, host, port = key
+        logger.debug(f"opening a new connection to {scheme}://{host}:{port}")
+
+        if scheme == "https":
+            return await asyncio.open_connection(
+                host,
+                port,
+                ssl=self.ssl_context or ssl._create_default_https_context(),
+                server_hostname=host,
+            )
+
+        return await asyncio.open_connection(host, port)
+
+
+_default_transport: Transport = PooledTransport()
+_default_async_transport: AsyncTransport = AsyncPooledTransport()
+
+
+def get_transport() -> Transport:
+    """Return the process wide default transport used by `lib.request`."""
+    return _default_transport
+
+
+def set_transport(transport: Transport) -> Transport:
+    """Replace the process wide default transport used by `lib.request`.
+
+    Returns the previous transport (closing it is left to the caller).
+    """
+    global _default_transport
+    previous, _default_transport = _default_transport, transport
+
+    return previous
+
+
+def get_async_transport() -> AsyncTransport:
+    """Return the process wide default transport used by `lib.request_async`."""
+    return _default_async_transport
+
+
+def set_async_transport(transport: AsyncTransport) -> AsyncTransport:
+    """Replace the process wide default transport used by `lib.request_async`.
+
+    Returns the previous transport (closing it is left to the caller).
+    """
+    global _default_async_transport
+    previous, _default_async_transport = _default_async_transport, transport
+
+    return previous
@@ -1,5 +1,7 @@
 import typing
 import base64
+import asyncio
+import inspect
 import PyPDF2
 import logging
 import datetime
@@ -23,8 +25,21 @@ Body = utils.Body
 Element = utils.Element
 Tracer = utils.Tracer
 Trace = utils.Trace
+Record = utils.Record
+Span = utils.Span
+SpanExporter = utils.SpanExporter
+InMemoryExporter = utils.InMemoryExporter
+LoggingExporter = utils.LoggingExporter
+OpenTelemetryExporter = utils.OpenTelemetryExporter
 Cache = utils.Cache
 Job = utils.Job
+Transport = utils.Transport
+UrllibTransport = utils.UrllibTransport
+PooledTransport = utils.PooledTransport
+AsyncTransport = utils.AsyncTransport
+AsyncPooledTransport = utils.AsyncPooledTransport
+ThreadedAsyncTransport = utils.ThreadedAsyncTransport
+BackgroundExecutor = utils.BackgroundExecutor
 OptionEnum = utils.OptionEnum
 Enum = utils.Enum
 Flag = utils.Flag
@@ -760,6 +775,112 @@ def run_asynchronously(
     return utils.exec_async(predicate, sequence)
 
 
+def run_with_timeout(
+    predicate: typing.Callable,
+    sequence: typing.List[S],
+    timeouts: typing.List[typing.Optional[float]],
+) -> typing.List[T]:
+    """Run the predicate concurrently on the sequence items, returning a
+    `TimeoutError` in place of the results not ready within their timeout.
+
+    Example:
+        results = run_with_timeout(fetch, gateways, timeouts=[2.0, None])
+    """
+    return utils.exec_with_timeout(predicate, sequence, timeouts)
+
+
+def run_as_completed(
+    predicate: typing.Callable,
+    sequence: typing.List[S],
+    timeouts: typing.List[typing.Optional[float]] = None,
+) -> typing.Iterator[typing.Tuple[int, T]]:
+    """Run the predicate concurrently on the sequence items and yield the
+    `(index, result)` pairs as they complete (`TimeoutError` past a timeout).
+
+    Example:
+        for index, rates in run_as_completed(fetch, gateways, timeouts=[2.0, None]):
+            print(gateways[index], rates)
+    """
+    return utils.exec_as_completed(predicate, sequence, timeouts)
+
+
+def run_sync(value: typing.Union[T, typing.Awaitable[T]]) -> T:
+    """Return the value, running it to completion first if it is a coroutine.
+
+    Example:
+        response = run_sync(proxy.get_rates(request))  # sync or async proxy
+
+    :param value: a value or an awaitable.
+    :return: the (awaited) value.
+    """
+    return utils.run_sync(value)
+
+
+def get_executor() -> utils.BackgroundExecutor:
+    """Return the shared executor running the SDK background work
+    (cache and tracer).
+
+    Example:
+        lib.get_executor().stats  # {"queued": 0, "running": 2, ...}
+    """
+    return utils.get_executor()
+
+
+def set_executor(executor: utils.BackgroundExecutor) -> utils.BackgroundExecutor:
+    """Set the shared executor running the SDK background work (cache, tracer).
+
+    Example:
+        lib.set_executor(lib.BackgroundExecutor(max_workers=0))  # run inline
+
+    :param executor: the new shared executor.
+    :return: the previous executor.
+    """
+    return utils.set_executor(executor)
+
+
+def get_network_executor() -> utils.BackgroundExecutor:
+    """Return the shared executor running the carrier calls fan-out
+    (`run_asynchronously`, `run_concurently` and `run_as_completed`).
+
+    Example:
+        lib.get_network_executor().stats  # {"queued": 0, "running": 8, ...}
+    """
+    return utils.get_network_executor()
+
+
+def set_network_executor(
+    executor: utils.BackgroundExecutor,
+) -> utils.BackgroundExecutor:
+    """Set the shared executor running the carrier calls fan-out.
+
+    Example:
+        lib.set_network_executor(lib.BackgroundExecutor(max_workers=128))
+
+    :param executor: the new shared network executor.
+    :return: the previous network executor.
+    """
+    return utils.set_network_executor(executor)
+
+
+async def to_async(
+    predicate: typing.Callable[..., typing.Union[T, typing.Awaitable[T]]],
+    *args,
+    **kwargs,
+) -> T:
+    """Await a coroutine function or run a blocking callable in a worker thread.
+
+    Example:
+        response = await to_async(proxy.get_rates, request)  # sync or async proxy
+
+    :param predicate: a coroutine function or a blocking callable.
+    :return: the callable result.
+    """
+    if inspect.iscoroutinefunction(predicate):
+        return await predicate(*args, **kwargs)
+
+    return await asyncio.to_thread(predicate, *args, **kwargs)
+
+
 # endregion
 
 # -----------------------------------------------------------
@@ -774,6 +895,8 @@ def request(
     on_error: typing.Callable = None,
     trace: typing.Callable[[typing.Any, str], typing.Any] = None,
     proxy: str = None,
+    timeout: float = None,
+    transport: utils.Transport = None,
     **kwargs,
 ) -> str:
     return utils.request(
@@ -782,10 +905,65 @@ def request(
         on_error=on_error,
         trace=trace,
         proxy=proxy,
+        timeout=timeout,
+        transport=transport,
+        **kwargs,
+    )
+
+
+def get_transport() -> utils.Transport:
+    """Return the default HTTP transport used by `lib.request`."""
+    return utils.get_transport()
+
+
+def set_transport(transport: utils.Transport) -> utils.Transport:
+    """Set the default HTTP transport used by `lib.request`.
+
+    Example:
+        lib.set_transport(lib.PooledTransport(pool_maxsize=20, timeout=30))
+
+    :param transport: the new default transport.
+    :return: the previous default transport.
+    """
+    return utils.set_transport(transport)
+
+
+async def request_async(
+    decoder: typing.Callable = utils.decode_bytes,
+    on_ok: typing.Callable = None,
+    on_error: typing.Callable = None,
+    trace: typing.Callable[[typing.Any, str], typing.Any] = None,
+    proxy: str = None,
+    timeout: float = None,
+    transport: utils.AsyncTransport = None,
+    **kwargs,
+) -> str:
+    """Send an HTTP request on the running event loop (asyncio variant of `request`).
+
+    Example:
+        response = await lib.request_async(url=f"{settings.server_url}/rates", ...)
+    """
+    return await utils.request_async(
+        decoder=decoder,
+        on_ok=on_ok,
+        on_error=on_error,
+        trace=trace,
+        proxy=proxy,
+        timeout=timeout,
+        transport=transport,
         **kwargs,
     )
 
 
+def set_async_transport(transport: utils.AsyncTransport) -> utils.AsyncTransport:
+    """Set the default HTTP transport used by `lib.request_async`.
+
+    :param transport: the new default async transport.
+    :return: the previous default async transport.
+    """
+    return utils.set_async_transport(transport)
+
+
 # endregion
 
 # -----------------------------------------------------------
@@ -830,6 +1008,16 @@ def zpl_to_pdf(
     return utils.zpl_to_pdf(zpl_str, width, height, dpmm=dpmm)
 
 
+def zpl_to_png(
+    zpl_str: str,
+    width: int,
+    height: int,
+    dpmm: int = 12,
+) -> str:
+    """Return a PNG base64 string from a ZPL string."""
+    return utils.zpl_to_png(zpl_str, width, height, dpmm=dpmm)
+
+
 def bundle_base64(
     base64_strings: typing.List[str],
     format: str = "PDF",
@@ -837,6 +1025,15 @@ def bundle_base64(
     return utils.bundle_base64(base64_strings, format=format)
 
 
+def write_bundle(
+    documents: typing.Iterable[typing.Union[str, bytes]],
+    sink: typing.IO[bytes],
+    format: str = "PDF",
+) -> typing.IO[bytes]:
+    """Write a bundle of base64 (or bytes) documents to a file-like sink."""
+    return utils.write_bundle(documents, sink, format=format)
+
+
 def to_buffer(
     base64_string: str,
     **kwargs,
@@ -881,4 +1078,21 @@ def failsafe(callable: typing.Callable[[], T], warning: str = None) -> T:
     return utils.failsafe(callable, warning=warning)
 
 
+def add_span_exporter(exporter: utils.SpanExporter) -> utils.SpanExporter:
+    """Register an exporter receiving the timing spans of the SDK operations.
+
+    Example:
+        lib.add_span_exporter(lib.LoggingExporter())
+
+    :param exporter: the exporter used by every tracer created without exporters.
+    :return: the registered exporter.
+    """
+    return utils.add_exporter(exporter)
+
+
+def remove_span_exporter(exporter: utils.SpanExporter) -> None:
+    """Unregister a span exporter previously added with `add_span_exporter`."""
+    utils.remove_exporter(exporter)
+
+
 # endregion
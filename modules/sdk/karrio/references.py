@@ -4,6 +4,8 @@ import attr
 import pydoc
 import typing
 import pkgutil
+import importlib
+import threading
 
 import karrio.lib as lib
 import karrio.mappers as mappers
@@ -14,6 +16,8 @@ import karrio.core.metadata as metadata
 PROVIDERS = None
 PROVIDERS_DATA = None
 REFERENCES = None
+LOADED_PROVIDERS: typing.Dict[str, metadata.Metadata] = {}
+PROVIDERS_LOCK = threading.RLock()
 COMMON_FIELDS = [
     "id",
     "test_mode",
@@ -27,22 +31,70 @@ COMMON_FIELDS = [
 
 def import_extensions() -> typing.Dict[str, metadata.Metadata]:
     global PROVIDERS
-    modules = {
-        name: __import__(f"{mappers.__name__}.{name}", fromlist=[name])
-        for _, name, _ in pkgutil.iter_modules(mappers.__path__)
-    }
+    with PROVIDERS_LOCK:
+        modules = {
+            name: __import__(f"{mappers.__name__}.{name}", fromlist=[name])
+            for _, name, _ in pkgutil.iter_modules(mappers.__path__)
+        }
 
-    PROVIDERS = {
-        carrier_name: module.METADATA for carrier_name, module in modules.items()
-    }
+        PROVIDERS = {
+            carrier_name: module.METADATA for carrier_name, module in modules.items()
+        }
+        LOADED_PROVIDERS.update(PROVIDERS)
 
     return PROVIDERS
 
 
+def get_providers() -> typing.Dict[str, metadata.Metadata]:
+    """Return all installed providers metadata, scanning the mappers only once."""
+    if PROVIDERS is None:
+        with PROVIDERS_LOCK:
+            if PROVIDERS is None:
+                import_extensions()
+
+    return typing.cast(typing.Dict[str, metadata.Metadata], PROVIDERS)
+
+
+def get_provider(carrier_name: str) -> metadata.Metadata:
+    """Return a provider metadata, importing only its mapper on first use.
+
+    Raises a KeyError if no mapper is installed for the carrier.
+    """
+    provider = LOADED_PROVIDERS.get(carrier_name)
+    if provider is not None:
+        return provider
+
+    if PROVIDERS is not None or not str(carrier_name).isidentifier():
+        return get_providers()[carrier_name]
+
+    module_name = f"{mappers.__name__}.{carrier_name}"
+    with PROVIDERS_LOCK:
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise KeyError(carrier_name) from e
+
+        return LOADED_PROVIDERS.setdefault(carrier_name, module.METADATA)
+
+
+def refresh_extensions() -> typing.Dict[str, metadata.Metadata]:
+    """Rescan the installed mappers (e.g. after a plugin install) and reset
+    the providers data and references computed from them.
+    """
+    global PROVIDERS, PROVIDERS_DATA, REFERENCES
+    with PROVIDERS_LOCK:
+        importlib.invalidate_caches()
+        LOADED_PROVIDERS.clear()
+        PROVIDERS = PROVIDERS_DATA = REFERENCES = None
+
+        return import_extensions()
+
+
 def collect_providers_data() -> typing.Dict[str, dict]:
     global PROVIDERS_DATA
-    if PROVIDERS is None:
-        import_extensions()
+    get_providers()
 
     PROVIDERS_DATA = {
         "universal": dict(
@@ -0,0 +1,172 @@
+"""Karrio universal rate sheet batch rating.
+
+Rate many packages against many destinations at once. Each service level is
+evaluated column-wise over all the packages: the restrictions are compared
+against the package measures converted once per unit, the location zones are
+resolved once per distinct destination and the best fit zone once per
+distinct (destination, weight) pair.
+"""
+
+import attr
+import typing
+import operator
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+import karrio.universal.providers.rating.index as index
+from karrio.universal.providers.rating.utils import RatingMixinSettings
+
+RateRow = typing.List[typing.Optional[float]]
+
+
+@attr.s(auto_attribs=True)
+class RateMatrix:
+    """The rates of a package: one row per destination, one column per service."""
+
+    package: str
+    services: typing.List[str]
+    currencies: typing.List[typing.Optional[str]]
+    rates: typing.List[RateRow]
+
+
+def rate_matrices(
+    settings: RatingMixinSettings,
+    parcels: typing.List[models.Parcel],
+    destinations: typing.List[models.Address],
+    shipper: typing.Optional[models.Address] = None,
+    services: typing.List[str] = None,
+) -> typing.List[RateMatrix]:
+    """Return the rate matrix of every parcel against every destination.
+
+    A rate is None when the service does not cover the destination, the
+    package exceeds the service restrictions or no zone matches.
+    """
+    packages = lib.to_packages(parcels)
+    recipients = [lib.to_address(_) for _ in destinations]
+    origin_country = getattr(shipper, "country_code", None)
+    selected_services = [
+        service
+        for service in settings.shipping_services
+        if service.active
+        and (not any(services or []) or service.service_code in services)
+    ]
+
+    # destination coverage: one flag per destination
+    has_origin = any([origin_country, settings.account_country_code])
+    domiciles = [
+        bool(has_origin)
+        and (
+            origin_country == recipient.country_code
+            or settings.account_country_code == recipient.country_code
+        )
+        for recipient in recipients
+    ]
+
+    # service columns: one list per service with one value per package
+    columns = [
+        evaluate_service(service, packages, recipients, domiciles)
+        for service in selected_services
+    ]
+
+    return [
+        RateMatrix(
+            package=f"{package.parcel.id or idx}",
+            services=[_.service_code for _ in selected_services],
+            currencies=[_.currency for _ in selected_services],
+            rates=[
+                [column[row][position] for column in columns]
+                for row in range(len(recipients))
+            ],
+        )
+        for position, (idx, package) in enumerate(enumerate(packages, 1))
+    ]
+
+
+def evaluate_service(
+    service: models.ServiceLevel,
+    packages: typing.List[units.Package],
+    recipients: typing.List[units.ComputedAddress],
+    domiciles: typing.List[bool],
+) -> typing.List[RateRow]:
+    """Return the service rates as rows of destinations by packages."""
+    sheet = index.compile_service(service)
+    weights = measures(packages, "weight", service.weight_unit)
+    restrictions = [
+        ("weight", sheet.max_weight, operator.le),
+        ("weight", sheet.min_weight, operator.ge),
+        ("length", sheet.max_length, operator.le),
+        ("height", sheet.max_height, operator.le),
+        ("width", sheet.max_width, operator.le),
+    ]
+
+    # packages fitting the service restrictions
+    fits = [True] * len(packages)
+    for measure, limit, compare in restrictions:
+        if limit is None:
+            continue
+
+        values = (
+            weights
+            if measure == "weight"
+            else measures(packages, measure, service.dimension_unit)
+        )
+        fits = [fit and compare(value, limit) for fit, value in zip(fits, values)]
+
+    locations: typing.Dict[tuple, typing.List[int]] = {}
+    zones: typing.Dict[tuple, typing.Optional[models.ServiceZone]] = {}
+
+    def rate(location: tuple, weight: typing.Optional[float]):
+        if (location, weight) not in zones:
+            zones[(location, weight)] = sheet.best_fit(
+                sheet.weight_zones(locations[location], weight)
+            )
+
+        zone = zones[(location, weight)]
+        return zone.rate if zone is not None else None
+
+    rows: typing.List[RateRow] = []
+    for recipient, is_domicile in zip(recipients, domiciles):
+        if not covers(service, is_domicile):
+            rows.append([None] * len(packages))
+            continue
+
+        location = (
+            recipient.country_code,
+            recipient.city.lower() if recipient.city is not None else None,
+            (
+                str(recipient.postal_code).lower()
+                if recipient.postal_code is not None
+                else None
+            ),
+        )
+        if location not in locations:
+            locations[location] = sheet.location_zones(recipient)
+
+        rows.append(
+            [
+                rate(location, weight) if fit else None
+                for fit, weight in zip(fits, weights)
+            ]
+        )
+
+    return rows
+
+
+def measures(
+    packages: typing.List[units.Package],
+    measure: str,
+    unit: typing.Optional[str],
+) -> list:
+    """Return the package measures converted in the service unit."""
+    if unit is None:
+        return [None] * len(packages)
+
+    return [getattr(package, measure)[unit] for package in packages]
+
+
+def covers(service: models.ServiceLevel, is_domicile: bool) -> bool:
+    return (
+        (service.domicile is True and is_domicile)
+        or (service.international is True and not is_domicile)
+        or (service.domicile is None and service.international is None)
+    )
@@ -0,0 +1,225 @@
+"""Karrio universal rate sheet index.
+
+A service level is compiled once into hashed location lookups (country,
+city and postal code sets), sorted weight brackets and restrictions already
+converted to the service units. The compiled index is cached for as long as
+the service level (and its zones list) is alive, i.e. per rate sheet version
+since the carrier settings are rebuilt when the rate sheet changes.
+"""
+
+import bisect
+import typing
+import weakref
+import threading
+import karrio.core.units as units
+import karrio.core.models as models
+
+EMPTY: typing.FrozenSet[int] = frozenset()
+
+
+class ServiceIndex:
+    """A compiled service level rate sheet."""
+
+    def __init__(self, service: models.ServiceLevel):
+        # no reference to the service is kept so that the cache follows its lifetime
+        self.version = sheet_version(service)
+        self.zones: typing.List[models.ServiceZone] = list(service.zones or [])
+
+        # service restrictions converted in the service units
+        self.max_length = dimension(service.max_length, service.dimension_unit)
+        self.max_height = dimension(service.max_height, service.dimension_unit)
+        self.max_width = dimension(service.max_width, service.dimension_unit)
+        self.min_weight = weight(service.min_weight, service.weight_unit)
+        self.max_weight = weight(service.max_weight, service.weight_unit)
+
+        # hashed locations: value -> zone indexes, plus the zones covering any
+        self.countries, self.any_country = index_locations(
+            self.zones, lambda zone: zone.country_codes, lambda _: _
+        )
+        self.cities, self.any_city = index_locations(
+            self.zones, lambda zone: zone.cities, lambda _: _.lower()
+        )
+        self.postal_codes, self.any_postal_code = index_locations(
+            self.zones, lambda zone: zone.postal_codes, lambda _: str(_).lower()
+        )
+
+        # sorted weight brackets in the service weight unit
+        self.min_weights, self.min_ranks = index_weights(
+            self.zones, lambda zone: zone.min_weight, service.weight_unit
+        )
+        self.max_weights, self.max_ranks = index_weights(
+            self.zones, lambda zone: zone.max_weight, service.weight_unit
+        )
+
+    def candidate_zones(
+        self, recipient: units.ComputedAddress, package_weight: float
+    ) -> typing.List[int]:
+        """Return the indexes of the zones covering the recipient and weight."""
+        return self.weight_zones(self.location_zones(recipient), package_weight)
+
+    def location_zones(self, recipient: units.ComputedAddress) -> typing.List[int]:
+        """Return the indexes of the zones covering the recipient location."""
+        countries = self.countries.get(recipient.country_code, EMPTY)
+        cities = (
+            self.cities.get(recipient.city.lower(), EMPTY)
+            if recipient.city is not None
+            else EMPTY
+        )
+        postal_codes = (
+            self.postal_codes.get(str(recipient.postal_code).lower(), EMPTY)
+            if recipient.postal_code is not None
+            else EMPTY
+        )
+
+        # start from the most selective location and probe the others
+        locations = sorted(
+            [
+                (countries, self.any_country),
+                (cities, self.any_city),
+                (postal_codes, self.any_postal_code),
+            ],
+            key=lambda location: len(location[0]) + len(location[1]),
+        )
+        (first, first_any), *others = locations
+
+        return [
+            index
+            for index in first | first_any
+            if all(index in values or index in any_ for values, any_ in others)
+        ]
+
+    def weight_zones(
+        self, candidates: typing.Iterable[int], package_weight: float
+    ) -> typing.List[int]:
+        """Return the sorted candidate zone indexes covering the package weight."""
+        # zones ranked below the package weight position in the sorted brackets
+        above_min = bisect.bisect_right(self.min_weights, package_weight)
+        below_max = bisect.bisect_left(self.max_weights, package_weight)
+
+        return sorted(
+            index
+            for index in candidates
+            if self.min_ranks.get(index, -1) < above_min
+            and self.max_ranks.get(index, below_max) >= below_max
+        )
+
+    def select_zone(
+        self, recipient: units.ComputedAddress, package_weight: float
+    ) -> typing.Optional[models.ServiceZone]:
+        """Return the best fit zone among the ones covering the recipient and weight."""
+        return self.best_fit(self.candidate_zones(recipient, package_weight))
+
+    def best_fit(
+        self, candidates: typing.List[int]
+    ) -> typing.Optional[models.ServiceZone]:
+        """Return the best fit zone among the sorted candidate zone indexes."""
+        selected_zone: typing.Optional[models.ServiceZone] = None
+
+        for index in candidates:
+            zone = self.zones[index]
+
+            # Check if best fit zone is selected
+            _best_fit_zone_selected = (
+                selected_zone is not None
+                and selected_zone.max_weight is not None
+                and (
+                    selected_zone.rate < zone.rate
+                    or (
+                        selected_zone.max_weight is not None
+                        and zone.max_weight is not None
+                        and selected_zone.max_weight < zone.max_weight
+                    )
+                    or (
+                        selected_zone.min_weight is not None
+                        and zone.min_weight is not None
+                        and selected_zone.min_weight < zone.min_weight
+                    )
+                )
+            )
+
+            if _best_fit_zone_selected is False:
+                selected_zone = zone
+
+        return selected_zone
+
+
+_INDEXES: typing.Dict[int, typing.Tuple[weakref.ref, ServiceIndex]] = {}
+_LOCK = threading.Lock()
+
+
+def compile_service(service: models.ServiceLevel) -> ServiceIndex:
+    """Return the compiled index of a service level, compiling it on first use."""
+    key = id(service)
+    cached = _INDEXES.get(key)
+
+    if (
+        cached is not None
+        and cached[0]() is service
+        and cached[1].version == sheet_version(service)
+    ):
+        return cached[1]
+
+    compiled = ServiceIndex(service)
+
+    with _LOCK:
+        _INDEXES[key] = (
+            weakref.ref(service, lambda _: _INDEXES.pop(key, None)),
+            compiled,
+        )
+
+    return compiled
+
+
+def sheet_version(service: models.ServiceLevel) -> typing.Tuple[int, int]:
+    return id(service.zones), len(service.zones or [])
+
+
+def dimension(value: typing.Optional[float], unit: str) -> typing.Optional[float]:
+    return units.Dimension(value, unit).value if value is not None else None
+
+
+def weight(value: typing.Optional[float], unit: str) -> typing.Optional[float]:
+    return units.Weight(value, unit).value if value is not None else None
+
+
+def index_locations(
+    zones: typing.List[models.ServiceZone],
+    values: typing.Callable[[models.ServiceZone], typing.Optional[list]],
+    normalize: typing.Callable[[typing.Any], typing.Any],
+) -> typing.Tuple[
+    typing.Dict[typing.Any, typing.FrozenSet[int]], typing.FrozenSet[int]
+]:
+    locations: typing.Dict[typing.Any, typing.Set[int]] = {}
+    any_location: typing.Set[int] = set()
+
+    for index, zone in enumerate(zones):
+        # a zone without location restriction covers any location
+        if not any(values(zone) or []):
+            any_location.add(index)
+            continue
+
+        for value in values(zone):
+            locations.setdefault(normalize(value), set()).add(index)
+
+    return (
+        {key: frozenset(value) for key, value in locations.items()},
+        frozenset(any_location),
+    )
+
+
+def index_weights(
+    zones: typing.List[models.ServiceZone],
+    values: typing.Callable[[models.ServiceZone], typing.Optional[float]],
+    unit: str,
+) -> typing.Tuple[typing.List[float], typing.Dict[int, int]]:
+    """Return the sorted weight brackets and the rank of each bounded zone."""
+    brackets = sorted(
+        (weight(values(zone), unit), index)
+        for index, zone in enumerate(zones)
+        if values(zone) is not None
+    )
+
+    return (
+        [value for value, _ in brackets],
+        {index: rank for rank, (_, index) in enumerate(brackets)},
+    )
@@ -24,6 +24,7 @@ setup(
         "phonenumbers",
         "python-barcode",
         "PyPDF2",
+        "qrcode",
     ],
     classifiers=[
         "Intended Audience :: Developers",
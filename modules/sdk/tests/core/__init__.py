@@ -1,2 +1,17 @@
 from .test_universal_rate import *
 from .test_universal_shipment import *
+from .test_transport import *
+from .test_async import *
+from .test_dict import *
+from .test_executor import *
+from .test_caching import *
+from .test_references import *
+from .test_imports import *
+from .test_rating_deadline import *
+from .test_rating_stream import *
+from .test_enum import *
+from .test_units import *
+from .test_zpl import *
+from .test_bundle import *
+from .test_renderer import *
+from .test_tracing import *
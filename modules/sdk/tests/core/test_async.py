@@ -0,0 +1,170 @@
+import attr
+import typing
+import asyncio
+import unittest
+import threading
+import http.server
+import karrio.lib as lib
+import karrio.api.proxy as proxy
+import karrio.api.mapper as mapper
+import karrio.api.gateway as gateway
+import karrio.core.models as models
+import karrio.core.settings as settings
+from karrio.api.interface import Rating, Tracking
+from .test_transport import StandInHandler
+
+
+@attr.s(auto_attribs=True)
+class Settings(settings.Settings):
+    url: str = None
+
+    @property
+    def carrier_name(self):
+        return "stand_in"
+
+
+class Mapper(mapper.Mapper):
+    def create_rate_request(self, payload: models.RateRequest) -> lib.Serializable:
+        return lib.Serializable(payload, lambda _: '{"weight": 1}')
+
+    def parse_rate_response(self, response: lib.Deserializable):
+        data = response.deserialize()
+        return (
+            [
+                models.RateDetails(
+                    carrier_id=self.settings.carrier_id,
+                    carrier_name=self.settings.carrier_name,
+                    service=data["path"].strip("/"),
+                    total_charge=10.0,
+                    currency="USD",
+                )
+            ],
+            [],
+        )
+
+
+class SyncProxy(proxy.Proxy):
+    def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        response = lib.request(
+            url=f"{self.settings.url}/sync_rates",
+            data=request.serialize(),
+            method="POST",
+        )
+
+        return lib.Deserializable(response, lib.to_dict)
+
+
+class AsyncProxy(proxy.AsyncProxy):
+    async def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        response = await lib.request_async(
+            url=f"{self.settings.url}/async_rates",
+            data=request.serialize(),
+            method="POST",
+        )
+
+        return lib.Deserializable(response, lib.to_dict)
+
+
+def create_gateway(carrier_id: str, proxy_type: typing.Type, url: str):
+    _settings = Settings(carrier_id=carrier_id, url=url)
+    _tracer = lib.Tracer()
+
+    return gateway.Gateway(
+        is_hub=False,
+        tracer=_tracer,
+        settings=_settings,
+        mapper=Mapper(_settings),
+        proxy=proxy_type(_settings, tracer=_tracer),
+    )
+
+
+class TestAsyncFluentAPI(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.connections = set()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.sync_gateway = create_gateway("sync", SyncProxy, cls.url)
+        cls.async_gateway = create_gateway("async", AsyncProxy, cls.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def test_rating_from_async(self):
+        request = Rating.fetch(RateRequest)
+        rates, messages = await (
+            await request.from_async(self.async_gateway, self.sync_gateway)
+        ).parse_async()
+
+        self.assertListEqual(messages, [])
+        self.assertListEqual(
+            sorted([(_.carrier_id, _.service) for _ in rates]),
+            [("async", "async_rates"), ("sync", "sync_rates")],
+        )
+
+    async def test_rating_from_sync_within_running_loop(self):
+        rates, messages = (
+            Rating.fetch(RateRequest)
+            .from_(self.async_gateway, self.sync_gateway)
+            .parse()
+        )
+
+        self.assertListEqual(messages, [])
+        self.assertEqual(len(rates), 2)
+
+    async def test_unsupported_operation_from_async(self):
+        tracking, messages = await (
+            await Tracking.fetch(dict(tracking_numbers=["123"])).from_async(
+                self.async_gateway
+            )
+        ).parse_async()
+
+        self.assertIsNone(tracking)
+        self.assertEqual(messages[0].code, "SHIPPING_SDK_NON_SUPPORTED_ERROR")
+
+    async def test_run_asynchronously_within_running_loop(self):
+        results = lib.run_asynchronously(lambda x: x * 2, [1, 2, 3])
+
+        self.assertListEqual(results, [2, 4, 6])
+
+    async def test_run_sync_within_running_loop_on_network_executor(self):
+        async def thread_name():
+            return threading.current_thread().name
+
+        self.assertTrue(lib.run_sync(thread_name()).startswith("karrio-network"))
+
+
+class TestSyncFluentAPI(unittest.TestCase):
+    def test_async_proxy_from_sync(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        server.connections = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            rates, messages = (
+                Rating.fetch(RateRequest)
+                .from_(create_gateway("async", AsyncProxy, url))
+                .parse()
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertListEqual(messages, [])
+        self.assertEqual(rates[0].service, "async_rates")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+RateRequest = {
+    "shipper": {"postal_code": "H3N1S4", "country_code": "CA"},
+    "recipient": {"postal_code": "89109", "country_code": "US"},
+    "parcels": [{"weight": 1.0, "weight_unit": "KG"}],
+}
@@ -0,0 +1,71 @@
+import io
+import base64
+import unittest
+import PyPDF2
+from PIL import Image
+import karrio.lib as lib
+
+
+def encode_image(size: tuple, mode: str = "1", format: str = "PNG") -> str:
+    buffer = io.BytesIO()
+    Image.new(mode, size, 0).save(buffer, format)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+class TestDocumentBundling(unittest.TestCase):
+    def setUp(self):
+        self.images = [encode_image((40, 60)), encode_image((30, 20))]
+        self.pdfs = [
+            lib.image_to_pdf(encode_image((40, 60), "L")),
+            lib.image_to_pdf(encode_image((40, 60), "L")),
+            lib.image_to_pdf(encode_image((40, 60), "L")),
+        ]
+
+    def test_pdf_bundle(self):
+        sink = lib.write_bundle(iter(self.pdfs), io.BytesIO())
+        sink.seek(0)
+
+        self.assertEqual(len(PyPDF2.PdfReader(sink).pages), 3)
+
+    def test_zpl_bundle_is_written_incrementally(self):
+        documents = (
+            base64.b64encode(f"^XA^FD{index}^FS^XZ".encode()).decode()
+            for index in range(3)
+        )
+        sink = io.BytesIO()
+        lib.write_bundle(documents, sink, format="ZPL")
+
+        self.assertEqual(
+            sink.getvalue().decode(),
+            lib.bundle_zpls(
+                [
+                    base64.b64encode(f"^XA^FD{index}^FS^XZ".encode()).decode()
+                    for index in range(3)
+                ]
+            ),
+        )
+
+    def test_image_bundle_keeps_color_mode(self):
+        image = lib.bundle_imgs(self.images)
+
+        self.assertEqual(image.mode, "1")
+        self.assertEqual(image.size, (40, 80))
+
+    def test_image_bundle_with_mixed_modes(self):
+        image = lib.bundle_imgs([*self.images, encode_image((10, 10), "RGBA")])
+
+        self.assertEqual(image.mode, "RGB")
+        self.assertEqual(image.size, (40, 90))
+
+    def test_bytes_documents(self):
+        documents = [base64.b64decode(_) for _ in self.images]
+        sink = lib.write_bundle(documents, io.BytesIO(), format="PNG")
+
+        self.assertEqual(
+            base64.b64encode(sink.getvalue()).decode(),
+            lib.bundle_base64(self.images, format="PNG"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
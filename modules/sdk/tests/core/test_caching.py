@@ -0,0 +1,94 @@
+import time
+import threading
+import unittest
+import karrio.lib as lib
+from karrio.core.utils.caching import AbstractCache
+
+
+class SystemCache(AbstractCache):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key: str):
+        return self.values.get(key)
+
+    def set(self, key: str, value, timeout: int = None):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        self.values.pop(key, None)
+
+
+class TestCache(unittest.TestCase):
+    def test_entry_expiry(self):
+        cache = lib.Cache()
+        cache.set("token", "value", timeout=0.05)
+
+        self.assertEqual(cache.get("token"), "value")
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("token"))
+        self.assertNotIn("token", cache)
+
+    def test_lru_eviction(self):
+        cache = lib.Cache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_single_flight_loading(self):
+        cache = lib.Cache()
+        calls = []
+
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return dict(access_token="token")
+
+        def access_token(_):
+            if "auth" not in cache:
+                cache.set("auth", login)
+
+            return cache.get("auth")["access_token"]
+
+        results = lib.run_concurently(access_token, list(range(20)), max_workers=20)
+
+        self.assertListEqual(results, ["token"] * 20)
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_load_is_retried(self):
+        cache = lib.Cache()
+        cache.set("auth", lambda: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            cache.get("auth")
+
+        self.assertIsNone(cache.get("auth"))
+
+    def test_two_tier_cache(self):
+        system_cache = SystemCache()
+        cache = lib.Cache(system_cache, auth=lambda: dict(access_token="token"))
+
+        self.assertEqual(cache.get("auth"), dict(access_token="token"))
+        self.assertDictEqual(system_cache.values, dict(auth=dict(access_token="token")))
+
+        other_process_cache = lib.Cache(system_cache)
+        system_cache.values.update(shared="value")
+
+        self.assertEqual(other_process_cache.get("auth"), dict(access_token="token"))
+        self.assertEqual(other_process_cache.get("shared"), "value")
+
+        cache.delete("auth")
+        self.assertNotIn("auth", system_cache.values)
+
+    def test_cache_is_truthy_when_empty(self):
+        self.assertTrue(lib.Cache())
+
+
+if __name__ == "__main__":
+    unittest.main()
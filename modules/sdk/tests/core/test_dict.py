@@ -0,0 +1,129 @@
+import json
+import enum
+import attr
+import typing
+import unittest
+import jstruct.utils as jstruct
+from unittest import mock
+import karrio.lib as lib
+import karrio.core.models as models
+from karrio.core.utils import DP
+
+
+class Color(enum.Enum):
+    red = "RED"
+
+
+class Size(lib.StrEnum):
+    small = "S"
+
+
+@attr.s(auto_attribs=True)
+class Tagged:
+    tags: set = set()
+    color: Color = Color.red
+    handler: typing.Callable = None
+
+
+class Plain:
+    def __init__(self):
+        self.size = Size.small
+        self.values = (1, 2.5, None)
+        self.empty = ""
+
+
+def round_trip(entity, clear_empty=None):
+    return json.loads(
+        DP.jsonify(entity),
+        object_hook=lambda d: {
+            k: v
+            for k, v in d.items()
+            if (v not in (None, [], "") if clear_empty is not False else True)
+        },
+    )
+
+
+class TestDictParse(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def test_to_dict_matches_json_round_trip(self):
+        for entity in [RateDetails, ShipmentDetails, [RateDetails, Messages]]:
+            for clear_empty in [None, False]:
+                result = DP.to_dict(entity, clear_empty=clear_empty)
+
+                self.assertEqual(
+                    json.dumps(result), json.dumps(round_trip(entity, clear_empty))
+                )
+
+    def test_to_dict_special_values(self):
+        entity = {
+            "tagged": Tagged(tags={"a"}, handler=lambda: None),
+            "plain": Plain(),
+            "types": [models.RateDetails, str, Color.red],
+            "numbers": {10: 1.5, 2: float("inf"), 1: {"empty": [], "zero": 0}},
+        }
+
+        self.assertEqual(json.dumps(DP.to_dict(entity)), json.dumps(round_trip(entity)))
+        self.assertDictEqual(
+            DP.to_dict(entity),
+            {
+                "numbers": {"1": {"zero": 0}, "2": float("inf"), "10": 1.5},
+                "plain": {"size": "S", "values": [1, 2.5, None]},
+                "tagged": {"color": "RED", "tags": ["a"]},
+                "types": ["RateDetails", "<class 'str'>", "RED"],
+            },
+        )
+
+    def test_to_dict_unsupported_value(self):
+        with self.assertRaises(ValueError):
+            DP.to_dict(dict(values={1, 2}))
+
+    def test_to_object(self):
+        with mock.patch.object(jstruct.logger, "warning") as warning:
+            rate = DP.to_object(
+                models.RateDetails, {**DP.to_dict(RateDetails), "unknown": True}
+            )
+
+        self.assertEqual(rate, RateDetails)
+        warning.assert_called_once_with("unknown arguments {'unknown': True}")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+RateDetails = models.RateDetails(
+    carrier_name="ups",
+    carrier_id="ups",
+    service="ups_ground",
+    currency="USD",
+    total_charge=120.5,
+    extra_charges=[
+        models.ChargeDetails(name="Base charge", amount=100.0, currency="USD"),
+        models.ChargeDetails(name="Fuel surcharge", amount=20.5, currency="USD"),
+    ],
+    transit_days=3,
+    meta=dict(service_name="UPS Ground", rate_provider="ups"),
+)
+
+ShipmentDetails = models.ShipmentDetails(
+    carrier_name="ups",
+    carrier_id="ups",
+    tracking_number="1Z12345E6205277936",
+    shipment_identifier="1Z12345E6205277936",
+    docs=models.Documents(label="JVBERi0xLjQKJ...", invoice=""),
+    selected_rate=RateDetails,
+    label_type="PDF",
+    meta=dict(tracking_numbers=["1Z12345E6205277936"], service_name="UPS Ground"),
+)
+
+Messages = [
+    models.Message(
+        carrier_name="ups",
+        carrier_id="ups",
+        message="Missing Shipper Number",
+        code="120802",
+        details=dict(),
+    )
+]
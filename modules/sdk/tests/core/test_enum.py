@@ -0,0 +1,46 @@
+import unittest
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.utils as utils
+
+
+class Service(lib.StrEnum):
+    carrier_ground = "GROUND"
+    carrier_express = "EXPRESS"
+    carrier_ground_alias = "GROUND"
+    GROUND = "carrier_express"
+
+
+class Code(lib.Enum):
+    parcel = utils.svcEnum("PARCEL")
+    numeric = 10
+    preset = ["unhashable"]
+
+
+class TestEnumMap(unittest.TestCase):
+    def test_map_by_name_value_and_alias(self):
+        self.assertEqual(Service.map("carrier_ground").name, "carrier_ground")
+        self.assertEqual(Service.map("EXPRESS").name, "carrier_express")
+        self.assertEqual(Service.map("carrier_ground_alias").name, "carrier_ground")
+
+    def test_map_name_takes_precedence_over_value(self):
+        self.assertEqual(Service.map("GROUND").name, "GROUND")
+
+    def test_map_stringified_value(self):
+        self.assertEqual(Code.map("PARCEL").name, "parcel")
+        self.assertEqual(Code.map(10).name, "numeric")
+
+    def test_map_unknown_key(self):
+        for key in [None, "", "unknown", "10", ["unhashable"], {}]:
+            with self.subTest(key=key):
+                self.assertIsNone(Code.map(key).enum)
+                self.assertEqual(Code.map(key).name_or_key, key)
+
+    def test_lookup_table_is_built_once_per_enum(self):
+        self.assertIs(units.Country.lookup(), units.Country.lookup())
+        self.assertIsNot(units.Country.lookup(), units.Currency.lookup())
+        self.assertEqual(units.Country.map("Canada").name, "CA")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import time
+import threading
+import unittest
+import karrio.lib as lib
+
+
+class TestBackgroundExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = lib.BackgroundExecutor(max_workers=2)
+        self.network = lib.BackgroundExecutor(
+            max_workers=2, thread_name_prefix="karrio-network"
+        )
+        self.previous = lib.set_executor(self.executor)
+        self.previous_network = lib.set_network_executor(self.network)
+
+    def tearDown(self):
+        lib.set_executor(self.previous)
+        lib.set_network_executor(self.previous_network)
+        self.executor.shutdown()
+        self.network.shutdown()
+
+    def test_lazy_bounded_pool(self):
+        self.assertFalse(self.network.stats["started"])
+
+        threads = set()
+        lib.run_asynchronously(
+            lambda _: (threads.add(threading.current_thread().name), time.sleep(0.01)),
+            list(range(10)),
+        )
+
+        self.assertTrue(self.network.stats["started"])
+        self.assertFalse(self.executor.stats["started"])
+        self.assertLessEqual(len(threads), 3)  # 2 workers + the calling thread
+
+    def test_fan_out_does_not_queue_behind_background_work(self):
+        event = threading.Event()
+        blocked = [self.executor.submit(event.wait, 5) for _ in range(4)]
+        threads = set()
+
+        lib.run_asynchronously(
+            lambda _: threads.add(threading.current_thread().name), [1, 2]
+        )
+        event.set()
+        [_.result() for _ in blocked]
+
+        # run by the network workers (or the calling thread), never queued
+        self.assertFalse(any(_.startswith("karrio_") for _ in threads))
+
+    def test_timed_wait_does_not_run_inline(self):
+        event = threading.Event()
+        blocked = [self.network.submit(event.wait, 5) for _ in range(2)]
+        task = self.network.submit(lambda: threading.current_thread().name)
+
+        with self.assertRaises(TimeoutError):
+            task.result(timeout=0.05)
+
+        event.set()
+        [_.result() for _ in blocked]
+
+        self.assertTrue(task.result(timeout=5).startswith("karrio-network"))
+
+    def test_nested_calls_on_saturated_pool(self):
+        results = lib.run_asynchronously(
+            lambda x: sum(lib.run_asynchronously(lambda y: x * y, [1, 2, 3])),
+            list(range(6)),
+        )
+
+        self.assertListEqual(results, [0, 6, 12, 18, 24, 30])
+
+    def test_run_concurently_keeps_errors_and_order(self):
+        results = lib.run_concurently(lambda x: 1 / x, [1, 0, 4], max_workers=1)
+
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ZeroDivisionError)
+        self.assertEqual(results[2], 0.25)
+
+    def test_queue_depth_metrics(self):
+        event = threading.Event()
+        tasks = [self.executor.submit(event.wait) for _ in range(5)]
+        time.sleep(0.05)
+
+        self.assertDictEqual(
+            {k: v for k, v in self.executor.stats.items() if k != "started"},
+            dict(max_workers=2, submitted=5, queued=3, running=2, completed=0),
+        )
+
+        event.set()
+        [_.result() for _ in tasks]
+
+        self.assertEqual(self.executor.stats["queued"], 0)
+        self.assertEqual(self.executor.stats["completed"], 5)
+
+    def test_inline_mode(self):
+        lib.set_executor(lib.BackgroundExecutor(max_workers=0))
+        tracer = lib.Tracer()
+        cache = lib.Cache(token=lambda: threading.current_thread().name)
+
+        tracer.trace(dict(request="data"), "request")
+
+        self.assertEqual(cache.get("token"), threading.current_thread().name)
+        self.assertEqual(tracer.records[0].data["request"], "data")
+        self.assertFalse(lib.get_executor().stats["started"])
+
+    def test_cache_and_tracer_use_shared_executor(self):
+        tracer = lib.Tracer()
+        cache = lib.Cache(token=lambda: "secret")
+
+        for index in range(10):
+            tracer.trace(dict(index=index), "request")
+
+        self.assertEqual(cache.get("token"), "secret")
+        self.assertListEqual([_.data["index"] for _ in tracer.records], list(range(10)))
+        self.assertEqual(self.executor.stats["submitted"], 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import tempfile
+import threading
+import unittest
+import importlib
+from pathlib import Path
+import karrio.core.utils.imports as imports
+
+PACKAGE = "lazy_schemas_fixture"
+
+
+class TestLazySchemas(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        package = Path(self.directory.name) / PACKAGE
+        package.mkdir()
+        (package / "__init__.py").write_text("EXECUTED = []\n")
+        (package / "schema.py").write_text(
+            f"import {PACKAGE}\n"
+            f"{PACKAGE}.EXECUTED.append(__name__)\n"
+            "class Shipment:\n"
+            "    pass\n"
+        )
+        (package / "slow.py").write_text(
+            "import time\n" "time.sleep(0.2)\n" "class Shipment:\n" "    pass\n"
+        )
+
+        self.finder = imports.LazySchemaFinder(prefixes=(f"{PACKAGE}.",))
+        sys.path.insert(0, self.directory.name)
+        sys.meta_path.insert(0, self.finder)
+
+    def tearDown(self):
+        sys.meta_path.remove(self.finder)
+        sys.path.remove(self.directory.name)
+        [sys.modules.pop(_, None) for _ in list(sys.modules) if _.startswith(PACKAGE)]
+        self.directory.cleanup()
+
+    def test_module_is_executed_on_first_attribute_access(self):
+        package = importlib.import_module(PACKAGE)
+        schema = importlib.import_module(f"{PACKAGE}.schema")
+
+        self.assertIsInstance(schema, imports.LazyModule)
+        self.assertListEqual(package.EXECUTED, [])
+
+        self.assertEqual(schema.Shipment.__name__, "Shipment")
+        self.assertListEqual(package.EXECUTED, [f"{PACKAGE}.schema"])
+        self.assertNotIsInstance(schema, imports.LazyModule)
+
+    def test_reimport_does_not_execute_module(self):
+        package = importlib.import_module(PACKAGE)
+        importlib.import_module(f"{PACKAGE}.schema")
+        exec(f"import {PACKAGE}.schema as schema", {})
+
+        self.assertListEqual(package.EXECUTED, [])
+
+    def test_missing_attribute(self):
+        schema = importlib.import_module(f"{PACKAGE}.schema")
+
+        with self.assertRaises(AttributeError):
+            schema.Missing
+
+        self.assertIn("Shipment", dir(schema))
+
+    def test_concurrent_first_access(self):
+        slow = importlib.import_module(f"{PACKAGE}.slow")
+        barrier = threading.Barrier(4)
+        results = []
+
+        def access():
+            barrier.wait()
+            try:
+                results.append(slow.Shipment.__name__)
+            except AttributeError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=access) for _ in range(4)]
+        [_.start() for _ in threads]
+        [_.join() for _ in threads]
+
+        self.assertListEqual(results, ["Shipment"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
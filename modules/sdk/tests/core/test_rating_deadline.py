@@ -0,0 +1,93 @@
+import time
+import asyncio
+import unittest
+import karrio.lib as lib
+import karrio.api.proxy as proxy
+from karrio.api.interface import Rating
+from .test_async import create_gateway
+
+
+class SleepingProxy(proxy.Proxy):
+    delay: float = 0
+
+    def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        time.sleep(self.delay)
+        return lib.Deserializable(dict(path=f"/{self.delay}"), lambda _: _)
+
+
+class AsyncSleepingProxy(proxy.AsyncProxy):
+    delay: float = 0
+
+    async def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        await asyncio.sleep(self.delay)
+        return lib.Deserializable(dict(path=f"/{self.delay}"), lambda _: _)
+
+
+def create_sleeping_gateways(proxy_type):
+    fast = create_gateway("fast", proxy_type, url=None)
+    slow = create_gateway("slow", proxy_type, url=None)
+    fast.proxy.delay, slow.proxy.delay = 0.01, 1.0
+
+    return fast, slow
+
+
+class TestRatingDeadline(unittest.TestCase):
+    def setUp(self):
+        self.payload = dict(
+            shipper=dict(postal_code="H3N1S4", country_code="CA"),
+            recipient=dict(postal_code="89109", country_code="US"),
+            parcels=[dict(weight=1.0, weight_unit="KG")],
+        )
+
+    def assert_partial_results(self, rates, messages, duration):
+        self.assertLess(duration, 0.8)
+        self.assertListEqual([_.carrier_id for _ in rates], ["fast"])
+        self.assertListEqual(
+            [(_.carrier_id, _.code) for _ in messages],
+            [("slow", "SHIPPING_SDK_TIMEOUT_ERROR")],
+        )
+
+    def test_deadline_returns_partial_results(self):
+        started = time.monotonic()
+        rates, messages = (
+            Rating.fetch(self.payload, deadline=0.3)
+            .from_(*create_sleeping_gateways(SleepingProxy))
+            .parse()
+        )
+
+        self.assert_partial_results(rates, messages, time.monotonic() - started)
+
+    def test_per_carrier_timeout(self):
+        started = time.monotonic()
+        rates, messages = (
+            Rating.fetch(self.payload, carrier_timeout=dict(slow=0.3))
+            .from_(*create_sleeping_gateways(SleepingProxy))
+            .parse()
+        )
+
+        self.assert_partial_results(rates, messages, time.monotonic() - started)
+
+    def test_async_deadline_returns_partial_results(self):
+        async def fetch():
+            request = Rating.fetch(self.payload, deadline=0.3)
+            response = await request.from_async(
+                *create_sleeping_gateways(AsyncSleepingProxy)
+            )
+            return response.parse()
+
+        started = time.monotonic()
+        rates, messages = asyncio.run(fetch())
+
+        self.assert_partial_results(rates, messages, time.monotonic() - started)
+
+    def test_no_budget_waits_for_all_carriers(self):
+        fast, slow = create_sleeping_gateways(SleepingProxy)
+        slow.proxy.delay = 0.1
+        rates, messages = Rating.fetch(self.payload).from_(fast, slow).parse()
+
+        self.assertListEqual(sorted(_.carrier_id for _ in rates), ["fast", "slow"])
+        self.assertListEqual(messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import asyncio
+import unittest
+from karrio.api.interface import Rating
+from .test_rating_deadline import (
+    SleepingProxy,
+    AsyncSleepingProxy,
+    create_sleeping_gateways,
+)
+
+
+class TestRatingStream(unittest.TestCase):
+    def setUp(self):
+        self.payload = dict(
+            shipper=dict(postal_code="H3N1S4", country_code="CA"),
+            recipient=dict(postal_code="89109", country_code="US"),
+            parcels=[dict(weight=1.0, weight_unit="KG")],
+        )
+
+    def test_stream_yields_rates_as_carriers_respond(self):
+        fast, slow = create_sleeping_gateways(SleepingProxy)
+        slow.proxy.delay = 0.3
+        started = time.monotonic()
+        received = []
+
+        for response in Rating.fetch(self.payload).stream(slow, fast):
+            rates, messages = response.parse()
+            received.append(([_.carrier_id for _ in rates], messages))
+            if len(received) == 1:
+                self.assertLess(time.monotonic() - started, 0.25)
+
+        self.assertListEqual(received, [(["fast"], []), (["slow"], [])])
+
+    def test_stream_with_deadline(self):
+        responses = [
+            _.parse()
+            for _ in Rating.fetch(self.payload, deadline=0.3).stream(
+                *create_sleeping_gateways(SleepingProxy)
+            )
+        ]
+
+        self.assertListEqual(
+            [
+                ([r.carrier_id for r in rates], [m.code for m in messages])
+                for rates, messages in responses
+            ],
+            [(["fast"], []), ([], ["SHIPPING_SDK_TIMEOUT_ERROR"])],
+        )
+
+    def test_async_stream(self):
+        async def stream():
+            fast, slow = create_sleeping_gateways(AsyncSleepingProxy)
+            slow.proxy.delay = 0.1
+            request = Rating.fetch(self.payload)
+
+            return [_.parse() async for _ in request.stream_async(slow, fast)]
+
+        responses = asyncio.run(stream())
+
+        self.assertListEqual(
+            [[_.carrier_id for _ in rates] for rates, _ in responses],
+            [["fast"], ["slow"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
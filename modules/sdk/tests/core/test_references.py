@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+import karrio
+import karrio.references as references
+import karrio.core.errors as errors
+
+
+class TestProvidersRegistry(unittest.TestCase):
+    def setUp(self):
+        # restrict the mappers scan to the generic carrier for the tests
+        self.patches = [
+            mock.patch.object(references, "PROVIDERS", None),
+            mock.patch.object(references, "PROVIDERS_DATA", None),
+            mock.patch.object(references, "REFERENCES", None),
+            mock.patch.dict(references.LOADED_PROVIDERS, clear=True),
+            mock.patch.object(
+                references.pkgutil,
+                "iter_modules",
+                return_value=[(None, "generic", True)],
+            ),
+        ]
+        [_.start() for _ in self.patches]
+
+    def tearDown(self):
+        [_.stop() for _ in self.patches]
+
+    def test_gateway_lookup_does_not_rescan_mappers(self):
+        karrio.gateway["generic"]
+
+        with mock.patch.object(
+            references, "import_extensions", wraps=references.import_extensions
+        ) as scan:
+            for _ in range(5):
+                karrio.gateway["generic"]
+                karrio.gateway.providers
+
+        self.assertLessEqual(scan.call_count, 1)
+
+    def test_lazy_single_provider_import(self):
+        with mock.patch.object(references, "import_extensions") as scan:
+            provider = references.get_provider("generic")
+
+            self.assertEqual(provider.id, "generic")
+            self.assertIn("generic", references.LOADED_PROVIDERS)
+            scan.assert_not_called()
+
+    def test_unknown_provider(self):
+        with self.assertRaises(errors.ShippingSDKError):
+            karrio.gateway["unknown_carrier"]
+
+    def test_refresh(self):
+        providers = karrio.gateway.refresh()
+
+        self.assertListEqual(list(providers.keys()), ["generic"])
+        self.assertIs(karrio.gateway.providers, providers)
+        self.assertIsNone(references.PROVIDERS_DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
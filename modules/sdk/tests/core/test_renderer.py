@@ -0,0 +1,105 @@
+import re
+import base64
+import unittest
+import karrio.addons.renderer as renderer
+from karrio.addons.label import DEFAULT_SVG_LABEL_TEMPLATE
+
+
+class TestLabelRenderer(unittest.TestCase):
+    def test_fonts_barcodes_and_templates_are_shared(self):
+        self.assertIs(
+            renderer.load_font("Oswald", "Regular", 30),
+            renderer.load_font("Oswald", "Regular", 30),
+        )
+        self.assertIs(
+            renderer.render_barcode("(421) 124K1K4T3", 460, 150),
+            renderer.render_barcode("(421) 124K1K4T3", 460, 150),
+        )
+        self.assertIs(
+            renderer.compile_template(DEFAULT_SVG_LABEL_TEMPLATE),
+            renderer.compile_template(DEFAULT_SVG_LABEL_TEMPLATE),
+        )
+
+    def test_parse_style(self):
+        self.assertDictEqual(
+            renderer.parse_style("font-size: 40; font-weight: bold"),
+            {"font-size": "40", "font-weight": "bold"},
+        )
+        self.assertDictEqual(renderer.parse_style(None), {})
+
+    def test_render_labels_in_process_pool(self):
+        contexts = [{**LABEL_CONTEXT, "package_index": index} for index in [1, 2, 3]]
+
+        labels = renderer.render_labels(
+            DEFAULT_SVG_LABEL_TEMPLATE,
+            contexts,
+            label_type="PDF",
+            template_type="SVG",
+            max_workers=2,
+        )
+        sequential = renderer.render_labels(
+            DEFAULT_SVG_LABEL_TEMPLATE,
+            contexts,
+            label_type="PDF",
+            template_type="SVG",
+            max_workers=1,
+        )
+
+        pool = renderer.get_process_pool(2)
+
+        self.assertEqual(len(labels), 3)
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+        self.assertIs(renderer.get_process_pool(2), pool)
+        self.assertListEqual(
+            [without_dates(_) for _ in labels], [without_dates(_) for _ in sequential]
+        )
+        self.assertTrue(base64.b64decode(labels[0]).startswith(b"%PDF"))
+
+    def test_render_zpl_template_to_pdf_offline(self):
+        label = renderer.render_label(
+            "^XA^FO50,50^A0N,40,40^FDLABEL^FS^XZ",
+            label_type="PDF",
+            template_type="ZPL",
+            width=4,
+            height=6,
+        )
+
+        self.assertTrue(base64.b64decode(label).startswith(b"%PDF"))
+
+
+def without_dates(label: str) -> bytes:
+    return re.sub(rb"\(D:[0-9Z']+\)", b"", base64.b64decode(label))
+
+
+LABEL_CONTEXT = dict(
+    shipment=dict(
+        shipper=dict(
+            company_name="CGI",
+            address_line1="502 MAIN ST N",
+            city="MONTREAL",
+            state_code="QC",
+            postal_code="H2B1A0",
+        ),
+        recipient=dict(
+            company_name="CGI",
+            address_line1="23 jardin private",
+            city="Ottawa",
+            state_code="ON",
+            postal_code="K1K4T3",
+            country_code="CA",
+        ),
+    ),
+    carrier=dict(display_name="Custom Carrier", metadata={}),
+    metadata={},
+    package_index=1,
+    total_packages=3,
+    is_multi_item=False,
+    master_item={},
+    total_quantity=1,
+    tracking_number="1234567890",
+    units=dict(CountryISO={"CA": "124"}),
+)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import unittest
+import contextvars
+import threading
+import http.server
+import karrio.lib as lib
+import karrio.core.utils.tracing as tracing
+from karrio.api.interface import Rating
+from .test_async import RateRequest, SyncProxy, AsyncProxy, create_gateway
+from .test_transport import StandInHandler
+
+
+class TestTracingSpans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.connections = set()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.exporter = lib.add_span_exporter(lib.InMemoryExporter())
+
+    def tearDown(self):
+        lib.remove_span_exporter(self.exporter)
+
+    def test_rating_stages_spans(self):
+        gateway = create_gateway("sync", SyncProxy, self.url)
+
+        rates, messages = Rating.fetch(RateRequest).from_(gateway).parse()
+        spans = {span.name: span for span in gateway.tracer.spans}
+
+        self.assertEqual(len(rates), 1)
+        self.assertListEqual(
+            sorted(spans.keys()),
+            [
+                "create_request",
+                "decode",
+                "deserialize",
+                "http_request",
+                "network",
+                "parse_response",
+                "proxy",
+                "serialize",
+            ],
+        )
+        self.assertDictEqual(
+            spans["parse_response"].attributes,
+            dict(
+                operation="get_rates",
+                connection_id=None,
+                test_mode=False,
+                carrier_id="sync",
+                carrier_name="stand_in",
+            ),
+        )
+        self.assertEqual(spans["http_request"].parent_id, spans["proxy"].span_id)
+        self.assertEqual(spans["network"].parent_id, spans["http_request"].span_id)
+        self.assertEqual(
+            spans["deserialize"].parent_id, spans["parse_response"].span_id
+        )
+        self.assertEqual(spans["network"].attributes["carrier_id"], "sync")
+        self.assertEqual(
+            spans["http_request"].attributes["url"], f"{self.url}/sync_rates"
+        )
+        self.assertTrue(all(_.duration > 0 for _ in spans.values()))
+        self.assertGreaterEqual(spans["proxy"].duration, spans["http_request"].duration)
+        self.assertListEqual(
+            sorted(_.name for _ in self.exporter.spans), sorted(spans.keys())
+        )
+
+    def test_async_rating_stages_spans(self):
+        gateway = create_gateway("async", AsyncProxy, self.url)
+
+        async def fetch():
+            response = await Rating.fetch(RateRequest).from_async(gateway)
+            return await response.parse_async()
+
+        asyncio.run(fetch())
+        spans = {span.name: span for span in gateway.tracer.spans}
+
+        self.assertEqual(spans["http_request"].parent_id, spans["proxy"].span_id)
+        self.assertEqual(spans["proxy"].attributes["carrier_id"], "async")
+
+    def test_failed_stage_span(self):
+        gateway = create_gateway("sync", SyncProxy, "http://127.0.0.1:1")
+
+        Rating.fetch(RateRequest).from_(gateway).parse()
+        spans = {span.name: span for span in gateway.tracer.spans}
+
+        self.assertEqual(spans["network"].status, "error")
+        self.assertEqual(spans["proxy"].status, "error")
+        self.assertEqual(spans["create_request"].status, "ok")
+
+    def test_span_records(self):
+        tracer = lib.Tracer(exporters=[])
+
+        with tracer.span("proxy", carrier_id="ups", carrier_name="ups"):
+            with tracing.span("network"):
+                pass
+
+        records = tracer.span_records
+
+        self.assertListEqual([_.key for _ in records], ["span", "span"])
+        self.assertEqual(records[0].data["name"], "network")
+        self.assertEqual(records[0].metadata["connection"]["carrier_id"], "ups")
+        self.assertListEqual(self.exporter.spans, [])
+
+    def test_spans_are_capped(self):
+        tracer = lib.Tracer(exporters=[], max_spans=3)
+
+        for index in range(5):
+            with tracer.span(f"stage_{index}"):
+                pass
+
+        self.assertListEqual(
+            [_.name for _ in tracer.spans], ["stage_2", "stage_3", "stage_4"]
+        )
+
+    def test_child_outliving_its_parent_is_exported(self):
+        exporter = lib.InMemoryExporter()
+        tracer = lib.Tracer(exporters=[exporter])
+        started, release = threading.Event(), threading.Event()
+
+        def child():
+            with tracing.span("late"):
+                started.set()
+                release.wait(5)
+
+        with tracer.span("root"):
+            context = contextvars.copy_context()
+            thread = threading.Thread(target=context.run, args=(child,))
+            thread.start()
+            started.wait(5)
+
+        release.set()
+        thread.join()
+
+        self.assertListEqual([_.name for _ in exporter.spans], ["root", "late"])
+        self.assertDictEqual(tracer._pending, {})
+
+    def test_span_outside_of_a_stage(self):
+        with tracing.span("network") as span:
+            self.assertIsNone(span)
+
+
+if __name__ == "__main__":
+    unittest.main()
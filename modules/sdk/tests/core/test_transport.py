@@ -0,0 +1,242 @@
+import json
+import asyncio
+import unittest
+import threading
+import http.server
+import urllib.error
+import urllib.request
+import karrio.lib as lib
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers: dict = {}):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+
+        if self.path == "/redirect":
+            return self._reply(302, {}, {"Location": "/ok"})
+        if self.path == "/error":
+            return self._reply(400, {"error": "bad request"})
+
+        self._reply(200, {"path": self.path, "method": "GET"})
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length).decode("utf-8")
+
+        if self.path == "/drop":
+            # process the request then close the connection without replying
+            self.server.dropped += 1
+            self.close_connection = True
+            return
+
+        self._reply(
+            200,
+            {
+                "path": self.path,
+                "data": data,
+                "content_type": self.headers.get("Content-Type"),
+            },
+        )
+
+
+class TestPooledTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.connections = set()
+        cls.server.dropped = 0
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.connections.clear()
+        self.transport = lib.PooledTransport(pool_maxsize=2, timeout=5)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_connection_reuse(self):
+        responses = [
+            lib.request(url=f"{self.url}/ok", transport=self.transport)
+            for _ in range(5)
+        ]
+
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertDictEqual(
+            lib.to_dict(responses[-1]), {"path": "/ok", "method": "GET"}
+        )
+        self.assertListEqual(list(self.transport.pools.values()), [1])
+
+    def test_post_request(self):
+        response = lib.request(
+            url=f"{self.url}/rates",
+            data='{"weight": 1}',
+            method="POST",
+            headers={"content-Type": "application/json"},
+            transport=self.transport,
+        )
+
+        self.assertDictEqual(
+            lib.to_dict(response),
+            {
+                "path": "/rates",
+                "data": '{"weight": 1}',
+                "content_type": "application/json",
+            },
+        )
+
+    def test_post_request_is_not_retried(self):
+        self.server.dropped = 0
+        lib.request(url=f"{self.url}/ok", transport=self.transport)
+
+        with self.assertRaises(urllib.error.URLError):
+            lib.request(
+                url=f"{self.url}/drop",
+                data='{"weight": 1}',
+                method="POST",
+                transport=self.transport,
+            )
+
+        self.assertEqual(self.server.dropped, 1)
+
+    def test_http_error_handling(self):
+        response = lib.request(
+            url=f"{self.url}/error",
+            transport=self.transport,
+            on_error=lambda e: f"{e.code}:{lib.decode(e.read())}",
+        )
+
+        self.assertEqual(response, '400:{"error": "bad request"}')
+        self.assertListEqual(list(self.transport.pools.values()), [1])
+
+    def test_redirect_following(self):
+        response = lib.request(url=f"{self.url}/redirect", transport=self.transport)
+
+        self.assertDictEqual(lib.to_dict(response), {"path": "/ok", "method": "GET"})
+
+    def test_pool_maxsize(self):
+        lib.run_concurently(
+            lambda _: lib.request(url=f"{self.url}/ok", transport=self.transport),
+            list(range(8)),
+            max_workers=4,
+        )
+
+        self.assertLessEqual(sum(self.transport.pools.values()), 2)
+
+    def test_default_transport_swap(self):
+        previous = lib.set_transport(self.transport)
+
+        try:
+            lib.request(url=f"{self.url}/ok")
+            lib.request(url=f"{self.url}/ok")
+        finally:
+            lib.set_transport(previous)
+
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_proxy_does_not_install_global_opener(self):
+        opener = urllib.request._opener
+
+        response = lib.request(
+            url=f"{self.url}/ok",
+            proxy=f"user:pass@127.0.0.1:{self.server.server_address[1]}",
+            transport=lib.UrllibTransport(timeout=5),
+        )
+
+        self.assertIs(urllib.request._opener, opener)
+        self.assertEqual(lib.to_dict(response)["method"], "GET")
+
+
+class TestAsyncPooledTransport(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.connections = set()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.server.connections.clear()
+        self.transport = lib.AsyncPooledTransport(pool_maxsize=2, timeout=5)
+
+    async def asyncTearDown(self):
+        await self.transport.close()
+
+    async def test_connection_reuse(self):
+        responses = [
+            await lib.request_async(url=f"{self.url}/ok", transport=self.transport)
+            for _ in range(5)
+        ]
+
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertDictEqual(
+            lib.to_dict(responses[-1]), {"path": "/ok", "method": "GET"}
+        )
+
+    async def test_concurrent_requests(self):
+        responses = await asyncio.gather(
+            *[
+                lib.request_async(
+                    url=f"{self.url}/rates",
+                    data=f'{{"index": {index}}}',
+                    method="POST",
+                    headers={"content-Type": "application/json"},
+                    transport=self.transport,
+                )
+                for index in range(6)
+            ]
+        )
+
+        self.assertListEqual(
+            [lib.to_dict(_)["data"] for _ in responses],
+            [f'{{"index": {index}}}' for index in range(6)],
+        )
+        self.assertLessEqual(sum(self.transport.pools.values()), 2)
+
+    async def test_http_error_handling(self):
+        response = await lib.request_async(
+            url=f"{self.url}/error",
+            transport=self.transport,
+            on_error=lambda e: f"{e.code}:{lib.decode(e.read())}",
+        )
+
+        self.assertEqual(response, '400:{"error": "bad request"}')
+
+    async def test_redirect_following(self):
+        response = await lib.request_async(
+            url=f"{self.url}/redirect", transport=self.transport
+        )
+
+        self.assertDictEqual(lib.to_dict(response), {"path": "/ok", "method": "GET"})
+
+
+if __name__ == "__main__":
+    unittest.main()
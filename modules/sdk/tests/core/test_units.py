@@ -0,0 +1,113 @@
+import unittest
+import karrio.lib as lib
+import karrio.core.utils as utils
+import karrio.core.units as units
+import karrio.core.models as models
+
+
+class TestUnitsCaching(unittest.TestCase):
+    def setUp(self):
+        self.packages = lib.to_packages(
+            [
+                models.Parcel(
+                    weight=2.0,
+                    weight_unit="KG",
+                    length=10.0,
+                    width=5.0,
+                    height=4.0,
+                    dimension_unit="CM",
+                    options=dict(insurance=10.0),
+                ),
+                models.Parcel(
+                    weight=1000.0,
+                    weight_unit="G",
+                    length=1.0,
+                    width=1.0,
+                    height=1.0,
+                    dimension_unit="IN",
+                    options=dict(insurance=15.0),
+                ),
+            ],
+            options=dict(currency="USD"),
+        )
+
+    def test_unit_objects_are_slotted(self):
+        package = self.packages[0]
+
+        for unit in [package.weight, package.length, package.volume, package.girth]:
+            with self.subTest(unit=type(unit).__name__):
+                with self.assertRaises(AttributeError):
+                    unit.extra = True
+
+    def test_packages_accept_extra_attributes(self):
+        package = self.packages[0]
+        package.extra = True
+        self.packages.extra = True
+
+        self.assertTrue(package.extra and self.packages.extra)
+
+    def test_reassigned_parcel_drops_cached_values(self):
+        package = self.packages[0]
+        self.assertEqual(package.weight.KG, 2.0)
+        self.assertEqual(self.packages.weight.KG, 3.0)
+
+        package.parcel = models.Parcel(weight=5.0, weight_unit="KG")
+
+        self.assertEqual(package.weight.KG, 5.0)
+        self.assertEqual(self.packages.weight.KG, 6.0)
+
+    def test_derived_values_are_cached(self):
+        package = self.packages[0]
+        options = units.MeasurementOptionsType(quant=0.1)
+
+        self.assertIs(package.weight, package.weight)
+        self.assertIs(package.length.map(options), package.length.map(options))
+        self.assertIs(self.packages.options, self.packages.options)
+
+    def test_conversions(self):
+        first, second = self.packages
+
+        self.assertEqual(first.weight.LB, 4.41)
+        self.assertEqual(second.weight.KG, 1.0)
+        self.assertEqual(second.length.CM, 2.54)
+        self.assertEqual(self.packages.weight.KG, 3.0)
+        self.assertDictEqual(
+            self.packages.options.content, dict(currency="USD", insurance=25.0)
+        )
+
+
+class ConnectorOption(utils.Enum):
+    carrier_insurance = utils.OptionEnum("INS", float)
+    carrier_signature = utils.OptionEnum("SIG", bool)
+
+    """Unified Option type mapping"""
+    insurance = carrier_insurance
+    signature_confirmation = carrier_signature
+
+
+class TestOptionTable(unittest.TestCase):
+    def test_connector_options_take_precedence(self):
+        options = units.ShippingOptions(
+            dict(insurance=25.0, currency="USD", unknown="x", carrier_signature=1),
+            ConnectorOption,
+        )
+
+        self.assertDictEqual(
+            options.content,
+            dict(carrier_insurance=25.0, currency="USD", carrier_signature=True),
+        )
+        self.assertEqual(options.carrier_insurance.code, "INS")
+
+    def test_option_table_is_shared(self):
+        table = units.option_table(ConnectorOption, units.ShippingOption)
+
+        self.assertIs(units.option_table(ConnectorOption, units.ShippingOption), table)
+        self.assertIsNot(
+            units.option_table(ConnectorOption, units.CustomsOption), table
+        )
+        self.assertEqual(table["insurance"][0], "carrier_insurance")
+        self.assertEqual(table["currency"][0], "currency")
+
+
+if __name__ == "__main__":
+    unittest.main()
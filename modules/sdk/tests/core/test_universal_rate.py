@@ -1,10 +1,13 @@
 import unittest
 from karrio.core.utils import DP, Serializable
-from karrio.core.models import RateRequest
+from karrio.core.models import Address, Parcel, RateRequest, ServiceLevel
+import karrio.core.units as units
+import karrio.universal.providers.rating.index as index
 from karrio.universal.mappers.rating_proxy import (
     RatingMixinSettings,
     RatingMixinProxy,
 )
+from karrio.universal.providers.rating import rate_matrices
 from karrio.universal.providers.rating.rate import parse_rate_response
 
 
@@ -121,6 +124,112 @@ class TestUniversalRating(unittest.TestCase):
         )
 
 
+class TestRateSheetIndex(unittest.TestCase):
+    def setUp(self):
+        self.service = ServiceLevel(**zoned_service_data)
+
+    def select(self, weight: float, **recipient):
+        return index.compile_service(self.service).select_zone(
+            units.ComputedAddress(Address(country_code="CA", **recipient)), weight
+        )
+
+    def test_select_zone_by_location(self):
+        self.assertEqual(self.select(1.0, postal_code="h3n1s4").rate, 5.0)
+        self.assertEqual(self.select(1.0, city="montreal").rate, 7.0)
+        self.assertEqual(self.select(1.0, city="Toronto").rate, 9.0)
+        self.assertIsNone(
+            index.compile_service(self.service).select_zone(
+                units.ComputedAddress(Address(country_code="US")), 1.0
+            )
+        )
+
+    def test_select_best_fit_weight_bracket(self):
+        self.assertEqual(self.select(4.0, city="Toronto").rate, 12.0)
+        self.assertIsNone(self.select(25.0, city="Toronto"))
+
+    def test_compiled_index_is_cached_by_sheet_version(self):
+        compiled = index.compile_service(self.service)
+        self.assertIs(index.compile_service(self.service), compiled)
+
+        self.service.zones = [*self.service.zones, self.service.zones[-1]]
+        self.assertIsNot(index.compile_service(self.service), compiled)
+
+
+class TestBatchRating(unittest.TestCase):
+    def setUp(self):
+        self.settings = RatingMixinSettings(
+            carrier_id="universal",
+            services=[*settings_data["services"], zoned_service_data],
+        )
+        self.proxy = RatingMixinProxy(self.settings)
+
+    def test_rate_matrices_match_single_rating(self):
+        parcels = [
+            {**rate_request_data["parcels"][0], "weight": weight}
+            for weight in [1.0, 4.0, 6.0, 12.0]
+        ]
+        destinations = [
+            {"postal_code": "h8z2V4", "country_code": "CA"},
+            {"city": "Montreal", "country_code": "CA"},
+            {"postal_code": "11111", "country_code": "US"},
+        ]
+
+        matrices = rate_matrices(
+            self.settings,
+            [Parcel(**_) for _ in parcels],
+            [Address(**_) for _ in destinations],
+            shipper=Address(**rate_request_data["shipper"]),
+        )
+
+        for parcel, matrix in zip(parcels, matrices):
+            for destination, row in zip(destinations, matrix.rates):
+                request = RateRequest(
+                    **{
+                        **rate_request_data,
+                        "recipient": destination,
+                        "parcels": [parcel],
+                    }
+                )
+                [(_, (rates, _))] = self.proxy.get_rates(
+                    Serializable(request)
+                ).deserialize()
+                expected = {_.service: _.total_charge for _ in rates}
+
+                self.assertDictEqual(
+                    {
+                        service: rate
+                        for service, rate in zip(matrix.services, row)
+                        if rate is not None
+                    },
+                    expected,
+                )
+
+    def test_rate_matrices_package_ids(self):
+        matrices = rate_matrices(
+            self.settings,
+            [
+                Parcel(id="pcl_1", weight=1.0, weight_unit="KG"),
+                Parcel(weight=2.0, weight_unit="KG"),
+            ],
+            [Address(postal_code="H3N1S4", country_code="CA")],
+            services=["carrier_zoned"],
+        )
+
+        self.assertListEqual([_.package for _ in matrices], ["pcl_1", "2"])
+
+    def test_rate_matrices_service_selection(self):
+        [matrix] = rate_matrices(
+            self.settings,
+            [Parcel(weight=1.0, weight_unit="KG")],
+            [Address(postal_code="H3N1S4", country_code="CA")],
+            services=["carrier_zoned"],
+        )
+
+        self.assertListEqual(matrix.services, ["carrier_zoned"])
+        self.assertListEqual(matrix.currencies, ["CAD"])
+        self.assertListEqual(matrix.rates, [[5.0]])
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -273,3 +382,17 @@ ParsedMultiPieceRateResponse = [
     ],
     [],
 ]
+
+zoned_service_data = {
+    "service_name": "Zoned",
+    "service_code": "carrier_zoned",
+    "currency": "CAD",
+    "weight_unit": "KG",
+    "zones": [
+        {"rate": 5.0, "max_weight": 2.0, "postal_codes": ["H3N1S4"]},
+        {"rate": 7.0, "max_weight": 2.0, "cities": ["Montreal"]},
+        {"rate": 9.0, "max_weight": 2.0, "country_codes": ["CA"]},
+        {"rate": 12.0, "min_weight": 2.0, "max_weight": 5.0, "country_codes": ["CA"]},
+        {"rate": 20.0, "min_weight": 5.0, "max_weight": 20.0},
+    ],
+}
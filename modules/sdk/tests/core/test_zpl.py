@@ -0,0 +1,97 @@
+import io
+import os
+import base64
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from PIL import Image, ImageChops
+import karrio.lib as lib
+import karrio.addons.zpl as zpl
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "zpl"
+# share of pixels allowed to differ to absorb font rasterizer differences.
+TOLERANCE = 0.005
+# set UPDATE_GOLDEN_IMAGES=1 to regenerate the golden images.
+UPDATE = os.environ.get("UPDATE_GOLDEN_IMAGES") == "1"
+
+
+class TestZPLRendering(unittest.TestCase):
+    def test_golden_images(self):
+        for name in ["geodis", "universal", "features"]:
+            for dpmm in [8, 12]:
+                with self.subTest(label=name, dpmm=dpmm):
+                    content = (FIXTURES_DIR / f"{name}.zpl").read_text()
+                    golden = FIXTURES_DIR / f"{name}.{dpmm}dpmm.png"
+                    image = zpl.render(content, 4, 6, dpmm=dpmm)[0]
+
+                    if UPDATE:
+                        image.save(golden)
+
+                    expected = Image.open(golden).convert("1")
+                    self.assertEqual(image.size, expected.size)
+                    self.assertLessEqual(differences(image, expected), TOLERANCE)
+
+    def test_label_sizes(self):
+        content = "^XA^FO10,10^GB100,100,100^FS^XZ"
+
+        self.assertEqual(zpl.render(content, 4, 6, dpmm=8)[0].size, (812, 1219))
+        self.assertEqual(zpl.render(content, 4, 6, dpmm=12)[0].size, (1219, 1828))
+
+    def test_field_numbers(self):
+        label, *_ = zpl.interpret("^XA^FO10,10^A0N,30,30^FN1^FS^FN1^FDTRACKING^FS^XZ")
+
+        self.assertEqual(len(label.fields), 1)
+        self.assertEqual(label.fields[0].data, "TRACKING")
+
+    def test_compressed_graphic_field(self):
+        rows = list(zpl._decompress_hex("HFH0:,!", 2))
+
+        self.assertListEqual(rows, ["FF00", "FF00", "0000", "FFFF"])
+
+    def test_zpl_to_pdf_renders_offline(self):
+        content = (FIXTURES_DIR / "geodis.zpl").read_bytes()
+
+        with patch("karrio.core.utils.helpers.request") as request:
+            pdf = lib.zpl_to_pdf(base64.b64encode(content).decode(), 4, 6, dpmm=8)
+            png = lib.zpl_to_png(base64.b64encode(content).decode(), 4, 6, dpmm=8)
+
+        request.assert_not_called()
+        self.assertTrue(base64.b64decode(pdf).startswith(b"%PDF"))
+        self.assertEqual(
+            Image.open(io.BytesIO(base64.b64decode(png))).size, (812, 1219)
+        )
+
+    def test_one_pdf_page_per_label(self):
+        content = lib.bundle_zpls(
+            [
+                base64.b64encode(b"^XA^FO10,10^A0N,30,30^FDONE^FS^XZ").decode(),
+                base64.b64encode(b"^XA^FO10,10^A0N,30,30^FDTWO^FS^XZ").decode(),
+            ]
+        )
+
+        pdf = zpl.to_pdf(content, 4, 6, dpmm=8)
+
+        self.assertEqual(pdf.count(b"/Type /Page\n"), 2)
+
+    def test_document_without_label(self):
+        pdf = zpl.to_pdf("", 4, 6, dpmm=8)
+        png = zpl.to_png("^FO10,10^FS", 4, 6, dpmm=8)
+        image = Image.open(io.BytesIO(png))
+
+        self.assertEqual(pdf.count(b"/Type /Page\n"), 1)
+        self.assertEqual(image.size, (812, 1219))
+        self.assertEqual(image.convert("1").getextrema(), (255, 255))
+
+    def test_trailing_label_without_end(self):
+        labels = zpl.interpret("^XA^FO10,10^FDONE^FS^XZ^XA^FO10,10^FDTWO^FS")
+
+        self.assertListEqual([_.fields[0].data for _ in labels], ["ONE", "TWO"])
+
+
+def differences(image: Image.Image, expected: Image.Image) -> float:
+    diff = ImageChops.logical_xor(image, expected)
+    return diff.histogram()[-1] / (image.width * image.height)
+
+
+if __name__ == "__main__":
+    unittest.main()